@@ -2,36 +2,32 @@
 from __future__ import annotations
 
 import logging
-from typing import List, Optional
 
+from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, HTTPException
-from dependency_injector.wiring import inject, Provide
 from pydantic import BaseModel, Field
 
 from config.container import Container
-from service.relationship_feedback_service import (
-    RelationshipFeedbackService,
-    FeedbackQuestion,
-    VALID_RELATIONSHIP_CLASSES,
-)
-from db.postgres_relationship_cluster_personas import (
-    RelationshipClusterPersonas,
-)
 from db.postgres_dyadic_overrides import (
     DyadicOverrides,
 )
-from db.postgres_future_requests import (
-    PostgresFutureRequests,
-    FutureRequest,
-    FutureRequestStatus,
-)
 from db.postgres_financial_threads import (
-    PostgresFinancialThreads,
-    FinancialThread,
     FinancialThreadStatus,
+    PostgresFinancialThreads,
     WaitingFor,
 )
+from db.postgres_future_requests import (
+    FutureRequestStatus,
+    PostgresFutureRequests,
+)
+from db.postgres_relationship_cluster_personas import (
+    RelationshipClusterPersonas,
+)
 from memory.mem0_adapter import Mem0Adapter
+from service.relationship_feedback_service import (
+    VALID_RELATIONSHIP_CLASSES,
+    RelationshipFeedbackService,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -53,15 +49,15 @@ class QuestionResponse(BaseModel):
     about_user_id: str = Field(description="کاربری که راجع بهش می‌پرسیم")
     question_text: str = Field(description="متن سوال")
     conversation_summary: str = Field(description="خلاصه مکالمه")
-    sample_messages: List[str] = Field(default_factory=list, description="نمونه پیام‌ها")
+    sample_messages: list[str] = Field(default_factory=list, description="نمونه پیام‌ها")
     status: str = Field(description="pending|answered|expired|skipped")
     sent_count: int = Field(description="تعداد دفعات ارسال")
     created_at: str
 
 
 class QuestionsListResponse(BaseModel):
-    questions: List[QuestionResponse]
-    future_requests: List["FutureRequestResponse"] = Field(
+    questions: list[QuestionResponse]
+    future_requests: list[FutureRequestResponse] = Field(
         default_factory=list, 
         description="لیست درخواست‌های برنامه‌ریزی آینده"
     )
@@ -74,7 +70,7 @@ class SubmitAnswerRequest(BaseModel):
     relationship_class: str = Field(
         description="کلاس رابطه: spouse, family, boss, colleague, friend"
     )
-    answer_text: Optional[str] = Field(default=None, description="توضیحات اختیاری")
+    answer_text: str | None = Field(default=None, description="توضیحات اختیاری")
 
 
 class SubmitAnswerResponse(BaseModel):
@@ -92,7 +88,7 @@ class HasUnreadResponse(BaseModel):
 
 
 class RelationshipClassesResponse(BaseModel):
-    classes: List[dict]
+    classes: list[dict]
 
 
 class QuestionLimitStatusResponse(BaseModel):
@@ -106,19 +102,19 @@ class QuestionLimitStatusResponse(BaseModel):
 class FutureRequestResponse(BaseModel):
     id: int
     sender_id: str = Field(description="شناسه فرستنده درخواست")
-    sender_name: Optional[str] = Field(default=None, description="نام فرستنده (اگر موجود باشد)")
-    relationship_class: Optional[str] = Field(default=None, description="کلاس رابطه با فرستنده")
-    relationship_label: Optional[str] = Field(default=None, description="برچسب فارسی رابطه")
+    sender_name: str | None = Field(default=None, description="نام فرستنده (اگر موجود باشد)")
+    relationship_class: str | None = Field(default=None, description="کلاس رابطه با فرستنده")
+    relationship_label: str | None = Field(default=None, description="برچسب فارسی رابطه")
     original_message: str = Field(description="پیام اصلی فرستنده")
     detected_plan: str = Field(description="برنامه تشخیص داده شده")
-    detected_datetime: Optional[str] = Field(default=None, description="زمان تشخیص داده شده")
+    detected_datetime: str | None = Field(default=None, description="زمان تشخیص داده شده")
     status: str = Field(description="pending|answered|delivered|expired")
     created_at: str
-    created_at_formatted: Optional[str] = Field(default=None, description="زمان فرمت‌شده فارسی")
+    created_at_formatted: str | None = Field(default=None, description="زمان فرمت‌شده فارسی")
 
 
 class FutureRequestsListResponse(BaseModel):
-    requests: List[FutureRequestResponse]
+    requests: list[FutureRequestResponse]
     total_count: int
 
 
@@ -190,7 +186,7 @@ async def get_chat_store(
     return chat_store
 
 
-async def _get_sender_name(memory: Mem0Adapter, sender_id: str) -> Optional[str]:
+async def _get_sender_name(memory: Mem0Adapter, sender_id: str) -> str | None:
     try:
         memories = await memory.get_memories(sender_id, limit=100)
         for m in memories:
@@ -302,11 +298,11 @@ async def check_has_unread(
 ) -> HasUnreadResponse:
     try:
         questions = await feedback_service.get_pending_questions(user_id)
-        pending_future = await future_requests.get_pending_for_creator(user_id)
+        future_count = await future_requests.get_pending_count_for_creator(user_id)
         
         financial_count = await financial_threads.get_waiting_for_creator_count(user_id)
         
-        total = len(questions) + len(pending_future) + financial_count
+        total = len(questions) + future_count + financial_count
         
         return HasUnreadResponse(
             has_unread=total > 0,
@@ -642,8 +638,8 @@ class SenderRequestResponse(BaseModel):
     original_message: str = Field(description="پیام اصلی شما")
     detected_plan: str = Field(description="برنامه تشخیص داده شده")
     status: str = Field(description="pending|answered|delivered")
-    creator_response: Optional[str] = Field(default=None, description="پاسخ کاربر حقیقی")
-    responded_at: Optional[str] = Field(default=None, description="زمان پاسخ")
+    creator_response: str | None = Field(default=None, description="پاسخ کاربر حقیقی")
+    responded_at: str | None = Field(default=None, description="زمان پاسخ")
     created_at: str
 
 
@@ -697,12 +693,12 @@ class FinancialThreadMessageResponse(BaseModel):
 class FinancialThreadResponse(BaseModel):
     id: int
     sender_id: str
-    sender_name: Optional[str] = None
-    relationship_type: Optional[str] = None
+    sender_name: str | None = None
+    relationship_type: str | None = None
     topic_summary: str
-    last_sender_message: Optional[str] = None
-    last_creator_response: Optional[str] = None
-    recent_messages: List[FinancialThreadMessageResponse] = []
+    last_sender_message: str | None = None
+    last_creator_response: str | None = None
+    recent_messages: list[FinancialThreadMessageResponse] = []
     status: str
     waiting_for: str
     created_at: str
@@ -710,7 +706,7 @@ class FinancialThreadResponse(BaseModel):
 
 
 class FinancialThreadsListResponse(BaseModel):
-    threads: List[FinancialThreadResponse]
+    threads: list[FinancialThreadResponse]
     total_count: int
     waiting_for_response_count: int
 
@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, Any, List
+from datetime import datetime
+from typing import Any
 
+from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, HTTPException
-from dependency_injector.wiring import inject, Provide
 from pydantic import BaseModel, Field
 
 from config.container import Container
@@ -19,7 +20,7 @@ class SchedulerRunResponse(BaseModel):
     success: bool
     scheduler: str
     message: str
-    stats: Dict[str, Any] = Field(default_factory=dict)
+    stats: dict[str, Any] = Field(default_factory=dict)
 
 
 class ToneRetryStatsResponse(BaseModel):
@@ -43,7 +44,7 @@ class PassiveSummarizationStatsResponse(BaseModel):
 class PassiveSummarizationResponse(BaseModel):
     success: bool
     message: str
-    stats: Dict[str, Any] = Field(default_factory=dict)
+    stats: dict[str, Any] = Field(default_factory=dict)
 
 
 @inject
@@ -323,7 +324,7 @@ async def get_scheduler_status(
     tone_retry_storage=Depends(get_tone_retry_storage),
     chat_store=Depends(get_chat_store),
     passive_summ_storage=Depends(get_passive_summarization_storage),
-) -> Dict[str, Any]:
+) -> dict[str, Any]:
     tone_hours = settings.TONE_SCHEDULER_INTERVAL_SECONDS / 3600
     feedback_hours = settings.FEEDBACK_SCHEDULER_INTERVAL_SECONDS / 3600
     retry_minutes = settings.SUMMARY_RETRY_WORKER_INTERVAL_SECONDS / 60
@@ -457,14 +458,14 @@ async def get_passive_summarization_stats(
 
 @router.post(
     "/passive-summarization/retry-failed/{failed_id}",
-    response_model=Dict[str, Any],
+    response_model=dict[str, Any],
     summary="انتقال یک خلاصه‌سازی از failed به retry",
     description="یک خلاصه‌سازی ناموفق را دوباره به صف retry اضافه می‌کند",
 )
 async def retry_failed_passive_summarization(
     failed_id: int,
     storage=Depends(get_passive_summarization_storage),
-) -> Dict[str, Any]:
+) -> dict[str, Any]:
     try:
         new_retry_id = await storage.retry_failed(failed_id)
         if new_retry_id is None:
@@ -485,17 +486,30 @@ async def retry_failed_passive_summarization(
 
 @router.get(
     "/passive-summarization/failed",
-    response_model=List[Dict[str, Any]],
+    response_model=list[dict[str, Any]],
     summary="لیست خلاصه‌سازی‌های ناموفق passive",
     description="دریافت لیست خلاصه‌سازی‌هایی که بعد از 3 تلاش ناموفق بوده‌اند",
 )
 async def list_failed_passive_summarizations(
     limit: int = 100,
     offset: int = 0,
+    before_failed_at: datetime | None = None,
+    before_id: int | None = None,
     storage=Depends(get_passive_summarization_storage),
-) -> List[Dict[str, Any]]:
+) -> list[dict[str, Any]]:
+    # The keyset cursor is the (failed_at, id) pair; half of it cannot page.
+    if (before_failed_at is None) != (before_id is None):
+        raise HTTPException(
+            status_code=422,
+            detail="before_failed_at and before_id must be given together",
+        )
     try:
-        failed_items = await storage.get_failed(limit=limit, offset=offset)
+        if before_failed_at is not None and before_id is not None:
+            failed_items, _ = await storage.get_failed_page(
+                limit=limit, cursor=(before_failed_at, before_id)
+            )
+        else:
+            failed_items = await storage.get_failed(limit=limit, offset=offset)
         return [
             {
                 "id": f.id,
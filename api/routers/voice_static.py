@@ -5,13 +5,13 @@ from pathlib import Path
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse
 
-from config.settings import Settings
+from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/voices", tags=["Voice"])
 
-_settings = Settings()
+_settings = get_settings()
 VOICE_PATH = Path(_settings.VOICE_STORAGE_PATH)
 
 
@@ -1,9 +1,10 @@
 """DI Container - production wiring with mem0ai + Postgres chat store (SoR)."""
 
 import logging
+
 from dependency_injector import containers, providers
 
-from config.settings import Settings
+from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,7 @@ class Container(containers.DeclarativeContainer):
     )
 
     # Settings
-    settings = providers.Singleton(Settings)
+    settings = providers.Singleton(get_settings)
 
     # Database clients
     qdrant_client = providers.Singleton(
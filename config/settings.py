@@ -2,8 +2,11 @@
 
 
 from __future__ import annotations
+
 import logging
+from functools import lru_cache
 from pathlib import Path
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 logger = logging.getLogger(__name__)
@@ -27,6 +30,11 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DSN: str | None = None  # If set, overrides individual fields above
+    # SQLAlchemy pool per process; keep (size + overflow) * processes <= max_connections
+    PG_POOL_SIZE: int = 20
+    PG_MAX_OVERFLOW: int = 20
+    # None keeps driver defaults; 0 disables prepared statement caching (e.g. behind pgbouncer)
+    PG_STATEMENT_CACHE_SIZE: int | None = None
     TENANT_ID: str = "default"
 
     # Application
@@ -295,10 +303,12 @@ class Settings(BaseSettings):
 
     # 🔧 New-style Pydantic v2 config
     # No env_mapping needed - fields are automatically read from env vars with the same name
+    # Frozen: settings are validated once at startup and shared read-only afterwards
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         extra="ignore",
+        frozen=True,
     )
 
     @property
@@ -340,8 +350,8 @@ class Settings(BaseSettings):
         try:
             from memory.attribute_schema import ATTRIBUTE_SCHEMA
             from memory.mem_custom_prompt import (
-                build_update_memory_prompt_with_schema,
                 build_fact_extraction_prompt_with_schema,
+                build_update_memory_prompt_with_schema,
             )
 
             # Build prompts dynamically with schema
@@ -356,7 +366,6 @@ class Settings(BaseSettings):
             ATTRIBUTE_SCHEMA = None
         
         # Check if model exists locally
-        import os
         from pathlib import Path
         
         model_cache = Path(__file__).parent.parent / "embedding_model"
@@ -414,3 +423,9 @@ class Settings(BaseSettings):
             cfg["attribute_schema"] = ATTRIBUTE_SCHEMA
 
         return cfg
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings, validated from the environment on first call."""
+    return Settings()
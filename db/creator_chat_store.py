@@ -1,19 +1,64 @@
-
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any
 
 import asyncpg
 
 logger = logging.getLogger(__name__)
 
 MAX_MESSAGES_PER_USER = 40
+LAST_AI_CACHE_MAX_USERS = 10_000
+
+_SQL_INSERT = """
+    INSERT INTO creator_chat_events
+        (user_id, role, text, input_type, voice_url, voice_duration_seconds)
+    VALUES ($1, $2, $3, $4, $5, $6)
+    RETURNING id
+"""
+
+_SQL_PRUNE = """
+    DELETE FROM creator_chat_events
+    WHERE id NOT IN (
+        SELECT id FROM creator_chat_events
+        WHERE user_id = $1
+        ORDER BY ts DESC
+        LIMIT $2
+    )
+    AND user_id = $1
+"""
+
+_SQL_RECENT = """
+    SELECT id, role, text, ts
+    FROM creator_chat_events
+    WHERE user_id = $1
+    ORDER BY ts DESC
+    LIMIT $2
+"""
+
+_SQL_LAST_AI = """
+    SELECT text FROM creator_chat_events
+    WHERE user_id = $1 AND role = 'ai'
+    ORDER BY ts DESC
+    LIMIT 1
+"""
+
+_SQL_COUNT = "SELECT COUNT(*) FROM creator_chat_events WHERE user_id = $1"
+
+_SQL_CLEAR = "DELETE FROM creator_chat_events WHERE user_id = $1"
 
 
 class CreatorChatStore:
     def __init__(self, dsn: str) -> None:
         self._dsn = dsn
+        self._last_ai_cache: OrderedDict[str, str] = OrderedDict()
+
+    def _remember_last_ai(self, user_id: str, text: str) -> None:
+        self._last_ai_cache[user_id] = text
+        self._last_ai_cache.move_to_end(user_id)
+        if len(self._last_ai_cache) > LAST_AI_CACHE_MAX_USERS:
+            self._last_ai_cache.popitem(last=False)
 
     async def _require_pool(self) -> asyncpg.Pool:
         from db.shared_pool import SharedPostgresPool
@@ -39,12 +84,7 @@ class CreatorChatStore:
 
         async with pool.acquire() as conn:
             rec_id = await conn.fetchval(
-                """
-                INSERT INTO creator_chat_events
-                    (user_id, role, text, input_type, voice_url, voice_duration_seconds)
-                VALUES ($1, $2, $3, $4, $5, $6)
-                RETURNING id
-                """,
+                _SQL_INSERT,
                 user_id,
                 role,
                 text,
@@ -53,26 +93,16 @@ class CreatorChatStore:
                 voice_duration_seconds,
             )
 
-            await conn.execute(
-                """
-                DELETE FROM creator_chat_events
-                WHERE id NOT IN (
-                    SELECT id FROM creator_chat_events
-                    WHERE user_id = $1
-                    ORDER BY ts DESC
-                    LIMIT $2
-                )
-                AND user_id = $1
-                """,
-                user_id,
-                MAX_MESSAGES_PER_USER,
-            )
+            await conn.execute(_SQL_PRUNE, user_id, MAX_MESSAGES_PER_USER)
 
             logger.debug(
                 "creator_chat_store:log_message",
                 extra={"user_id": user_id, "role": role, "id": rec_id, "input_type": input_type}
             )
 
+        if role == "ai":
+            self._remember_last_ai(user_id, text)
+
         return int(rec_id)
 
     async def get_recent_messages(
@@ -80,21 +110,11 @@ class CreatorChatStore:
         *,
         user_id: str,
         limit: int = MAX_MESSAGES_PER_USER,
-    ) -> List[Dict[str, Any]]:
+    ) -> list[dict[str, Any]]:
         pool = await self._require_pool()
 
         async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT id, role, text, ts
-                FROM creator_chat_events
-                WHERE user_id = $1
-                ORDER BY ts DESC
-                LIMIT $2
-                """,
-                user_id,
-                limit,
-            )
+            rows = await conn.fetch(_SQL_RECENT, user_id, limit)
 
         return [
             {
@@ -106,39 +126,39 @@ class CreatorChatStore:
             for r in reversed(rows)
         ]
 
-    async def get_last_ai_message(self, *, user_id: str) -> Optional[str]:
+    async def get_last_ai_message(self, *, user_id: str) -> str | None:
+        cached = self._last_ai_cache.get(user_id)
+        if cached is not None:
+            self._last_ai_cache.move_to_end(user_id)
+            return cached
+
         pool = await self._require_pool()
 
         async with pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT text FROM creator_chat_events
-                WHERE user_id = $1 AND role = 'ai'
-                ORDER BY ts DESC
-                LIMIT 1
-                """,
-                user_id,
-            )
+            row = await conn.fetchrow(_SQL_LAST_AI, user_id)
 
-        return row["text"] if row else None
+        if row is None:
+            return None
+
+        self._remember_last_ai(user_id, row["text"])
+        return row["text"]
 
     async def get_message_count(self, *, user_id: str) -> int:
         pool = await self._require_pool()
 
         async with pool.acquire() as conn:
-            count = await conn.fetchval(
-                "SELECT COUNT(*) FROM creator_chat_events WHERE user_id = $1",
-                user_id,
-            )
+            count = await conn.fetchval(_SQL_COUNT, user_id)
 
         return int(count or 0)
 
     async def clear_history(self, *, user_id: str) -> int:
+        self._last_ai_cache.pop(user_id, None)
         pool = await self._require_pool()
 
         async with pool.acquire() as conn:
-            result = await conn.execute(
-                "DELETE FROM creator_chat_events WHERE user_id = $1",
-                user_id,
-            )
-            return int(result.split()[-1]) if result else 0
+            result = await conn.execute(_SQL_CLEAR, user_id)
+
+        # Popped again: a concurrent get_last_ai_message may have re-cached
+        # the old row while the DELETE was in flight.
+        self._last_ai_cache.pop(user_id, None)
+        return int(result.split()[-1]) if result else 0
@@ -1,12 +1,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any, Tuple, TYPE_CHECKING
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
 import asyncpg
 
@@ -17,18 +22,117 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_DYADIC_THRESHOLD = 500
 
-
+PAIR_CACHE_SIZE = 131072
+
+# Batches at or above this size go through a COPY into a staging table
+COPY_MIN_ROWS = 16
+
+ITER_PREFETCH_ROWS = 256
+
+LOCK_MAX_ATTEMPTS = 8
+LOCK_BACKOFF_BASE_SECONDS = 0.01
+LOCK_BACKOFF_MAX_SECONDS = 0.5
+
+# BLAKE2b personalization keeps these advisory-lock keys apart from other lock namespaces
+_LOCK_KEY_PERSON = b"passive_summ"
+
+ARCHIVE_COLUMNS = [
+    "user_id",
+    "to_user_id",
+    "conversation_id",
+    "message_id",
+    "message",
+    "language",
+    "timestamp_iso",
+]
+
+_ARCHIVE_DEFAULTS = MappingProxyType({
+    "user_id": "",
+    "to_user_id": "",
+    "conversation_id": "",
+    "message_id": "",
+    "message": "",
+    "language": "fa",
+    "timestamp_iso": "",
+})
+
+_get_archive_row = itemgetter(*ARCHIVE_COLUMNS)
+
+
+# Pair history queries. Each ordering is one static text, so asyncpg's
+# per-connection statement cache prepares it once and later calls only
+# Bind/Execute; never interpolate into these. LIMIT NULL means no limit,
+# which iter_messages_for_pair relies on.
+_SQL_PAIR_LATEST = """
+    SELECT * FROM (
+        SELECT id, user_id, to_user_id, conversation_id, message_id,
+               message, language, timestamp_iso, archived_at, deleted
+        FROM passive_archive
+        WHERE pair_id = $1 AND deleted = FALSE
+        ORDER BY timestamp_iso DESC
+        LIMIT $2
+    ) latest
+    ORDER BY timestamp_iso ASC
+"""
+
+_SQL_PAIR_EARLIEST = """
+    SELECT id, user_id, to_user_id, conversation_id, message_id,
+           message, language, timestamp_iso, archived_at, deleted
+    FROM passive_archive
+    WHERE pair_id = $1 AND deleted = FALSE
+    ORDER BY timestamp_iso ASC
+    LIMIT $2
+"""
+
+_SQL_PAIRS_NEEDING_DYADIC = """
+    SELECT id, user_a, user_b, pair_id, total_archived_count,
+           last_dyadic_calc_at_count, last_relationship_class,
+           created_at, last_updated_at
+    FROM passive_pair_counter
+    WHERE (total_archived_count - last_dyadic_calc_at_count) >= $1
+    ORDER BY (total_archived_count - last_dyadic_calc_at_count) DESC
+    LIMIT $2
+"""
+
+
+# pair_id is persisted and shared with postgres_chat_store and
+# relationship_feedback_service, so the hash itself must stay SHA-256.
+@lru_cache(maxsize=PAIR_CACHE_SIZE)
 def compute_pair_id(user_a: str, user_b: str) -> str:
-    lo, hi = sorted([(user_a or "").strip(), (user_b or "").strip()])
-    digest = hashlib.sha256(f"{lo}::{hi}".encode("utf-8")).hexdigest()
+    a, b = (user_a or "").strip(), (user_b or "").strip()
+    lo, hi = (a, b) if a <= b else (b, a)
+    digest = hashlib.sha256(f"{lo}::{hi}".encode()).hexdigest()
     return digest[:16]
 
 
-def sort_user_pair(user_a: str, user_b: str) -> Tuple[str, str]:
-    return tuple(sorted([user_a, user_b]))
+# passive_archive.pair_id is generated by passive_pair_id() in SQL, whose
+# btrim() only knows this ASCII set. Lookups on that column hash with it;
+# every other table keeps compute_pair_id's str.strip() ids. The two differ
+# only for ids padded with Unicode spaces such as NBSP.
+PAIR_ID_STRIP_CHARS = " \t\n\r\x0b\f"
+
+
+@lru_cache(maxsize=PAIR_CACHE_SIZE)
+def archive_pair_id(user_a: str, user_b: str) -> str:
+    a, b = (user_a or "").strip(PAIR_ID_STRIP_CHARS), (user_b or "").strip(PAIR_ID_STRIP_CHARS)
+    lo, hi = (a, b) if a <= b else (b, a)
+    digest = hashlib.sha256(f"{lo}::{hi}".encode()).hexdigest()
+    return digest[:16]
+
 
+@lru_cache(maxsize=PAIR_CACHE_SIZE)
+def sort_user_pair(user_a: str, user_b: str) -> tuple[str, str]:
+    return (user_a, user_b) if user_a <= user_b else (user_b, user_a)
 
-@dataclass
+
+def clear_pair_caches() -> None:
+    compute_pair_id.cache_clear()
+    archive_pair_id.cache_clear()
+    sort_user_pair.cache_clear()
+
+
+# Field order matches the SELECT column order; rows are unpacked positionally.
+@dataclass(slots=True)
 class ArchivedMessage:
     id: int
     user_id: str
@@ -42,7 +146,7 @@ class ArchivedMessage:
     deleted: bool = False
 
 
-@dataclass 
+@dataclass(slots=True, frozen=True)
 class PairCounterRecord:
     id: int
     user_a: str
@@ -50,7 +154,7 @@ class PairCounterRecord:
     pair_id: str
     total_archived_count: int
     last_dyadic_calc_at_count: int
-    last_relationship_class: Optional[str]
+    last_relationship_class: str | None
     created_at: datetime
     last_updated_at: datetime
 
@@ -59,50 +163,86 @@ class PassiveArchiveStorage:
 
     def __init__(self, dsn: str) -> None:
         self._dsn = dsn
+        self._pool: asyncpg.Pool | None = None
+        # Session-level advisory locks live on one dedicated connection; the
+        # guard serializes its queries and _held_lock_keys gives in-process
+        # exclusion, since PG advisory locks are re-entrant per session.
+        self._lock_conn: asyncpg.Connection | None = None
+        self._lock_conn_guard = asyncio.Lock()
+        self._held_lock_keys: set[int] = set()
     
     async def close(self) -> None:
-        pass
+        if self._lock_conn is not None and not self._lock_conn.is_closed():
+            await self._lock_conn.close()
+        self._lock_conn = None
     
     async def _require_pool(self) -> asyncpg.Pool:
-        from db.shared_pool import SharedPostgresPool
-        return await SharedPostgresPool.get_pool(self._dsn)
+        if self._pool is None or self._pool.is_closing():
+            from db.shared_pool import SharedPostgresPool
+            self._pool = await SharedPostgresPool.get_pool(self._dsn)
+        return self._pool
 
     async def archive_messages(
         self,
-        messages: List[Dict[str, Any]],
+        messages: list[dict[str, Any]],
     ) -> int:
         if not messages:
             return 0
         
         pool = await self._require_pool()
         
+        # Scheduler messages carry every key; only partial dicts pay for the
+        # defaults merge.
+        try:
+            values = list(map(_get_archive_row, messages))
+        except KeyError:
+            values = [_get_archive_row({**_ARCHIVE_DEFAULTS, **msg}) for msg in messages]
+        
         async with pool.acquire() as conn:
-            values = [
-                (
-                    msg.get("user_id", ""),
-                    msg.get("to_user_id", ""),
-                    msg.get("conversation_id", ""),
-                    msg.get("message_id", ""),
-                    msg.get("message", ""),
-                    msg.get("language", "fa"),
-                    msg.get("timestamp_iso", ""),
-                    False,
+            if len(values) < COPY_MIN_ROWS:
+                columns = list(zip(*values))
+                result = await conn.execute(
+                    """
+                    INSERT INTO passive_archive 
+                        (user_id, to_user_id, conversation_id, message_id, message, language, timestamp_iso)
+                    SELECT * FROM unnest(
+                        $1::text[], $2::text[], $3::text[], $4::text[],
+                        $5::text[], $6::text[], $7::text[]
+                    )
+                    ON CONFLICT (conversation_id, message_id) DO NOTHING
+                    """,
+                    *columns,
                 )
-                for msg in messages
-            ]
-            
-            result = await conn.executemany(
-                """
-                INSERT INTO passive_archive 
-                    (user_id, to_user_id, conversation_id, message_id, message, language, timestamp_iso, deleted)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                ON CONFLICT (conversation_id, message_id) DO NOTHING
-                """,
-                values,
-            )
+            else:
+                async with conn.transaction():
+                    await conn.execute(
+                        """
+                        CREATE TEMP TABLE _stage_archive ON COMMIT DROP AS
+                        SELECT user_id, to_user_id, conversation_id, message_id,
+                               message, language, timestamp_iso
+                        FROM passive_archive
+                        WITH NO DATA
+                        """
+                    )
+                    await conn.copy_records_to_table(
+                        "_stage_archive",
+                        records=values,
+                        columns=ARCHIVE_COLUMNS,
+                    )
+                    result = await conn.execute(
+                        """
+                        INSERT INTO passive_archive 
+                            (user_id, to_user_id, conversation_id, message_id, message, language, timestamp_iso)
+                        SELECT user_id, to_user_id, conversation_id, message_id,
+                               message, language, timestamp_iso
+                        FROM _stage_archive
+                        ON CONFLICT (conversation_id, message_id) DO NOTHING
+                        """
+                    )
         
-        logger.info(f"passive_archive:archived:{len(messages)} messages")
-        return len(messages)
+        inserted = int(result.split()[-1]) if result else 0
+        logger.info(f"passive_archive:archived:{inserted}/{len(messages)} messages")
+        return inserted
 
     async def get_messages_for_pair(
         self,
@@ -110,97 +250,81 @@ class PassiveArchiveStorage:
         user_b: str,
         limit: int = 500,
         latest_first: bool = True,
-    ) -> List[ArchivedMessage]:
+    ) -> list[ArchivedMessage]:
         pool = await self._require_pool()
+        pair_id = archive_pair_id(user_a, user_b)
+        sql = _SQL_PAIR_LATEST if latest_first else _SQL_PAIR_EARLIEST
         
         async with pool.acquire() as conn:
-            order = "DESC" if latest_first else "ASC"
-            rows = await conn.fetch(
-                f"""
-                SELECT id, user_id, to_user_id, conversation_id, message_id,
-                       message, language, timestamp_iso, archived_at, deleted
-                FROM passive_archive
-                WHERE ((user_id = $1 AND to_user_id = $2)
-                   OR (user_id = $2 AND to_user_id = $1))
-                   AND deleted = FALSE
-                ORDER BY timestamp_iso {order}
-                LIMIT $3
-                """,
-                user_a,
-                user_b,
-                limit,
-            )
+            rows = await conn.fetch(sql, pair_id, limit)
         
-        messages = [
-            ArchivedMessage(
-                id=row["id"],
-                user_id=row["user_id"],
-                to_user_id=row["to_user_id"],
-                conversation_id=row["conversation_id"],
-                message_id=row["message_id"],
-                message=row["message"],
-                language=row["language"],
-                timestamp_iso=row["timestamp_iso"],
-                archived_at=row["archived_at"],
-                deleted=row["deleted"],
-            )
-            for row in rows
-        ]
-        
-        if latest_first:
-            messages.reverse()
+        return [ArchivedMessage(*row) for row in rows]
+
+    async def iter_messages_for_pair(
+        self,
+        user_a: str,
+        user_b: str,
+        limit: int | None = None,
+        latest_first: bool = True,
+        prefetch: int = ITER_PREFETCH_ROWS,
+    ) -> AsyncIterator[ArchivedMessage]:
+        pool = await self._require_pool()
+        pair_id = archive_pair_id(user_a, user_b)
+        sql = _SQL_PAIR_LATEST if latest_first else _SQL_PAIR_EARLIEST
         
-        return messages
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                async for row in conn.cursor(sql, pair_id, limit, prefetch=prefetch):
+                    yield ArchivedMessage(*row)
 
     async def count_messages_for_pair(self, user_a: str, user_b: str) -> int:
         pool = await self._require_pool()
+        pair_id = archive_pair_id(user_a, user_b)
         
+        # Exact count of live rows; served from the partial
+        # (pair_id, timestamp_iso) WHERE deleted = FALSE index.
         async with pool.acquire() as conn:
             count = await conn.fetchval(
                 """
                 SELECT COUNT(*) FROM passive_archive
-                WHERE ((user_id = $1 AND to_user_id = $2)
-                   OR (user_id = $2 AND to_user_id = $1))
-                   AND deleted = FALSE
+                WHERE pair_id = $1 AND deleted = FALSE
                 """,
-                user_a,
-                user_b,
+                pair_id,
             )
         
         return int(count or 0)
 
-    async def mark_as_deleted(
-        self,
-        user_a: str,
-        user_b: str,
-        message_ids: Optional[List[int]] = None,
-    ) -> int:
+    async def _soft_delete(self, pair_ids: list[str], message_ids: list[int]) -> int:
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
-            if message_ids:
-                result = await conn.execute(
-                    """
-                    UPDATE passive_archive
-                    SET deleted = TRUE
-                    WHERE id = ANY($1) AND deleted = FALSE
-                    """,
-                    message_ids,
-                )
-            else:
-                result = await conn.execute(
-                    """
+            count = await conn.fetchval(
+                """
+                WITH d AS (
                     UPDATE passive_archive
                     SET deleted = TRUE
-                    WHERE ((user_id = $1 AND to_user_id = $2)
-                       OR (user_id = $2 AND to_user_id = $1))
-                       AND deleted = FALSE
-                    """,
-                    user_a,
-                    user_b,
+                    WHERE deleted = FALSE
+                      AND (pair_id = ANY($1::text[]) OR id = ANY($2::bigint[]))
+                    RETURNING 1
                 )
+                SELECT COUNT(*) FROM d
+                """,
+                pair_ids,
+                message_ids,
+            )
         
-        count = int(result.split()[-1]) if result else 0
+        return int(count or 0)
+
+    async def mark_as_deleted(
+        self,
+        user_a: str,
+        user_b: str,
+        message_ids: list[int] | None = None,
+    ) -> int:
+        if message_ids:
+            count = await self._soft_delete([], list(message_ids))
+        else:
+            count = await self._soft_delete([archive_pair_id(user_a, user_b)], [])
         
         logger.info(
             f"passive_archive:soft_delete:{count} messages marked as deleted",
@@ -209,10 +333,43 @@ class PassiveArchiveStorage:
         
         return count
 
+    async def mark_as_deleted_many(
+        self,
+        entries: list[tuple[str, str, list[int] | None]],
+    ) -> int:
+        if not entries:
+            return 0
+        
+        pair_ids: list[str] = []
+        message_ids: list[int] = []
+        for user_a, user_b, ids in entries:
+            if ids:
+                message_ids.extend(ids)
+            else:
+                pair_ids.append(archive_pair_id(user_a, user_b))
+        
+        count = await self._soft_delete(pair_ids, message_ids)
+        
+        logger.info(
+            f"passive_archive:soft_delete_many:{count} messages marked as deleted",
+            extra={"pairs": len(pair_ids), "message_ids": len(message_ids)},
+        )
+        
+        return count
+
     def _lock_key(self, pair_id: str, conversation_id: str) -> int:
-        combined = f"passive_summ::{pair_id}::{conversation_id}"
-        h = hashlib.sha256(combined.encode("utf-8")).digest()
-        return int.from_bytes(h[:8], byteorder="big", signed=True)
+        h = hashlib.blake2b(
+            f"{pair_id}|{conversation_id}".encode(),
+            digest_size=8,
+            person=_LOCK_KEY_PERSON,
+        ).digest()
+        return int.from_bytes(h, byteorder="big", signed=True)
+
+    async def _lock_fetchval(self, sql: str, lock_key: int) -> Any:
+        async with self._lock_conn_guard:
+            if self._lock_conn is None or self._lock_conn.is_closed():
+                self._lock_conn = await asyncpg.connect(self._dsn)
+            return await self._lock_conn.fetchval(sql, lock_key)
 
     @asynccontextmanager
     async def acquire_summarization_lock(
@@ -221,18 +378,29 @@ class PassiveArchiveStorage:
         user_b: str,
         conversation_id: str,
     ):
-        pool = await self._require_pool()
         pair_id = compute_pair_id(user_a, user_b)
         lock_key = self._lock_key(pair_id, conversation_id)
 
-        conn = await pool.acquire()
         acquired = False
         try:
             logger.debug(f"passive_archive:lock:attempting:{lock_key} for {pair_id}")
-            acquired = await conn.fetchval(
-                "SELECT pg_try_advisory_lock($1)",
-                lock_key,
-            )
+            for attempt in range(LOCK_MAX_ATTEMPTS):
+                if lock_key not in self._held_lock_keys:
+                    self._held_lock_keys.add(lock_key)
+                    try:
+                        acquired = bool(
+                            await self._lock_fetchval("SELECT pg_try_advisory_lock($1)", lock_key)
+                        )
+                    finally:
+                        if not acquired:
+                            self._held_lock_keys.discard(lock_key)
+                    if acquired:
+                        break
+                if attempt + 1 < LOCK_MAX_ATTEMPTS:
+                    await asyncio.sleep(
+                        min(LOCK_BACKOFF_BASE_SECONDS * 2 ** attempt, LOCK_BACKOFF_MAX_SECONDS)
+                    )
+
             if not acquired:
                 logger.warning(f"passive_archive:lock:failed:{pair_id}")
                 raise RuntimeError(
@@ -243,17 +411,20 @@ class PassiveArchiveStorage:
             yield
         finally:
             if acquired:
-                await conn.fetchval("SELECT pg_advisory_unlock($1)", lock_key)
-                logger.debug(f"passive_archive:lock:released:{lock_key}")
-            await pool.release(conn)
+                try:
+                    await self._lock_fetchval("SELECT pg_advisory_unlock($1)", lock_key)
+                    logger.debug(f"passive_archive:lock:released:{lock_key}")
+                finally:
+                    self._held_lock_keys.discard(lock_key)
 
 
 class PassivePairCounter:
 
     DYADIC_THRESHOLD = DEFAULT_DYADIC_THRESHOLD
 
-    def __init__(self, dsn: str, settings: Optional["Settings"] = None) -> None:
+    def __init__(self, dsn: str, settings: Settings | None = None) -> None:
         self._dsn = dsn
+        self._pool: asyncpg.Pool | None = None
         
         if settings:
             self._dyadic_threshold = getattr(
@@ -266,8 +437,10 @@ class PassivePairCounter:
         pass
     
     async def _require_pool(self) -> asyncpg.Pool:
-        from db.shared_pool import SharedPostgresPool
-        return await SharedPostgresPool.get_pool(self._dsn)
+        if self._pool is None or self._pool.is_closing():
+            from db.shared_pool import SharedPostgresPool
+            self._pool = await SharedPostgresPool.get_pool(self._dsn)
+        return self._pool
 
     async def increment(
         self,
@@ -299,17 +472,52 @@ class PassivePairCounter:
                 count,
             )
         
-        return PairCounterRecord(
-            id=row["id"],
-            user_a=row["user_a"],
-            user_b=row["user_b"],
-            pair_id=row["pair_id"],
-            total_archived_count=row["total_archived_count"],
-            last_dyadic_calc_at_count=row["last_dyadic_calc_at_count"],
-            last_relationship_class=row["last_relationship_class"],
-            created_at=row["created_at"],
-            last_updated_at=row["last_updated_at"],
-        )
+        return PairCounterRecord(*row)
+
+    async def increment_many(
+        self,
+        pairs: list[tuple[str, str, int]],
+    ) -> list[PairCounterRecord]:
+        if not pairs:
+            return []
+        
+        totals: dict[str, list[Any]] = {}
+        for user_a, user_b, count in pairs:
+            pair_id = compute_pair_id(user_a, user_b)
+            entry = totals.get(pair_id)
+            if entry is None:
+                sorted_a, sorted_b = sort_user_pair(user_a, user_b)
+                totals[pair_id] = [sorted_a, sorted_b, count]
+            else:
+                entry[2] += count
+        
+        pool = await self._require_pool()
+        
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                WITH v AS (
+                    SELECT * FROM unnest($1::text[], $2::text[], $3::text[], $4::int[])
+                        AS t(user_a, user_b, pair_id, cnt)
+                )
+                INSERT INTO passive_pair_counter 
+                    (user_a, user_b, pair_id, total_archived_count)
+                SELECT user_a, user_b, pair_id, cnt FROM v
+                ON CONFLICT (pair_id) DO UPDATE SET
+                    total_archived_count = passive_pair_counter.total_archived_count
+                                           + EXCLUDED.total_archived_count,
+                    last_updated_at = NOW()
+                RETURNING id, user_a, user_b, pair_id, total_archived_count,
+                          last_dyadic_calc_at_count, last_relationship_class,
+                          created_at, last_updated_at
+                """,
+                [e[0] for e in totals.values()],
+                [e[1] for e in totals.values()],
+                list(totals.keys()),
+                [e[2] for e in totals.values()],
+            )
+        
+        return [PairCounterRecord(*row) for row in rows]
 
     async def needs_dyadic_calculation(self, user_a: str, user_b: str) -> bool:
         pool = await self._require_pool()
@@ -333,11 +541,37 @@ class PassivePairCounter:
         
         return (total - last_calc) >= self._dyadic_threshold
 
+    async def claim_for_dyadic(
+        self,
+        user_a: str,
+        user_b: str,
+    ) -> PairCounterRecord | None:
+        pool = await self._require_pool()
+        pair_id = compute_pair_id(user_a, user_b)
+        
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                UPDATE passive_pair_counter
+                SET last_dyadic_calc_at_count = total_archived_count,
+                    last_updated_at = NOW()
+                WHERE pair_id = $1
+                  AND (total_archived_count - last_dyadic_calc_at_count) >= $2
+                RETURNING id, user_a, user_b, pair_id, total_archived_count,
+                          last_dyadic_calc_at_count, last_relationship_class,
+                          created_at, last_updated_at
+                """,
+                pair_id,
+                self._dyadic_threshold,
+            )
+        
+        return PairCounterRecord(*row) if row else None
+
     async def mark_dyadic_calculated(
         self,
         user_a: str,
         user_b: str,
-        relationship_class: Optional[str] = None,
+        relationship_class: str | None = None,
     ) -> None:
         pool = await self._require_pool()
         pair_id = compute_pair_id(user_a, user_b)
@@ -355,7 +589,7 @@ class PassivePairCounter:
                 relationship_class,
             )
 
-    async def get(self, user_a: str, user_b: str) -> Optional[PairCounterRecord]:
+    async def get(self, user_a: str, user_b: str) -> PairCounterRecord | None:
         pool = await self._require_pool()
         pair_id = compute_pair_id(user_a, user_b)
         
@@ -374,56 +608,40 @@ class PassivePairCounter:
         if not row:
             return None
         
-        return PairCounterRecord(
-            id=row["id"],
-            user_a=row["user_a"],
-            user_b=row["user_b"],
-            pair_id=row["pair_id"],
-            total_archived_count=row["total_archived_count"],
-            last_dyadic_calc_at_count=row["last_dyadic_calc_at_count"],
-            last_relationship_class=row["last_relationship_class"],
-            created_at=row["created_at"],
-            last_updated_at=row["last_updated_at"],
-        )
+        return PairCounterRecord(*row)
 
-    async def get_pairs_needing_dyadic(self, limit: int = 50) -> List[PairCounterRecord]:
+    async def get_pairs_needing_dyadic(self, limit: int = 50) -> list[PairCounterRecord]:
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT id, user_a, user_b, pair_id, total_archived_count,
-                       last_dyadic_calc_at_count, last_relationship_class,
-                       created_at, last_updated_at
-                FROM passive_pair_counter
-                WHERE (total_archived_count - last_dyadic_calc_at_count) >= $1
-                ORDER BY (total_archived_count - last_dyadic_calc_at_count) DESC
-                LIMIT $2
-                """,
-                self._dyadic_threshold,
-                limit,
-            )
+            rows = await conn.fetch(_SQL_PAIRS_NEEDING_DYADIC, self._dyadic_threshold, limit)
         
-        return [
-            PairCounterRecord(
-                id=row["id"],
-                user_a=row["user_a"],
-                user_b=row["user_b"],
-                pair_id=row["pair_id"],
-                total_archived_count=row["total_archived_count"],
-                last_dyadic_calc_at_count=row["last_dyadic_calc_at_count"],
-                last_relationship_class=row["last_relationship_class"],
-                created_at=row["created_at"],
-                last_updated_at=row["last_updated_at"],
-            )
-            for row in rows
-        ]
+        return [PairCounterRecord(*row) for row in rows]
+
+    async def iter_pairs_needing_dyadic(
+        self,
+        limit: int | None = None,
+        prefetch: int = ITER_PREFETCH_ROWS,
+    ) -> AsyncIterator[asyncpg.Record]:
+        # Yields raw records in PairCounterRecord field order; wrap with
+        # PairCounterRecord(*row) only where a dataclass is actually needed.
+        pool = await self._require_pool()
+        
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                async for row in conn.cursor(
+                    _SQL_PAIRS_NEEDING_DYADIC,
+                    self._dyadic_threshold,
+                    limit,
+                    prefetch=prefetch,
+                ):
+                    yield row
 
     async def get_all_pairs(
         self, 
         min_messages: int = 0, 
         limit: int = 100,
-    ) -> List[PairCounterRecord]:
+    ) -> list[PairCounterRecord]:
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
@@ -441,17 +659,4 @@ class PassivePairCounter:
                 limit,
             )
         
-        return [
-            PairCounterRecord(
-                id=row["id"],
-                user_a=row["user_a"],
-                user_b=row["user_b"],
-                pair_id=row["pair_id"],
-                total_archived_count=row["total_archived_count"],
-                last_dyadic_calc_at_count=row["last_dyadic_calc_at_count"],
-                last_relationship_class=row["last_relationship_class"],
-                created_at=row["created_at"],
-                last_updated_at=row["last_updated_at"],
-            )
-            for row in rows
-        ]
+        return [PairCounterRecord(*row) for row in rows]
@@ -1,9 +1,11 @@
 
 from __future__ import annotations
 
-from typing import List, Dict, Any, Optional, Sequence
-import asyncpg
 import logging
+from collections.abc import Sequence
+from typing import Any
+
+import asyncpg
 
 logger = logging.getLogger(__name__)
 
@@ -12,13 +14,16 @@ class PassiveStorage:
 
     def __init__(self, dsn:str) -> None:
         self._dsn: str = dsn
+        self._pool: asyncpg.Pool | None = None
     
     async def _require_pool(self) -> asyncpg.Pool:
-        from db.shared_pool import SharedPostgresPool
-        return await SharedPostgresPool.get_pool(self._dsn)
+        if self._pool is None or self._pool.is_closing():
+            from db.shared_pool import SharedPostgresPool
+            self._pool = await SharedPostgresPool.get_pool(self._dsn)
+        return self._pool
     
     
-    async def get(self, limit: int = 100) -> List[Dict[str, Any]]:
+    async def get(self, limit: int = 100) -> list[dict[str, Any]]:
         pool = await self._require_pool()
         async with pool.acquire() as conn:
             rows = await conn.fetch(
@@ -31,18 +36,7 @@ class PassiveStorage:
                 """,
                 limit,
                 )
-        return[
-            {
-                "id": r["id"],
-                "user_id": r["user_id"],
-                "conversation_id": r["conversation_id"],
-                "message_id": r["message_id"],
-                "message": r["message"],
-                "language": r["language"],
-                "timestamp_iso": r["timestamp_iso"],
-            }
-            for r in rows
-        ]
+        return [dict(r) for r in rows]
     
 
     async def counts(self, *, user_id: str, conversation_id: str) -> int:
@@ -79,25 +73,42 @@ class PassiveStorage:
     async def add_last_message_id(self, user_id: str, message: str, message_id: str, conversation_id: str) -> None:
         pool = await self._require_pool()
         async with pool.acquire() as conn:
-            result = conn.execute("""INSERT INTO passive_last_message (user_id, message, message_id, conversation_id)
-            VALUES ($1, $2, $3, $4)
-            """,
-            user_id,
-            message,
-            message_id,
-            conversation_id,
+            await conn.execute(
+                """
+                INSERT INTO passive_last_message (user_id, last_message_id, last_message, conversation_id)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    last_message_id = EXCLUDED.last_message_id,
+                    last_message = EXCLUDED.last_message,
+                    conversation_id = EXCLUDED.conversation_id,
+                    updated_at = NOW()
+                """,
+                user_id,
+                message_id,
+                message,
+                conversation_id,
             )
 
 
     async def insert_to_table(self, *, user_id: str, conversation_id: str, message_id: str, message: str, language: str, timestamp_iso: str) -> int:
         pool = await self._require_pool()
-        result = []
         async with pool.acquire() as conn:
-            result = await conn.fetchrow(
+            inserted = await conn.fetchval(
                 """
-                INSERT INTO passive_observation (user_id, conversation_id, message_id, message, language, timestamp_iso)
-                VALUES ($1, $2, $3, $4, $5, $6)
-                RETURNING user_id, message, message_id, conversation_id
+                WITH ins AS (
+                    INSERT INTO passive_observation (user_id, conversation_id, message_id, message, language, timestamp_iso)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    RETURNING user_id, message_id, message, conversation_id
+                ), last AS (
+                    INSERT INTO passive_last_message (user_id, last_message_id, last_message, conversation_id)
+                    SELECT user_id, message_id, message, conversation_id FROM ins
+                    ON CONFLICT (user_id) DO UPDATE SET
+                        last_message_id = EXCLUDED.last_message_id,
+                        last_message = EXCLUDED.last_message,
+                        conversation_id = EXCLUDED.conversation_id,
+                        updated_at = NOW()
+                )
+                SELECT COUNT(*) FROM ins
                 """,
                 user_id,
                 conversation_id,
@@ -106,18 +117,11 @@ class PassiveStorage:
                 language,
                 timestamp_iso,
             )
-        if result is None:
+        if not inserted:
             logger.error("Failed to insert record into passive_observation table")
             return 0
 
-        await self.add_last_message_id(
-            result["user_id"],
-            result["message"],
-            result["message_id"],
-            result["conversation_id"],
-            )
-
-        return int(result.split()[-1])
+        return 1
 
     async def clear(self) -> int:
         pool = await self._require_pool()
@@ -2,16 +2,249 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
+import struct
+from collections.abc import AsyncIterator, Sequence
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any
 
 import asyncpg
 
 logger = logging.getLogger(__name__)
 
+FAILED_PREFETCH_ROWS = 50
 
-@dataclass
+# DSNs whose tables were already ensured by this process.
+_DSN_READY: set[str] = set()
+
+# Sent as one simple-protocol message, so every statement runs in a single
+# implicit transaction; the xact advisory lock keeps concurrent workers from
+# racing each other through the catalog and is released when it commits.
+_SQL_ENSURE_TABLES = """
+    SELECT pg_advisory_xact_lock(hashtext('passive_summ_ensure'));
+
+    -- Unlogged: skipping WAL is fine for a work queue. A crash truncates it,
+    -- which at worst drops pending retries; the failed table stays logged.
+    CREATE UNLOGGED TABLE IF NOT EXISTS passive_summarization_retry_queue (
+        id BIGSERIAL PRIMARY KEY,
+        tenant_id VARCHAR(64) NOT NULL DEFAULT 'default',
+        conversation_id VARCHAR(255) NOT NULL,
+        pair_id VARCHAR(32) NOT NULL,
+        user_a VARCHAR(255) NOT NULL,
+        user_b VARCHAR(255) NOT NULL,
+        message_ids BYTEA NOT NULL DEFAULT ''::bytea,
+        attempt_count INT NOT NULL DEFAULT 0,
+        next_retry_at TIMESTAMPTZ NOT NULL,
+        last_error TEXT DEFAULT '',
+        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_passive_summ_retry_tenant_next 
+    ON passive_summarization_retry_queue(tenant_id, next_retry_at);
+
+    CREATE TABLE IF NOT EXISTS passive_summarization_failed (
+        id BIGSERIAL PRIMARY KEY,
+        tenant_id VARCHAR(64) NOT NULL DEFAULT 'default',
+        conversation_id VARCHAR(255) NOT NULL,
+        pair_id VARCHAR(32) NOT NULL,
+        user_a VARCHAR(255) NOT NULL,
+        user_b VARCHAR(255) NOT NULL,
+        message_ids BYTEA NOT NULL DEFAULT ''::bytea,
+        attempt_count INT NOT NULL DEFAULT 0,
+        last_error TEXT DEFAULT '',
+        created_at TIMESTAMPTZ NOT NULL,
+        failed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_passive_summ_failed_tenant_failed_at 
+    ON passive_summarization_failed(tenant_id, failed_at DESC, id DESC);
+
+    CREATE INDEX IF NOT EXISTS idx_passive_summ_failed_pair 
+    ON passive_summarization_failed(pair_id);
+"""
+
+_SQL_ENQUEUE = """
+    INSERT INTO passive_summarization_retry_queue 
+        (tenant_id, conversation_id, pair_id, user_a, user_b, 
+         message_ids, next_retry_at, last_error)
+    VALUES ($1, $2, $3, $4, $5, $6, NOW() + make_interval(secs => $7), $8)
+    RETURNING id
+"""
+
+_SQL_ENQUEUE_MANY = """
+    INSERT INTO passive_summarization_retry_queue 
+        (tenant_id, conversation_id, pair_id, user_a, user_b, 
+         message_ids, next_retry_at, last_error)
+    SELECT $1, conversation_id, pair_id, user_a, user_b,
+           message_ids, NOW() + make_interval(secs => $7), last_error
+    FROM unnest($2::text[], $3::text[], $4::text[], $5::text[], $6::bytea[], $8::text[])
+        AS t(conversation_id, pair_id, user_a, user_b, message_ids, last_error)
+    RETURNING id
+"""
+
+# Claims due jobs for this worker: SKIP LOCKED keeps concurrent workers off
+# the same rows, and pushing next_retry_at out by a lease hides claimed jobs
+# until update_retry_attempt/remove_retry settles them (or the lease lapses
+# after a crash). The original due time is returned as next_retry_at_us.
+# Timestamps come back as epoch microseconds so the hot claim path decodes
+# int8 instead of allocating tz-aware datetimes per row.
+_SQL_CLAIM_PENDING = """
+    WITH due AS (
+        SELECT id, next_retry_at AS due_at
+        FROM passive_summarization_retry_queue
+        WHERE tenant_id = $1 
+          AND next_retry_at <= NOW() 
+          AND attempt_count < $2
+        ORDER BY next_retry_at ASC
+        LIMIT $3
+        FOR UPDATE SKIP LOCKED
+    ), claimed AS (
+        UPDATE passive_summarization_retry_queue q
+        SET next_retry_at = NOW() + make_interval(secs => $4),
+            updated_at = NOW()
+        FROM due
+        WHERE q.id = due.id
+        RETURNING q.id, q.tenant_id, q.conversation_id, q.pair_id, q.user_a, q.user_b,
+                  q.message_ids, q.attempt_count,
+                  (EXTRACT(EPOCH FROM due.due_at) * 1000000)::bigint AS next_retry_at_us,
+                  q.last_error,
+                  (EXTRACT(EPOCH FROM q.created_at) * 1000000)::bigint AS created_at_us,
+                  (EXTRACT(EPOCH FROM q.updated_at) * 1000000)::bigint AS updated_at_us
+    )
+    SELECT * FROM claimed ORDER BY next_retry_at_us ASC
+"""
+
+_SQL_BUMP_ATTEMPT = """
+    WITH cur AS (
+        SELECT id, attempt_count + 1 AS next_attempt
+        FROM passive_summarization_retry_queue
+        WHERE id = $1
+        FOR UPDATE
+    ), moved AS (
+        DELETE FROM passive_summarization_retry_queue q
+        USING cur
+        WHERE q.id = cur.id AND cur.next_attempt >= $3
+        RETURNING q.tenant_id, q.conversation_id, q.pair_id, q.user_a, q.user_b,
+                  q.message_ids, cur.next_attempt, q.last_error, q.created_at
+    ), archived AS (
+        INSERT INTO passive_summarization_failed 
+            (tenant_id, conversation_id, pair_id, user_a, user_b, 
+             message_ids, attempt_count, last_error, created_at)
+        SELECT tenant_id, conversation_id, pair_id, user_a, user_b,
+               message_ids, next_attempt, COALESCE(NULLIF($2, ''), last_error), created_at
+        FROM moved
+    ), bumped AS (
+        UPDATE passive_summarization_retry_queue q
+        SET attempt_count = cur.next_attempt,
+            next_retry_at = NOW() + make_interval(
+                secs => ($4::int[])[LEAST(cur.next_attempt, array_length($4::int[], 1) - 1) + 1]
+            ),
+            last_error = COALESCE($2, ''),
+            updated_at = NOW()
+        FROM cur
+        WHERE q.id = cur.id AND cur.next_attempt < $3
+        RETURNING q.attempt_count, q.next_retry_at
+    )
+    SELECT
+        (SELECT next_attempt FROM cur) AS attempt,
+        (SELECT next_retry_at FROM bumped) AS next_retry_at,
+        (SELECT conversation_id FROM moved) AS moved_conversation_id,
+        (SELECT pair_id FROM moved) AS moved_pair_id
+"""
+
+_SQL_REMOVE_RETRY = "DELETE FROM passive_summarization_retry_queue WHERE id = $1"
+
+_SQL_REMOVE_RETRIES = "DELETE FROM passive_summarization_retry_queue WHERE id = ANY($1::bigint[])"
+
+_SQL_GET_FAILED = """
+    SELECT id, tenant_id, conversation_id, pair_id, user_a, user_b,
+           message_ids, attempt_count, last_error, created_at, failed_at
+    FROM passive_summarization_failed
+    WHERE tenant_id = $1
+    ORDER BY failed_at DESC, id DESC
+    LIMIT $2 OFFSET $3
+"""
+
+_SQL_GET_FAILED_BEFORE = """
+    SELECT id, tenant_id, conversation_id, pair_id, user_a, user_b,
+           message_ids, attempt_count, last_error, created_at, failed_at
+    FROM passive_summarization_failed
+    WHERE tenant_id = $1 AND (failed_at, id) < ($2, $3)
+    ORDER BY failed_at DESC, id DESC
+    LIMIT $4
+"""
+
+_SQL_REQUEUE_FAILED = """
+    WITH moved AS (
+        DELETE FROM passive_summarization_failed
+        WHERE id = $1 AND tenant_id = $2
+        RETURNING tenant_id, conversation_id, pair_id, user_a, user_b, message_ids
+    )
+    INSERT INTO passive_summarization_retry_queue 
+        (tenant_id, conversation_id, pair_id, user_a, user_b, 
+         message_ids, attempt_count, next_retry_at, last_error)
+    SELECT tenant_id, conversation_id, pair_id, user_a, user_b,
+           message_ids, 0, NOW() + make_interval(secs => $3), ''
+    FROM moved
+    RETURNING id
+"""
+
+_SQL_REQUEUE_FAILED_MANY = """
+    WITH moved AS (
+        DELETE FROM passive_summarization_failed
+        WHERE id = ANY($1::bigint[]) AND tenant_id = $2
+        RETURNING tenant_id, conversation_id, pair_id, user_a, user_b, message_ids
+    )
+    INSERT INTO passive_summarization_retry_queue 
+        (tenant_id, conversation_id, pair_id, user_a, user_b, 
+         message_ids, attempt_count, next_retry_at, last_error)
+    SELECT tenant_id, conversation_id, pair_id, user_a, user_b,
+           message_ids, 0, NOW() + make_interval(secs => $3), ''
+    FROM moved
+    RETURNING id
+"""
+
+_SQL_DELETE_FAILED = "DELETE FROM passive_summarization_failed WHERE id = $1 AND tenant_id = $2"
+
+_SQL_STATS = """
+    SELECT
+        (SELECT COUNT(*) FROM passive_summarization_retry_queue
+         WHERE tenant_id = $1) AS retry_total,
+        (SELECT COUNT(*) FROM passive_summarization_retry_queue
+         WHERE tenant_id = $1 AND next_retry_at <= NOW() AND attempt_count < $2) AS retry_pending,
+        (SELECT COUNT(*) FROM passive_summarization_failed
+         WHERE tenant_id = $1) AS failed_total
+"""
+
+
+# message_ids is stored as BYTEA: big-endian int64s back to back, the same
+# layout int8send() produces, so migration 42 could convert BIGINT[] in SQL.
+_MESSAGE_IDS_COLUMN = 6
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _pack_ids(message_ids: Sequence[int]) -> bytes:
+    return struct.pack(f">{len(message_ids)}q", *message_ids)
+
+
+def _unpack_ids(packed: bytes) -> list[int]:
+    return list(struct.unpack(f">{len(packed) // 8}q", packed))
+
+
+def _from_epoch_us(epoch_us: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=epoch_us)
+
+
+def _unpack_row(row: Any) -> list[Any]:
+    values = list(row)
+    values[_MESSAGE_IDS_COLUMN] = _unpack_ids(values[_MESSAGE_IDS_COLUMN])
+    return values
+
+
+# Field order matches the SELECT column order; rows are unpacked positionally.
+@dataclass(slots=True)
 class SummarizationRetryJob:
     id: int
     tenant_id: str
@@ -19,15 +252,37 @@ class SummarizationRetryJob:
     pair_id: str
     user_a: str
     user_b: str
-    message_ids: List[int]
+    message_ids: list[int]
     attempt_count: int
-    next_retry_at: datetime
+    next_retry_at_us: int
     last_error: str
-    created_at: datetime
-    updated_at: datetime
+    created_at_us: int
+    updated_at_us: int
+
+    @property
+    def next_retry_at(self) -> datetime:
+        return _from_epoch_us(self.next_retry_at_us)
+
+    @property
+    def created_at(self) -> datetime:
+        return _from_epoch_us(self.created_at_us)
+
+    @property
+    def updated_at(self) -> datetime:
+        return _from_epoch_us(self.updated_at_us)
 
 
-@dataclass
+@dataclass(slots=True)
+class SummarizationRetrySpec:
+    conversation_id: str
+    pair_id: str
+    user_a: str
+    user_b: str
+    message_ids: Sequence[int]
+    last_error: str | None = None
+
+
+@dataclass(slots=True)
 class FailedSummarization:
     id: int
     tenant_id: str
@@ -35,88 +290,58 @@ class FailedSummarization:
     pair_id: str
     user_a: str
     user_b: str
-    message_ids: List[int]
+    message_ids: list[int]
     attempt_count: int
     last_error: str
     created_at: datetime
     failed_at: datetime
 
 
+# (failed_at, id) of the last row on the previous page.
+FailedCursor = tuple[datetime, int]
+
+
 class PassiveSummarizationStorage:
 
     DEFAULT_MAX_ATTEMPTS = 3
     DEFAULT_RETRY_DELAYS = [300, 3600, 14400]
+    CLAIM_LEASE_SECONDS = 900
 
     def __init__(
         self,
         dsn: str,
         tenant_id: str = "default",
         max_attempts: int | None = None,
-        retry_delays: List[int] | None = None,
+        retry_delays: list[int] | None = None,
     ) -> None:
         self._dsn = dsn
         self._tenant_id = tenant_id
         self._max_attempts = max_attempts or self.DEFAULT_MAX_ATTEMPTS
         self._retry_delays = retry_delays or self.DEFAULT_RETRY_DELAYS
+        self._pool: asyncpg.Pool | None = None
 
     async def _require_pool(self) -> asyncpg.Pool:
-        from db.shared_pool import SharedPostgresPool
-        return await SharedPostgresPool.get_pool(self._dsn)
+        if self._pool is None or self._pool.is_closing():
+            from db.shared_pool import SharedPostgresPool
+            self._pool = await SharedPostgresPool.get_pool(self._dsn)
+        return self._pool
 
     async def close(self) -> None:
         pass
 
 
     async def ensure_tables(self) -> None:
+        if self._dsn in _DSN_READY:
+            return
+        
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS passive_summarization_retry_queue (
-                    id BIGSERIAL PRIMARY KEY,
-                    tenant_id VARCHAR(64) NOT NULL DEFAULT 'default',
-                    conversation_id VARCHAR(255) NOT NULL,
-                    pair_id VARCHAR(32) NOT NULL,
-                    user_a VARCHAR(255) NOT NULL,
-                    user_b VARCHAR(255) NOT NULL,
-                    message_ids BIGINT[] NOT NULL,
-                    attempt_count INT NOT NULL DEFAULT 0,
-                    next_retry_at TIMESTAMPTZ NOT NULL,
-                    last_error TEXT DEFAULT '',
-                    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-                );
-                
-                CREATE INDEX IF NOT EXISTS idx_passive_summ_retry_tenant_next 
-                ON passive_summarization_retry_queue(tenant_id, next_retry_at);
-                
-                CREATE INDEX IF NOT EXISTS idx_passive_summ_retry_pair 
-                ON passive_summarization_retry_queue(pair_id);
-            """)
-            
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS passive_summarization_failed (
-                    id BIGSERIAL PRIMARY KEY,
-                    tenant_id VARCHAR(64) NOT NULL DEFAULT 'default',
-                    conversation_id VARCHAR(255) NOT NULL,
-                    pair_id VARCHAR(32) NOT NULL,
-                    user_a VARCHAR(255) NOT NULL,
-                    user_b VARCHAR(255) NOT NULL,
-                    message_ids BIGINT[] NOT NULL,
-                    attempt_count INT NOT NULL DEFAULT 0,
-                    last_error TEXT DEFAULT '',
-                    created_at TIMESTAMPTZ NOT NULL,
-                    failed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-                );
-                
-                CREATE INDEX IF NOT EXISTS idx_passive_summ_failed_tenant 
-                ON passive_summarization_failed(tenant_id);
-                
-                CREATE INDEX IF NOT EXISTS idx_passive_summ_failed_pair 
-                ON passive_summarization_failed(pair_id);
-            """)
+            await conn.execute(_SQL_ENSURE_TABLES)
         
-        logger.info("passive_summarization_storage:tables_ensured")
+        _DSN_READY.add(self._dsn)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("passive_summarization_storage:tables_ensured")
 
 
     async def enqueue_retry(
@@ -130,77 +355,79 @@ class PassiveSummarizationStorage:
         last_error: str | None = None,
     ) -> int:
         pool = await self._require_pool()
-        
-        next_retry = datetime.utcnow() + timedelta(seconds=self._retry_delays[0])
+        delay = self._retry_delays[0]
         
         async with pool.acquire() as conn:
             rec_id = await conn.fetchval(
-                """
-                INSERT INTO passive_summarization_retry_queue 
-                    (tenant_id, conversation_id, pair_id, user_a, user_b, 
-                     message_ids, next_retry_at, last_error)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                RETURNING id
-                """,
+                _SQL_ENQUEUE,
                 self._tenant_id,
                 conversation_id,
                 pair_id,
                 user_a,
                 user_b,
-                list(message_ids),
-                next_retry,
+                _pack_ids(message_ids),
+                delay,
                 last_error or "",
             )
         
-        logger.info(
-            "passive_summ_retry:enqueued",
-            extra={
-                "conversation_id": conversation_id,
-                "pair_id": pair_id,
-                "message_count": len(message_ids),
-                "next_retry": next_retry.isoformat(),
-            },
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "passive_summ_retry:enqueued",
+                extra={
+                    "conversation_id": conversation_id,
+                    "pair_id": pair_id,
+                    "message_count": len(message_ids),
+                    "retry_in_seconds": delay,
+                },
+            )
         return int(rec_id)
 
-    async def get_pending_retries(self, limit: int = 10) -> List[SummarizationRetryJob]:
+    async def enqueue_retry_many(
+        self,
+        specs: Sequence[SummarizationRetrySpec],
+    ) -> list[int]:
+        if not specs:
+            return []
+        
         pool = await self._require_pool()
+        delay = self._retry_delays[0]
         
         async with pool.acquire() as conn:
             rows = await conn.fetch(
-                """
-                SELECT id, tenant_id, conversation_id, pair_id, user_a, user_b,
-                       message_ids, attempt_count, next_retry_at, last_error,
-                       created_at, updated_at
-                FROM passive_summarization_retry_queue
-                WHERE tenant_id = $1 
-                  AND next_retry_at <= NOW() 
-                  AND attempt_count < $2
-                ORDER BY next_retry_at ASC
-                LIMIT $3
-                """,
+                _SQL_ENQUEUE_MANY,
+                self._tenant_id,
+                [s.conversation_id for s in specs],
+                [s.pair_id for s in specs],
+                [s.user_a for s in specs],
+                [s.user_b for s in specs],
+                [_pack_ids(s.message_ids) for s in specs],
+                delay,
+                [s.last_error or "" for s in specs],
+            )
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "passive_summ_retry:enqueued_many",
+                extra={
+                    "count": len(specs),
+                    "retry_in_seconds": delay,
+                },
+            )
+        return [int(r["id"]) for r in rows]
+
+    async def get_pending_retries(self, limit: int = 10) -> list[SummarizationRetryJob]:
+        pool = await self._require_pool()
+        
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                _SQL_CLAIM_PENDING,
                 self._tenant_id,
                 self._max_attempts,
                 limit,
+                self.CLAIM_LEASE_SECONDS,
             )
         
-        return [
-            SummarizationRetryJob(
-                id=r["id"],
-                tenant_id=r["tenant_id"],
-                conversation_id=r["conversation_id"],
-                pair_id=r["pair_id"],
-                user_a=r["user_a"],
-                user_b=r["user_b"],
-                message_ids=list(r["message_ids"]),
-                attempt_count=r["attempt_count"],
-                next_retry_at=r["next_retry_at"],
-                last_error=r["last_error"],
-                created_at=r["created_at"],
-                updated_at=r["updated_at"],
-            )
-            for r in rows
-        ]
+        return [SummarizationRetryJob(*_unpack_row(r)) for r in rows]
 
     async def update_retry_attempt(
         self,
@@ -212,217 +439,165 @@ class PassiveSummarizationStorage:
         
         async with pool.acquire() as conn:
             row = await conn.fetchrow(
-                "SELECT * FROM passive_summarization_retry_queue WHERE id = $1",
+                _SQL_BUMP_ATTEMPT,
                 retry_id,
+                last_error,
+                self._max_attempts,
+                self._retry_delays,
             )
-            
-            if not row:
-                logger.warning(f"passive_summ_retry:not_found:{retry_id}")
-                return False
-            
-            new_attempt = row["attempt_count"] + 1
-            
-            if new_attempt >= self._max_attempts:
-                await self._move_to_failed(conn, row, last_error)
-                return False
-            
-            delay_index = min(new_attempt, len(self._retry_delays) - 1)
-            next_retry = datetime.utcnow() + timedelta(seconds=self._retry_delays[delay_index])
-            
-            await conn.execute(
-                """
-                UPDATE passive_summarization_retry_queue
-                SET attempt_count = $2,
-                    next_retry_at = $3,
-                    last_error = $4,
-                    updated_at = NOW()
-                WHERE id = $1
-                """,
-                retry_id,
-                new_attempt,
-                next_retry,
-                last_error or "",
+        
+        if row is None or row["attempt"] is None:
+            logger.warning(f"passive_summ_retry:not_found:{retry_id}")
+            return False
+        
+        if row["next_retry_at"] is None:
+            logger.warning(
+                "passive_summ_retry:moved_to_failed",
+                extra={
+                    "conversation_id": row["moved_conversation_id"],
+                    "pair_id": row["moved_pair_id"],
+                    "attempts": row["attempt"],
+                },
             )
-            
+            return False
+        
+        if logger.isEnabledFor(logging.INFO):
             logger.info(
                 "passive_summ_retry:updated",
                 extra={
                     "retry_id": retry_id,
-                    "attempt": new_attempt,
-                    "next_retry": next_retry.isoformat(),
+                    "attempt": row["attempt"],
+                    "next_retry": row["next_retry_at"].isoformat(),
                 },
             )
-            return True
+        return True
 
     async def remove_retry(self, retry_id: int) -> None:
         pool = await self._require_pool()
         async with pool.acquire() as conn:
             await conn.execute(
-                "DELETE FROM passive_summarization_retry_queue WHERE id = $1",
+                _SQL_REMOVE_RETRY,
                 retry_id,
             )
-        logger.info(f"passive_summ_retry:removed:{retry_id}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"passive_summ_retry:removed:{retry_id}")
 
-    async def _move_to_failed(
-        self,
-        conn: asyncpg.Connection,
-        row: asyncpg.Record,
-        last_error: str | None,
-    ) -> None:
-        await conn.execute(
-            """
-            INSERT INTO passive_summarization_failed 
-                (tenant_id, conversation_id, pair_id, user_a, user_b, 
-                 message_ids, attempt_count, last_error, created_at)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-            """,
-            row["tenant_id"],
-            row["conversation_id"],
-            row["pair_id"],
-            row["user_a"],
-            row["user_b"],
-            row["message_ids"],
-            row["attempt_count"] + 1,
-            last_error or row["last_error"],
-            row["created_at"],
-        )
-        
-        await conn.execute(
-            "DELETE FROM passive_summarization_retry_queue WHERE id = $1",
-            row["id"],
-        )
+    async def remove_retries(self, retry_ids: Sequence[int]) -> int:
+        if not retry_ids:
+            return 0
         
-        logger.warning(
-            "passive_summ_retry:moved_to_failed",
-            extra={
-                "conversation_id": row["conversation_id"],
-                "pair_id": row["pair_id"],
-                "attempts": row["attempt_count"] + 1,
-            },
-        )
+        pool = await self._require_pool()
+        async with pool.acquire() as conn:
+            result = await conn.execute(
+                _SQL_REMOVE_RETRIES,
+                list(retry_ids),
+            )
+        removed = int(result.split()[-1])
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"passive_summ_retry:removed_many:{removed}")
+        return removed
 
+    async def iter_failed(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        prefetch: int = FAILED_PREFETCH_ROWS,
+        cursor: FailedCursor | None = None,
+    ) -> AsyncIterator[FailedSummarization]:
+        pool = await self._require_pool()
+        if cursor is not None:
+            sql, args = _SQL_GET_FAILED_BEFORE, (self._tenant_id, *cursor, limit)
+        else:
+            sql, args = _SQL_GET_FAILED, (self._tenant_id, limit, offset)
+        
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                async for row in conn.cursor(sql, *args, prefetch=prefetch):
+                    yield FailedSummarization(*_unpack_row(row))
 
     async def get_failed(
         self,
         limit: int = 100,
         offset: int = 0,
-    ) -> List[FailedSummarization]:
+    ) -> list[FailedSummarization]:
+        return [f async for f in self.iter_failed(limit=limit, offset=offset)]
+
+    async def get_failed_page(
+        self,
+        limit: int = 100,
+        cursor: FailedCursor | None = None,
+    ) -> tuple[list[FailedSummarization], FailedCursor | None]:
+        items = [f async for f in self.iter_failed(limit=limit, cursor=cursor)]
+        next_cursor = (items[-1].failed_at, items[-1].id) if len(items) == limit else None
+        return items, next_cursor
+
+    async def retry_failed(self, failed_id: int) -> int | None:
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT id, tenant_id, conversation_id, pair_id, user_a, user_b,
-                       message_ids, attempt_count, last_error, created_at, failed_at
-                FROM passive_summarization_failed
-                WHERE tenant_id = $1
-                ORDER BY failed_at DESC
-                LIMIT $2 OFFSET $3
-                """,
+            rec_id = await conn.fetchval(
+                _SQL_REQUEUE_FAILED,
+                failed_id,
                 self._tenant_id,
-                limit,
-                offset,
+                self._retry_delays[0],
             )
         
-        return [
-            FailedSummarization(
-                id=r["id"],
-                tenant_id=r["tenant_id"],
-                conversation_id=r["conversation_id"],
-                pair_id=r["pair_id"],
-                user_a=r["user_a"],
-                user_b=r["user_b"],
-                message_ids=list(r["message_ids"]),
-                attempt_count=r["attempt_count"],
-                last_error=r["last_error"],
-                created_at=r["created_at"],
-                failed_at=r["failed_at"],
+        if rec_id is None:
+            return None
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "passive_summ_retry:moved_from_failed",
+                extra={"failed_id": failed_id, "new_retry_id": rec_id},
             )
-            for r in rows
-        ]
+        return int(rec_id)
 
-    async def retry_failed(self, failed_id: int) -> int | None:
+    async def retry_failed_many(self, failed_ids: Sequence[int]) -> list[int]:
+        if not failed_ids:
+            return []
+        
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM passive_summarization_failed WHERE id = $1 AND tenant_id = $2",
-                failed_id,
-                self._tenant_id,
-            )
-            
-            if not row:
-                return None
-            
-            next_retry = datetime.utcnow() + timedelta(seconds=self._retry_delays[0])
-            rec_id = await conn.fetchval(
-                """
-                INSERT INTO passive_summarization_retry_queue 
-                    (tenant_id, conversation_id, pair_id, user_a, user_b, 
-                     message_ids, attempt_count, next_retry_at, last_error)
-                VALUES ($1, $2, $3, $4, $5, $6, 0, $7, $8)
-                RETURNING id
-                """,
+            rows = await conn.fetch(
+                _SQL_REQUEUE_FAILED_MANY,
+                list(failed_ids),
                 self._tenant_id,
-                row["conversation_id"],
-                row["pair_id"],
-                row["user_a"],
-                row["user_b"],
-                row["message_ids"],
-                next_retry,
-                "",
-            )
-            
-            await conn.execute(
-                "DELETE FROM passive_summarization_failed WHERE id = $1",
-                failed_id,
+                self._retry_delays[0],
             )
-            
+        
+        new_ids = [r["id"] for r in rows]
+        if logger.isEnabledFor(logging.INFO):
             logger.info(
-                "passive_summ_retry:moved_from_failed",
-                extra={"failed_id": failed_id, "new_retry_id": rec_id},
+                "passive_summ_retry:moved_many_from_failed",
+                extra={"requested": len(failed_ids), "moved": len(new_ids)},
             )
-            return int(rec_id)
+        return new_ids
 
     async def delete_failed(self, failed_id: int) -> bool:
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
             result = await conn.execute(
-                "DELETE FROM passive_summarization_failed WHERE id = $1 AND tenant_id = $2",
+                _SQL_DELETE_FAILED,
                 failed_id,
                 self._tenant_id,
             )
         
         deleted = result == "DELETE 1"
-        if deleted:
+        if deleted and logger.isEnabledFor(logging.INFO):
             logger.info(f"passive_summ_failed:deleted:{failed_id}")
         return deleted
 
 
-    async def get_stats(self) -> Dict[str, int]:
+    async def get_stats(self) -> dict[str, int]:
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
-            retry_count = await conn.fetchval(
-                "SELECT COUNT(*) FROM passive_summarization_retry_queue WHERE tenant_id = $1",
-                self._tenant_id,
-            )
-            retry_pending = await conn.fetchval(
-                """
-                SELECT COUNT(*) FROM passive_summarization_retry_queue 
-                WHERE tenant_id = $1 AND next_retry_at <= NOW() AND attempt_count < $2
-                """,
-                self._tenant_id,
-                self._max_attempts,
-            )
-            failed_count = await conn.fetchval(
-                "SELECT COUNT(*) FROM passive_summarization_failed WHERE tenant_id = $1",
-                self._tenant_id,
-            )
+            row = await conn.fetchrow(_SQL_STATS, self._tenant_id, self._max_attempts)
         
         return {
-            "retry_total": retry_count or 0,
-            "retry_pending": retry_pending or 0,
-            "failed_total": failed_count or 0,
+            "retry_total": row["retry_total"] or 0,
+            "retry_pending": row["retry_pending"] or 0,
+            "failed_total": row["failed_total"] or 0,
         }
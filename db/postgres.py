@@ -1,35 +1,103 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager, contextmanager
-from typing import Any, AsyncGenerator, Generator
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
-from sqlalchemy import create_engine as sa_create_engine
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
-    create_async_engine as sa_create_async_engine,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
 )
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import (
+    create_async_engine as sa_create_async_engine,
+)
+
+# pool_size + max_overflow is the per-process ceiling; across workers it should
+# stay roughly within Postgres max_connections / number of processes.
+DEFAULT_POOL_SIZE = 20
+DEFAULT_MAX_OVERFLOW = 20
+DEFAULT_POOL_RECYCLE_SECONDS = 1800
+DEFAULT_POOL_TIMEOUT_SECONDS = 30
 
 
 def create_async_engine(
-    dsn: str, *, echo: bool = False, pool_size: int = 5, max_overflow: int = 10
+    dsn: str,
+    *,
+    echo: bool = False,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_overflow: int = DEFAULT_MAX_OVERFLOW,
+    pool_recycle: int = DEFAULT_POOL_RECYCLE_SECONDS,
+    pool_timeout: int = DEFAULT_POOL_TIMEOUT_SECONDS,
+    statement_cache_size: int | None = None,
+    pool_pre_ping: bool = False,
 ) -> AsyncEngine:
+    # None keeps the driver defaults. 0 disables both asyncpg's statement cache
+    # and SQLAlchemy's prepared statement cache, for engines that run next to
+    # live DDL or sit behind a transaction-mode pooler.
+    connect_args: dict[str, Any] = {}
+    if statement_cache_size is not None:
+        connect_args["statement_cache_size"] = statement_cache_size
+        connect_args["prepared_statement_cache_size"] = statement_cache_size
     return sa_create_async_engine(
         dsn,
+        connect_args=connect_args,
         echo=echo,
         pool_size=pool_size,
         max_overflow=max_overflow,
-        pool_pre_ping=True,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+        # Off by default: pre-ping adds a SELECT 1 round trip to every checkout,
+        # while pool_recycle already retires connections before idle timeouts.
+        pool_pre_ping=pool_pre_ping,
         future=True,
     )
 
 
+# One engine (and therefore one connection pool) per DSN for the whole process.
+_ENGINES: dict[str, AsyncEngine] = {}
+_ENGINE_KWARGS: dict[str, dict[str, Any]] = {}
+
+
+def get_async_engine(dsn: str, **kwargs: Any) -> AsyncEngine:
+    engine = _ENGINES.get(dsn)
+    if engine is None:
+        engine = _ENGINES[dsn] = create_async_engine(dsn, **kwargs)
+        _ENGINE_KWARGS[dsn] = kwargs
+    elif kwargs and kwargs != _ENGINE_KWARGS[dsn]:
+        # A second pool per DSN would defeat the shared engine, and silently
+        # handing back the old one would hide the mismatch from the caller.
+        raise ValueError(
+            "get_async_engine: engine for this DSN already exists with different "
+            f"options {_ENGINE_KWARGS[dsn]!r}, got {kwargs!r}"
+        )
+    return engine
+
+
+async def warm_pool(engine: AsyncEngine, n: int) -> None:
+    # Checking out n connections at once forces the pool to open n of them,
+    # so the first requests after startup don't pay for connect + auth.
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_ping() for _ in range(n)))
+
+
+async def dispose_async_engines() -> None:
+    engines = list(_ENGINES.values())
+    _ENGINES.clear()
+    _ENGINE_KWARGS.clear()
+    for engine in engines:
+        await engine.dispose()
+
+
 def create_async_session_factory(engine: AsyncEngine) -> async_sessionmaker:
     return async_sessionmaker(
         engine,
@@ -3,20 +3,216 @@ from __future__ import annotations
 
 import hashlib
 import logging
-from typing import Any, Dict, List, Optional, Sequence
+from collections.abc import Sequence
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any
 
 import asyncpg
 
 logger = logging.getLogger(__name__)
 
 
-def compute_pair_id(user_a: str, user_b: str) -> str:
-    lo, hi = sorted([(user_a or "").strip(), (user_b or "").strip()])
-    digest = hashlib.sha256(f"{lo}::{hi}".encode("utf-8")).hexdigest()
+PAIR_CACHE_SIZE = 4096
+
+# Bulk batches at or above this size go through a COPY into a staging table
+COPY_MIN_ROWS = 100
+
+# Large id lists are deleted in chunks of this size within one transaction
+DELETE_CHUNK_SIZE = 1000
+
+# Roles that count toward the summarization thresholds
+ACTIVE_ROLES = ["human", "ai"]
+
+CHAT_EVENT_COLUMNS = (
+    "tenant_id", "pair_id", "conversation_id", "author_id",
+    "role", "text", "token_count", "message_id", "ts",
+)
+
+_SQL_LOG_EVENT = """
+    INSERT INTO chat_events (tenant_id, pair_id, conversation_id, author_id, role, text, token_count, message_id)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+    ON CONFLICT (tenant_id, pair_id, conversation_id, message_id) 
+    WHERE message_id IS NOT NULL
+    DO UPDATE SET id = chat_events.id
+    RETURNING id
+"""
+
+_SQL_LOG_EVENTS_UNNEST = """
+    INSERT INTO chat_events (tenant_id, pair_id, conversation_id, author_id, role, text, token_count, message_id, ts)
+    SELECT * FROM unnest(
+        $1::text[], $2::text[], $3::text[], $4::text[],
+        $5::text[], $6::text[], $7::int[], $8::text[], $9::timestamptz[]
+    )
+    ON CONFLICT (tenant_id, pair_id, conversation_id, message_id) 
+    WHERE message_id IS NOT NULL
+    DO NOTHING
+"""
+
+_SQL_CREATE_STAGE = """
+    CREATE TEMP TABLE _stage_chat_events ON COMMIT DROP AS
+    SELECT tenant_id, pair_id, conversation_id, author_id,
+           role, text, token_count, message_id, ts
+    FROM chat_events
+    WITH NO DATA
+"""
+
+_SQL_MERGE_STAGE = """
+    INSERT INTO chat_events (tenant_id, pair_id, conversation_id, author_id, role, text, token_count, message_id, ts)
+    SELECT tenant_id, pair_id, conversation_id, author_id,
+           role, text, token_count, message_id, ts
+    FROM _stage_chat_events
+    ON CONFLICT (tenant_id, pair_id, conversation_id, message_id) 
+    WHERE message_id IS NOT NULL
+    DO NOTHING
+"""
+
+_SQL_RECENT_WITH_DEL = """
+    SELECT * FROM (
+        SELECT id, author_id AS author, role, text, token_count, ts, message_id
+        FROM chat_events
+        WHERE tenant_id=$1 AND pair_id=$2 AND conversation_id=$3
+        ORDER BY ts DESC, id DESC
+        LIMIT $4
+    ) t
+    ORDER BY ts ASC, id ASC
+"""
+
+_SQL_RECENT_NO_DEL = """
+    SELECT * FROM (
+        SELECT id, author_id AS author, role, text, token_count, ts, message_id
+        FROM chat_events
+        WHERE tenant_id=$1 AND pair_id=$2 AND conversation_id=$3 AND deleted=false
+        ORDER BY ts DESC, id DESC
+        LIMIT $4
+    ) t
+    ORDER BY ts ASC, id ASC
+"""
+
+_SQL_ACTIVE_STATS = """
+    SELECT COUNT(*)::bigint AS n,
+           COALESCE(SUM(token_count), 0)::bigint AS toks
+    FROM chat_events
+    WHERE tenant_id=$1 AND pair_id=$2 AND conversation_id=$3
+      AND deleted=false AND role = ANY($4::text[])
+"""
+
+_SQL_LAST_AI_MESSAGE = """
+    SELECT text FROM chat_events
+    WHERE tenant_id=$1 AND pair_id=$2 AND conversation_id=$3 
+      AND deleted=false AND role='ai'
+    ORDER BY ts DESC, id DESC
+    LIMIT 1
+"""
+
+_SQL_DELETE_BY_IDS = "DELETE FROM chat_events WHERE id = ANY($1::bigint[])"
+
+_SQL_DELETE_OLDEST = """
+    WITH victims AS (
+        SELECT id
+        FROM chat_events
+        WHERE tenant_id=$1 AND pair_id=$2 AND conversation_id=$3 AND deleted=false
+          AND role IN ('human', 'ai')
+        ORDER BY ts ASC, id ASC
+        LIMIT $4
+        FOR UPDATE SKIP LOCKED
+    )
+    DELETE FROM chat_events
+    USING victims
+    WHERE chat_events.id = victims.id
+"""
+
+_SQL_ENQUEUE_RETRY = """
+    INSERT INTO summarization_retry_queue 
+        (tenant_id, pair_id, user_a, user_b, conversation_id, next_retry_at, last_error)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+    RETURNING id
+"""
+
+_SQL_BUMP_RETRY = """
+    UPDATE summarization_retry_queue
+    SET attempt_count = attempt_count + 1,
+        next_retry_at = $2,
+        last_error = $3,
+        updated_at = NOW()
+    WHERE id = $1
+"""
+
+_SQL_REMOVE_RETRY = "DELETE FROM summarization_retry_queue WHERE id = $1"
+
+_SQL_PENDING_RETRIES = """
+    SELECT id, tenant_id, pair_id, user_a, user_b, conversation_id, attempt_count, last_error
+    FROM summarization_retry_queue
+    WHERE tenant_id = $1 AND next_retry_at <= NOW() AND attempt_count < 10
+    ORDER BY next_retry_at ASC
+    LIMIT $2
+"""
+
+_SQL_MOVE_RETRY_TO_FAILED = """
+    WITH moved AS (
+        DELETE FROM summarization_retry_queue
+        WHERE id = $1
+        RETURNING tenant_id, pair_id, user_a, user_b, conversation_id,
+                  attempt_count, last_error, created_at
+    )
+    INSERT INTO summarization_failed 
+        (tenant_id, pair_id, user_a, user_b, conversation_id, 
+         attempt_count, last_error, created_at)
+    SELECT tenant_id, pair_id, user_a, user_b, conversation_id,
+           attempt_count + 1, COALESCE(NULLIF($2, ''), last_error), created_at
+    FROM moved
+    RETURNING id, pair_id, attempt_count
+"""
+
+_SQL_GET_FAILED = """
+    SELECT id, pair_id, user_a, user_b, conversation_id,
+           attempt_count, last_error, created_at, failed_at
+    FROM summarization_failed
+    WHERE tenant_id = $1
+    ORDER BY failed_at DESC
+    LIMIT $2 OFFSET $3
+"""
+
+_SQL_RETRY_STATS = """
+    SELECT
+        (SELECT COUNT(*) FROM summarization_retry_queue
+         WHERE tenant_id = $1) AS retry_total,
+        (SELECT COUNT(*) FROM summarization_retry_queue
+         WHERE tenant_id = $1 AND next_retry_at <= NOW() AND attempt_count < 10) AS retry_pending,
+        (SELECT COUNT(*) FROM summarization_failed
+         WHERE tenant_id = $1) AS failed_total
+"""
+
+_SQL_TRY_XACT_LOCK = "SELECT pg_try_advisory_xact_lock($1)"
+_SQL_NO_IDLE_XACT_TIMEOUT = "SET LOCAL idle_in_transaction_session_timeout = 0"
+
+# Live-chat summarization and passive-archive summarization can run for the
+# same pair and conversation; the "chat_summ" person string (vs "passive_summ"
+# in passive_archive_storage) gives them distinct keys so neither blocks the other.
+_LOCK_KEY_PERSON = b"chat_summ"
+
+
+@lru_cache(maxsize=PAIR_CACHE_SIZE)
+def _pair_id_cached(lo: str, hi: str) -> str:
+    digest = hashlib.sha256(f"{lo}::{hi}".encode()).hexdigest()
     return digest[:16]
 
 
+def compute_pair_id(user_a: str, user_b: str) -> str:
+    a, b = (user_a or "").strip(), (user_b or "").strip()
+    return _pair_id_cached(a, b) if a <= b else _pair_id_cached(b, a)
+
+
+# Lock keys are never persisted, so they use BLAKE2b-64 directly; pair_id stays
+# SHA-256 because it is stored in chat_events and shared with other tables.
+@lru_cache(maxsize=PAIR_CACHE_SIZE)
+def _summarization_lock_key(tenant_id: str, pair_id: str, conversation_id: str) -> int:
+    combined = f"{tenant_id}::{pair_id}::{conversation_id}"
+    h = hashlib.blake2b(combined.encode("utf-8"), digest_size=8, person=_LOCK_KEY_PERSON).digest()
+    return int.from_bytes(h, byteorder="big", signed=True)
+
+
 class PostgresChatStore:
 
     def __init__(self, dsn: str, tenant_id: str = "default") -> None:
@@ -27,9 +223,6 @@ class PostgresChatStore:
         from db.shared_pool import SharedPostgresPool
         return await SharedPostgresPool.get_pool(self._dsn)
 
-    async def _init_connection(self, conn: asyncpg.Connection) -> None:
-        await conn.execute(f"SET app.tenant_id = '{self._tenant_id}';")
-
     async def log_event(
         self,
         *,
@@ -45,19 +238,14 @@ class PostgresChatStore:
         pool = await self._require_pool()
         pair_id = compute_pair_id(user_a, user_b)
 
+        # Rough 4-chars-per-token fallback; callers that already counted
+        # tokens should pass token_count and skip it.
         if token_count is None:
-            token_count = max(1, len(text) // 4)
+            token_count = (len(text) >> 2) or 1
 
         async with pool.acquire() as conn:
             rec_id = await conn.fetchval(
-                """
-                INSERT INTO chat_events (tenant_id, pair_id, conversation_id, author_id, role, text, token_count, message_id)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                ON CONFLICT (tenant_id, pair_id, conversation_id, message_id) 
-                WHERE message_id IS NOT NULL
-                DO UPDATE SET id = chat_events.id
-                RETURNING id
-                """,
+                _SQL_LOG_EVENT,
                 self._tenant_id,
                 pair_id,
                 conversation_id,
@@ -69,6 +257,56 @@ class PostgresChatStore:
             )
         return int(rec_id)
 
+    async def log_events_bulk(self, events: Sequence[dict[str, Any]]) -> int:
+        if not events:
+            return 0
+        
+        pool = await self._require_pool()
+        now = datetime.now(timezone.utc)
+        rows = []
+        for i, e in enumerate(events):
+            text = e["text"]
+            token_count = e.get("token_count")
+            # Without an explicit ts each row is nudged by 1µs so the batch
+            # keeps its order; NOW() would give every row the same timestamp.
+            ts = e.get("ts") or now + timedelta(microseconds=i)
+            rows.append((
+                self._tenant_id,
+                compute_pair_id(e["user_a"], e["user_b"]),
+                e["conversation_id"],
+                e["author_id"],
+                e.get("role") or "human",
+                text,
+                ((len(text) >> 2) or 1) if token_count is None else token_count,
+                e.get("message_id"),
+                ts,
+            ))
+        
+        async with pool.acquire() as conn:
+            if len(rows) < COPY_MIN_ROWS:
+                columns = list(zip(*rows))
+                result = await conn.execute(
+                    _SQL_LOG_EVENTS_UNNEST,
+                    *columns,
+                )
+            else:
+                async with conn.transaction():
+                    await conn.execute(
+                        _SQL_CREATE_STAGE
+                    )
+                    await conn.copy_records_to_table(
+                        "_stage_chat_events",
+                        records=rows,
+                        columns=CHAT_EVENT_COLUMNS,
+                    )
+                    result = await conn.execute(
+                        _SQL_MERGE_STAGE
+                    )
+        
+        inserted = int(result.split()[-1]) if result else 0
+        logger.info(f"chat_store:logged_bulk:{inserted}/{len(rows)} events")
+        return inserted
+
     async def get_recent_events(
         self,
         *,
@@ -77,69 +315,52 @@ class PostgresChatStore:
         conversation_id: str,
         limit: int = 10,
         include_deleted: bool = False,
-    ) -> List[Dict[str, Any]]:
+    ) -> list[dict[str, Any]]:
         pool = await self._require_pool()
         pair_id = compute_pair_id(user_a, user_b)
-        deleted_clause = "" if include_deleted else "AND deleted=false"
+        sql = _SQL_RECENT_WITH_DEL if include_deleted else _SQL_RECENT_NO_DEL
         async with pool.acquire() as conn:
             rows = await conn.fetch(
-                f"""
-                SELECT id, author_id, role, text, token_count, ts, message_id
-                FROM chat_events
-                WHERE tenant_id=$1 AND pair_id=$2 AND conversation_id=$3
-                {deleted_clause}
-                ORDER BY ts DESC
-                LIMIT $4
-                """,
+                sql,
                 self._tenant_id,
                 pair_id,
                 conversation_id,
                 limit,
             )
+        # Rows already come back oldest-first with the "author" alias applied.
         return [
-            {
-                "id": r["id"],
-                "author": r["author_id"],
-                "role": r["role"],
-                "text": r["text"],
-                "token_count": r["token_count"],
-                "ts": r["ts"].isoformat() if r["ts"] else None,
-                "message_id": r["message_id"],
-            }
-            for r in reversed(rows)
+            dict(r) | {"ts": r["ts"].isoformat() if r["ts"] else None}
+            for r in rows
         ]
 
-    async def count_active(self, *, user_a: str, user_b: str, conversation_id: str) -> int:
+    async def get_active_stats(
+        self, *, user_a: str, user_b: str, conversation_id: str
+    ) -> tuple[int, int]:
         pool = await self._require_pool()
         pair_id = compute_pair_id(user_a, user_b)
         async with pool.acquire() as conn:
-            n = await conn.fetchval(
-                """
-                SELECT COUNT(*) FROM chat_events
-                WHERE tenant_id=$1 AND pair_id=$2 AND conversation_id=$3 AND deleted=false
-                  AND role IN ('human', 'ai')
-                """,
+            row = await conn.fetchrow(
+                _SQL_ACTIVE_STATS,
                 self._tenant_id,
                 pair_id,
                 conversation_id,
+                ACTIVE_ROLES,
             )
-        return int(n or 0)
+        if row is None:
+            return 0, 0
+        return int(row["n"] or 0), int(row["toks"] or 0)
+
+    async def count_active(self, *, user_a: str, user_b: str, conversation_id: str) -> int:
+        count, _ = await self.get_active_stats(
+            user_a=user_a, user_b=user_b, conversation_id=conversation_id
+        )
+        return count
 
     async def sum_active_tokens(self, *, user_a: str, user_b: str, conversation_id: str) -> int:
-        pool = await self._require_pool()
-        pair_id = compute_pair_id(user_a, user_b)
-        async with pool.acquire() as conn:
-            total = await conn.fetchval(
-                """
-                SELECT COALESCE(SUM(token_count), 0) FROM chat_events
-                WHERE tenant_id=$1 AND pair_id=$2 AND conversation_id=$3 AND deleted=false
-                  AND role IN ('human', 'ai')
-                """,
-                self._tenant_id,
-                pair_id,
-                conversation_id,
-            )
-        return int(total or 0)
+        _, total = await self.get_active_stats(
+            user_a=user_a, user_b=user_b, conversation_id=conversation_id
+        )
+        return total
 
     async def get_last_ai_message(
         self,
@@ -147,18 +368,12 @@ class PostgresChatStore:
         user_a: str,
         user_b: str,
         conversation_id: str,
-    ) -> Optional[str]:
+    ) -> str | None:
         pool = await self._require_pool()
         pair_id = compute_pair_id(user_a, user_b)
         async with pool.acquire() as conn:
             row = await conn.fetchrow(
-                """
-                SELECT text FROM chat_events
-                WHERE tenant_id=$1 AND pair_id=$2 AND conversation_id=$3 
-                  AND deleted=false AND role='ai'
-                ORDER BY ts DESC
-                LIMIT 1
-                """,
+                _SQL_LAST_AI_MESSAGE,
                 self._tenant_id,
                 pair_id,
                 conversation_id,
@@ -168,13 +383,22 @@ class PostgresChatStore:
     async def delete_by_ids(self, ids: Sequence[int]) -> int:
         if not ids:
             return 0
+        ids_param = ids if isinstance(ids, list) else list(ids)
         pool = await self._require_pool()
         async with pool.acquire() as conn:
-            result = await conn.execute(
-                "DELETE FROM chat_events WHERE id = ANY($1::bigint[])",
-                list(ids),
-            )
-            return int(result.split()[-1]) if result else 0
+            if len(ids_param) <= DELETE_CHUNK_SIZE:
+                result = await conn.execute(_SQL_DELETE_BY_IDS, ids_param)
+                return int(result.split()[-1]) if result else 0
+
+            deleted = 0
+            async with conn.transaction():
+                for start in range(0, len(ids_param), DELETE_CHUNK_SIZE):
+                    result = await conn.execute(
+                        _SQL_DELETE_BY_IDS,
+                        ids_param[start:start + DELETE_CHUNK_SIZE],
+                    )
+                    deleted += int(result.split()[-1]) if result else 0
+            return deleted
 
     async def delete_oldest_n(
         self,
@@ -189,27 +413,15 @@ class PostgresChatStore:
         pool = await self._require_pool()
         pair_id = compute_pair_id(user_a, user_b)
         async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT id
-                FROM chat_events
-                WHERE tenant_id=$1 AND pair_id=$2 AND conversation_id=$3 AND deleted=false
-                  AND role IN ('human', 'ai')
-                ORDER BY ts ASC
-                LIMIT $4
-                """,
+            # SKIP LOCKED lets two summarizers trim the same conversation
+            # without waiting on (or double-deleting) each other's rows.
+            result = await conn.execute(
+                _SQL_DELETE_OLDEST,
                 self._tenant_id,
                 pair_id,
                 conversation_id,
                 n,
             )
-            ids = [r["id"] for r in rows]
-            if not ids:
-                return 0
-            result = await conn.execute(
-                "DELETE FROM chat_events WHERE id = ANY($1::bigint[])",
-                ids,
-            )
             return int(result.split()[-1]) if result else 0
 
     async def enqueue_retry(
@@ -225,12 +437,7 @@ class PostgresChatStore:
         pair_id = compute_pair_id(user_a, user_b)
         async with pool.acquire() as conn:
             rec_id = await conn.fetchval(
-                """
-                INSERT INTO summarization_retry_queue 
-                    (tenant_id, pair_id, user_a, user_b, conversation_id, next_retry_at, last_error)
-                VALUES ($1, $2, $3, $4, $5, $6, $7)
-                RETURNING id
-                """,
+                _SQL_ENQUEUE_RETRY,
                 self._tenant_id,
                 pair_id,
                 user_a,
@@ -251,14 +458,7 @@ class PostgresChatStore:
         pool = await self._require_pool()
         async with pool.acquire() as conn:
             await conn.execute(
-                """
-                UPDATE summarization_retry_queue
-                SET attempt_count = attempt_count + 1,
-                    next_retry_at = $2,
-                    last_error = $3,
-                    updated_at = NOW()
-                WHERE id = $1
-                """,
+                _SQL_BUMP_RETRY,
                 retry_id,
                 next_retry_at,
                 last_error or "",
@@ -268,21 +468,15 @@ class PostgresChatStore:
         pool = await self._require_pool()
         async with pool.acquire() as conn:
             await conn.execute(
-                "DELETE FROM summarization_retry_queue WHERE id = $1",
+                _SQL_REMOVE_RETRY,
                 retry_id,
             )
 
-    async def get_pending_retries(self, limit: int = 10) -> List[Dict[str, Any]]:
+    async def get_pending_retries(self, limit: int = 10) -> list[dict[str, Any]]:
         pool = await self._require_pool()
         async with pool.acquire() as conn:
             rows = await conn.fetch(
-                """
-                SELECT id, tenant_id, pair_id, user_a, user_b, conversation_id, attempt_count, last_error
-                FROM summarization_retry_queue
-                WHERE tenant_id = $1 AND next_retry_at <= NOW() AND attempt_count < 10
-                ORDER BY next_retry_at ASC
-                LIMIT $2
-                """,
+                _SQL_PENDING_RETRIES,
                 self._tenant_id,
                 limit,
             )
@@ -298,100 +492,53 @@ class PostgresChatStore:
         
         async with pool.acquire() as conn:
             row = await conn.fetchrow(
-                """
-                SELECT id, tenant_id, pair_id, user_a, user_b, conversation_id, 
-                       attempt_count, last_error, created_at
-                FROM summarization_retry_queue
-                WHERE id = $1
-                """,
-                retry_id,
-            )
-            
-            if not row:
-                logger.warning(f"summary_retry:not_found:{retry_id}")
-                return None
-            
-            failed_id = await conn.fetchval(
-                """
-                INSERT INTO summarization_failed 
-                    (tenant_id, pair_id, user_a, user_b, conversation_id, 
-                     attempt_count, last_error, created_at)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                RETURNING id
-                """,
-                row["tenant_id"],
-                row["pair_id"],
-                row["user_a"],
-                row["user_b"],
-                row["conversation_id"],
-                row["attempt_count"] + 1,
-                last_error or row["last_error"],
-                row["created_at"],
-            )
-            
-            await conn.execute(
-                "DELETE FROM summarization_retry_queue WHERE id = $1",
+                _SQL_MOVE_RETRY_TO_FAILED,
                 retry_id,
+                last_error or "",
             )
-            
-            logger.warning(
-                "summary_retry:moved_to_failed",
-                extra={
-                    "retry_id": retry_id,
-                    "failed_id": failed_id,
-                    "pair_id": row["pair_id"],
-                    "attempts": row["attempt_count"] + 1,
-                },
-            )
-            return int(failed_id)
+        
+        if not row:
+            logger.warning(f"summary_retry:not_found:{retry_id}")
+            return None
+        
+        logger.warning(
+            "summary_retry:moved_to_failed",
+            extra={
+                "retry_id": retry_id,
+                "failed_id": row["id"],
+                "pair_id": row["pair_id"],
+                "attempts": row["attempt_count"],
+            },
+        )
+        return int(row["id"])
 
-    async def get_failed_summaries(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    async def get_failed_summaries(self, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
         pool = await self._require_pool()
         async with pool.acquire() as conn:
             rows = await conn.fetch(
-                """
-                SELECT id, pair_id, user_a, user_b, conversation_id,
-                       attempt_count, last_error, created_at, failed_at
-                FROM summarization_failed
-                WHERE tenant_id = $1
-                ORDER BY failed_at DESC
-                LIMIT $2 OFFSET $3
-                """,
+                _SQL_GET_FAILED,
                 self._tenant_id,
                 limit,
                 offset,
             )
         return [dict(r) for r in rows]
 
-    async def get_retry_queue_stats(self) -> Dict[str, int]:
+    async def get_retry_queue_stats(self) -> dict[str, int]:
         pool = await self._require_pool()
         async with pool.acquire() as conn:
-            retry_total = await conn.fetchval(
-                "SELECT COUNT(*) FROM summarization_retry_queue WHERE tenant_id = $1",
-                self._tenant_id,
-            )
-            retry_pending = await conn.fetchval(
-                """
-                SELECT COUNT(*) FROM summarization_retry_queue 
-                WHERE tenant_id = $1 AND next_retry_at <= NOW() AND attempt_count < 10
-                """,
-                self._tenant_id,
-            )
-            failed_total = await conn.fetchval(
-                "SELECT COUNT(*) FROM summarization_failed WHERE tenant_id = $1",
+            row = await conn.fetchrow(
+                _SQL_RETRY_STATS,
                 self._tenant_id,
             )
         
         return {
-            "retry_total": retry_total or 0,
-            "retry_pending": retry_pending or 0,
-            "failed_total": failed_total or 0,
+            "retry_total": row["retry_total"] or 0,
+            "retry_pending": row["retry_pending"] or 0,
+            "failed_total": row["failed_total"] or 0,
         }
 
     def _lock_key(self, pair_id: str, conversation_id: str) -> int:
-        combined = f"{self._tenant_id}::{pair_id}::{conversation_id}"
-        h = hashlib.sha256(combined.encode("utf-8")).digest()
-        return int.from_bytes(h[:8], byteorder="big", signed=True)
+        return _summarization_lock_key(self._tenant_id, pair_id, conversation_id)
 
     @asynccontextmanager
     async def acquire_summarization_lock(
@@ -406,24 +553,26 @@ class PostgresChatStore:
         pair_id = compute_pair_id(user_a, user_b)
         lock_key = self._lock_key(pair_id, conversation_id)
 
-        conn = await pool.acquire()
-        acquired = False
-        try:
-            logger.debug(f"Attempting to acquire advisory lock: {lock_key}")
-            acquired = await conn.fetchval(
-                "SELECT pg_try_advisory_lock($1)",
-                lock_key,
-            )
-            if not acquired:
-                logger.warning(f"Failed to acquire lock for {pair_id}/{conversation_id}")
-                raise RuntimeError(
-                    f"Could not acquire summarization lock for {pair_id}/{conversation_id}"
-                )
+        # The xact-scoped lock is released by COMMIT/ROLLBACK when the block
+        # exits, so there is no unlock round trip and nothing to leak if the
+        # connection dies mid-section.
+        #
+        # The transaction stays idle while the caller runs the LLM summary, so
+        # the server-side idle-in-transaction timeout is switched off for it;
+        # otherwise the session would be killed and the lock silently lost
+        # mid-section. The cost is one pool connection per running summary; no
+        # xid is assigned and READ COMMITTED drops its snapshot between
+        # statements, so the idle transaction does not hold back vacuum.
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(_SQL_NO_IDLE_XACT_TIMEOUT)
+                logger.debug(f"Attempting to acquire advisory lock: {lock_key}")
+                acquired = await conn.fetchval(_SQL_TRY_XACT_LOCK, lock_key)
+                if not acquired:
+                    logger.warning(f"Failed to acquire lock for {pair_id}/{conversation_id}")
+                    raise RuntimeError(
+                        f"Could not acquire summarization lock for {pair_id}/{conversation_id}"
+                    )
 
-            logger.debug(f"Advisory lock acquired: {lock_key}")
-            yield
-        finally:
-            if acquired:
-                await conn.fetchval("SELECT pg_advisory_unlock($1)", lock_key)
-                logger.debug(f"Advisory lock released: {lock_key}")
-            await pool.release(conn)
+                logger.debug(f"Advisory lock acquired: {lock_key}")
+                yield
@@ -1,25 +1,37 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from enum import Enum
+from typing import Any
 
 import asyncpg
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Overrides only change on upsert/delete/class updates, which invalidate their
+# own key; the TTL bounds staleness from writes made by other processes.
+CACHE_TTL_SECONDS = 30.0
+CACHE_MAX_ENTRIES = 10_000
 
-VALID_RELATIONSHIP_CLASSES = frozenset([
-    "spouse",
-    "family",
-    "boss",
-    "subordinate",
-    "colleague",
-    "friend",
-    "stranger",
-])
+
+class RelationshipClass(str, Enum):
+    SPOUSE = "spouse"
+    FAMILY = "family"
+    BOSS = "boss"
+    SUBORDINATE = "subordinate"
+    COLLEAGUE = "colleague"
+    FRIEND = "friend"
+    STRANGER = "stranger"
+
+
+VALID_RELATIONSHIP_CLASSES = frozenset(c.value for c in RelationshipClass)
 
 SYMMETRIC_RELATIONSHIPS = frozenset([
     "spouse", "family", "colleague", "friend", "stranger"
@@ -42,9 +54,9 @@ class ToneMetrics:
     submissive_rate: float = 0.5
     dominance: float = 0.5
     emotional_dependence_rate: float = 0.5
-    style_summary: Optional[str] = None
+    style_summary: str | None = None
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self) -> dict[str, Any]:
         return {
             "avg_formality": self.avg_formality,
             "avg_humor": self.avg_humor,
@@ -59,7 +71,7 @@ class ToneMetrics:
         }
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "ToneMetrics":
+    def from_dict(cls, data: dict[str, Any]) -> ToneMetrics:
         return cls(
             avg_formality=float(data.get("avg_formality", 0.5)),
             avg_humor=float(data.get("avg_humor", 0.3)),
@@ -76,20 +88,158 @@ class ToneMetrics:
 
 @dataclass
 class DyadicRecord:
-    id: Optional[int] = None
+    id: int | None = None
     source_user_id: str = ""
     target_user_id: str = ""
-    relationship_class: Optional[str] = None
+    relationship_class: str | None = None
     total_message_count: int = 0
     metrics: ToneMetrics = field(default_factory=ToneMetrics)
-    created_at: Optional[datetime] = None
-    last_updated_at: Optional[datetime] = None
+    created_at: datetime | None = None
+    last_updated_at: datetime | None = None
+
+
+TONE_METRIC_COLUMNS = (
+    "avg_formality",
+    "avg_humor",
+    "profanity_rate",
+    "directness",
+    "optimistic_rate",
+    "pessimistic_rate",
+    "submissive_rate",
+    "dominance",
+    "emotional_dependence_rate",
+)
+
+# Rows fetched per cursor round trip when streaming a user's overrides
+ALL_FOR_USER_PREFETCH_ROWS = 256
+
+# Column order is fixed so _record_to_dyadic can unpack rows positionally.
+_DYADIC_COLUMNS = """
+    id, source_user_id, target_user_id, relationship_class, total_message_count,
+    avg_formality, avg_humor, profanity_rate, directness, optimistic_rate,
+    pessimistic_rate, submissive_rate, dominance, emotional_dependence_rate,
+    style_summary, created_at, last_updated_at
+"""
+
+_SQL_GET = f"""
+    SELECT {_DYADIC_COLUMNS}
+    FROM dyadic_overrides
+    WHERE source_user_id = $1 AND target_user_id = $2
+"""
+
+_SQL_ALL_FOR_USER = f"""
+    SELECT {_DYADIC_COLUMNS}
+    FROM dyadic_overrides
+    WHERE source_user_id = $1
+    ORDER BY last_updated_at DESC
+"""
+
+
+def _record_to_dyadic(row) -> DyadicRecord:
+    (id_, src, tgt, cls, tmc, af, ah, pr, dr, op, pe, su, do_, ed, ss, ca, lu) = row
+    return DyadicRecord(
+        id=id_,
+        source_user_id=src,
+        target_user_id=tgt,
+        relationship_class=cls,
+        total_message_count=tmc,
+        metrics=ToneMetrics(
+            avg_formality=af or 0.5,
+            avg_humor=ah or 0.3,
+            profanity_rate=pr or 0.0,
+            directness=dr or 0.5,
+            optimistic_rate=op or 0.5,
+            pessimistic_rate=pe or 0.5,
+            submissive_rate=su or 0.5,
+            dominance=do_ or 0.5,
+            emotional_dependence_rate=ed or 0.5,
+            style_summary=ss,
+        ),
+        created_at=ca,
+        last_updated_at=lu,
+    )
+
+# Defaults are applied server-side so every metric column arrives as a plain
+# float and the whole block converts to one ndarray in a single call.
+# NULLIF(col, 0) mirrors the `col or default` rule in _record_to_dyadic, so a
+# stored 0.0 reads the same here as through get()/get_all_for_user().
+_SQL_ALL_FOR_USER_COLUMNAR = """
+    SELECT target_user_id, relationship_class, total_message_count,
+           COALESCE(NULLIF(avg_formality, 0), 0.5), COALESCE(NULLIF(avg_humor, 0), 0.3),
+           COALESCE(NULLIF(profanity_rate, 0), 0.0), COALESCE(NULLIF(directness, 0), 0.5),
+           COALESCE(NULLIF(optimistic_rate, 0), 0.5), COALESCE(NULLIF(pessimistic_rate, 0), 0.5),
+           COALESCE(NULLIF(submissive_rate, 0), 0.5), COALESCE(NULLIF(dominance, 0), 0.5),
+           COALESCE(NULLIF(emotional_dependence_rate, 0), 0.5)
+    FROM dyadic_overrides
+    WHERE source_user_id = $1
+    ORDER BY last_updated_at DESC
+"""
+
+
+# Cached records are handed out as copies so callers can't mutate the entry.
+def _copy_record(record: DyadicRecord | None) -> DyadicRecord | None:
+    if record is None:
+        return None
+    return replace(record, metrics=replace(record.metrics))
+
+
+@dataclass(slots=True)
+class DyadicMetricsColumns:
+    source_user_id: str
+    target_user_ids: list[str]
+    relationship_classes: list[str | None]
+    total_message_counts: np.ndarray
+    # Shape (n, len(TONE_METRIC_COLUMNS)), one row per target, in target_user_ids order.
+    metrics: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.target_user_ids)
+    
+    def column(self, name: str) -> np.ndarray:
+        return self.metrics[:, TONE_METRIC_COLUMNS.index(name)]
+    
+    def tone_metrics(self, i: int) -> ToneMetrics:
+        return ToneMetrics(*self.metrics[i].tolist())
 
 
 class DyadicOverrides:
 
     def __init__(self, dsn: str) -> None:
         self._dsn = dsn
+        self._cache: dict[tuple[str, str], tuple[float, DyadicRecord | None]] = {}
+        # Bumped on every invalidation; a read only caches its row if no write
+        # landed while it was in flight.
+        self._cache_version = 0
+    
+    def _cache_get(self, key: tuple[str, str]) -> tuple[bool, DyadicRecord | None]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= time.monotonic():
+            self._cache.pop(key, None)
+            return False, None
+        return True, _copy_record(entry[1])
+    
+    def _cache_put(
+        self,
+        key: tuple[str, str],
+        record: DyadicRecord | None,
+        version: int,
+    ) -> None:
+        if version != self._cache_version:
+            return
+        if len(self._cache) >= CACHE_MAX_ENTRIES:
+            # Dicts keep insertion order, so this drops the oldest entry.
+            self._cache.pop(next(iter(self._cache)), None)
+        self._cache[key] = (time.monotonic() + CACHE_TTL_SECONDS, _copy_record(record))
+    
+    def _invalidate(self, key: tuple[str, str]) -> None:
+        self._cache_version += 1
+        self._cache.pop(key, None)
+    
+    def clear_cache(self) -> None:
+        self._cache_version += 1
+        self._cache.clear()
     
     async def close(self) -> None:
         pass
@@ -103,12 +253,16 @@ class DyadicOverrides:
         source_user_id: str,
         target_user_id: str,
         metrics: ToneMetrics,
-        relationship_class: Optional[str] = None,
+        relationship_class: RelationshipClass | str | None = None,
         message_count: int = 0,
     ) -> int:
         pool = await self._require_pool()
         
-        if relationship_class and relationship_class not in VALID_RELATIONSHIP_CLASSES:
+        # Enum members were validated when they were built; only raw strings
+        # still need the membership check.
+        if isinstance(relationship_class, RelationshipClass):
+            relationship_class = relationship_class.value
+        elif relationship_class and relationship_class not in VALID_RELATIONSHIP_CLASSES:
             logger.warning(
                 f"dyadic:upsert:invalid_class:{relationship_class}, using None"
             )
@@ -156,6 +310,8 @@ class DyadicOverrides:
                 metrics.style_summary,
             )
         
+        self._invalidate((source_user_id, target_user_id))
+        
         logger.info(
             f"dyadic:upsert:success:{source_user_id}→{target_user_id}",
             extra={"rec_id": rec_id, "class": relationship_class}
@@ -168,34 +324,42 @@ class DyadicOverrides:
         user_b_id: str,
         user_a_metrics: ToneMetrics,
         user_b_metrics: ToneMetrics,
-        relationship_class: str,
+        relationship_class: RelationshipClass | str,
         message_count: int = 0,
     ) -> tuple[int, int]:
-        if relationship_class in SYMMETRIC_RELATIONSHIPS:
-            class_a_to_b = relationship_class
-            class_b_to_a = relationship_class
-        elif relationship_class in ASYMMETRIC_RELATIONSHIP_INVERSE:
-            class_a_to_b = relationship_class
-            class_b_to_a = ASYMMETRIC_RELATIONSHIP_INVERSE[relationship_class]
-        else:
-            logger.warning(f"dyadic:upsert_pair:unknown_class:{relationship_class}")
-            class_a_to_b = relationship_class
-            class_b_to_a = relationship_class
+        try:
+            rel = RelationshipClass(relationship_class)
+        except ValueError:
+            rel = None
         
-        id_a = await self.upsert(
-            source_user_id=user_a_id,
-            target_user_id=user_b_id,
-            metrics=user_a_metrics,
-            relationship_class=class_a_to_b,
-            message_count=message_count,
-        )
+        match rel:
+            case RelationshipClass.BOSS:
+                class_a_to_b, class_b_to_a = rel, RelationshipClass.SUBORDINATE
+            case RelationshipClass.SUBORDINATE:
+                class_a_to_b, class_b_to_a = rel, RelationshipClass.BOSS
+            case None:
+                logger.warning(f"dyadic:upsert_pair:unknown_class:{relationship_class}")
+                class_a_to_b = class_b_to_a = relationship_class
+            case _:
+                class_a_to_b = class_b_to_a = rel
         
-        id_b = await self.upsert(
-            source_user_id=user_b_id,
-            target_user_id=user_a_id,
-            metrics=user_b_metrics,
-            relationship_class=class_b_to_a,
-            message_count=message_count,
+        # The two directions are separate rows, so they can run on two pool
+        # connections at once.
+        id_a, id_b = await asyncio.gather(
+            self.upsert(
+                source_user_id=user_a_id,
+                target_user_id=user_b_id,
+                metrics=user_a_metrics,
+                relationship_class=class_a_to_b,
+                message_count=message_count,
+            ),
+            self.upsert(
+                source_user_id=user_b_id,
+                target_user_id=user_a_id,
+                metrics=user_b_metrics,
+                relationship_class=class_b_to_a,
+                message_count=message_count,
+            ),
         )
         
         logger.info(
@@ -212,81 +376,63 @@ class DyadicOverrides:
         self,
         source_user_id: str,
         target_user_id: str,
-    ) -> Optional[DyadicRecord]:
+    ) -> DyadicRecord | None:
+        key = (source_user_id, target_user_id)
+        hit, record = self._cache_get(key)
+        if hit:
+            return record
+        
+        version = self._cache_version
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT * FROM dyadic_overrides
-                WHERE source_user_id = $1 AND target_user_id = $2
-                """,
-                source_user_id,
-                target_user_id,
-            )
+            row = await conn.fetchrow(_SQL_GET, source_user_id, target_user_id)
         
         if not row:
+            self._cache_put(key, None, version)
             return None
         
-        return DyadicRecord(
-            id=row["id"],
-            source_user_id=row["source_user_id"],
-            target_user_id=row["target_user_id"],
-            relationship_class=row["relationship_class"],
-            total_message_count=row["total_message_count"],
-            metrics=ToneMetrics(
-                avg_formality=row["avg_formality"] or 0.5,
-                avg_humor=row["avg_humor"] or 0.3,
-                profanity_rate=row["profanity_rate"] or 0.0,
-                directness=row["directness"] or 0.5,
-                optimistic_rate=row["optimistic_rate"] or 0.5,
-                pessimistic_rate=row["pessimistic_rate"] or 0.5,
-                submissive_rate=row["submissive_rate"] or 0.5,
-                dominance=row["dominance"] or 0.5,
-                emotional_dependence_rate=row["emotional_dependence_rate"] or 0.5,
-                style_summary=row["style_summary"],
-            ),
-            created_at=row["created_at"],
-            last_updated_at=row["last_updated_at"],
-        )
+        record = _record_to_dyadic(row)
+        self._cache_put(key, record, version)
+        return record
 
-    async def get_all_for_user(self, source_user_id: str) -> List[DyadicRecord]:
+    async def iter_all_for_user(
+        self,
+        source_user_id: str,
+        prefetch: int = ALL_FOR_USER_PREFETCH_ROWS,
+    ) -> AsyncIterator[DyadicRecord]:
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT * FROM dyadic_overrides
-                WHERE source_user_id = $1
-                ORDER BY last_updated_at DESC
-                """,
-                source_user_id,
-            )
+            async with conn.transaction():
+                async for row in conn.cursor(_SQL_ALL_FOR_USER, source_user_id, prefetch=prefetch):
+                    yield _record_to_dyadic(row)
+
+    async def get_all_for_user(self, source_user_id: str) -> list[DyadicRecord]:
+        pool = await self._require_pool()
         
-        return [
-            DyadicRecord(
-                id=row["id"],
-                source_user_id=row["source_user_id"],
-                target_user_id=row["target_user_id"],
-                relationship_class=row["relationship_class"],
-                total_message_count=row["total_message_count"],
-                metrics=ToneMetrics(
-                    avg_formality=row["avg_formality"] or 0.5,
-                    avg_humor=row["avg_humor"] or 0.3,
-                    profanity_rate=row["profanity_rate"] or 0.0,
-                    directness=row["directness"] or 0.5,
-                    optimistic_rate=row["optimistic_rate"] or 0.5,
-                    pessimistic_rate=row["pessimistic_rate"] or 0.5,
-                    submissive_rate=row["submissive_rate"] or 0.5,
-                    dominance=row["dominance"] or 0.5,
-                    emotional_dependence_rate=row["emotional_dependence_rate"] or 0.5,
-                    style_summary=row["style_summary"],
-                ),
-                created_at=row["created_at"],
-                last_updated_at=row["last_updated_at"],
-            )
-            for row in rows
-        ]
+        # The whole list is materialised anyway, so one fetch beats cursor
+        # round trips; iter_all_for_user is for callers that stream.
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(_SQL_ALL_FOR_USER, source_user_id)
+        
+        return [_record_to_dyadic(row) for row in rows]
+
+    async def get_all_for_user_columnar(self, source_user_id: str) -> DyadicMetricsColumns:
+        pool = await self._require_pool()
+        
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(_SQL_ALL_FOR_USER_COLUMNAR, source_user_id)
+        
+        n = len(rows)
+        metrics = np.array([r[3:] for r in rows], dtype=np.float64).reshape(n, len(TONE_METRIC_COLUMNS))
+        return DyadicMetricsColumns(
+            source_user_id=source_user_id,
+            target_user_ids=[r[0] for r in rows],
+            relationship_classes=[r[1] for r in rows],
+            total_message_counts=np.fromiter((r[2] for r in rows), dtype=np.int64, count=n),
+            metrics=metrics,
+        )
 
     async def delete(self, source_user_id: str, target_user_id: str) -> bool:
         pool = await self._require_pool()
@@ -301,22 +447,29 @@ class DyadicOverrides:
                 target_user_id,
             )
         
+        self._invalidate((source_user_id, target_user_id))
         return "DELETE 1" in result
 
     async def exists(self, source_user_id: str, target_user_id: str) -> bool:
+        hit, record = self._cache_get((source_user_id, target_user_id))
+        if hit:
+            return record is not None
+        
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
-            count = await conn.fetchval(
+            found = await conn.fetchval(
                 """
-                SELECT COUNT(*) FROM dyadic_overrides
-                WHERE source_user_id = $1 AND target_user_id = $2
+                SELECT EXISTS(
+                    SELECT 1 FROM dyadic_overrides
+                    WHERE source_user_id = $1 AND target_user_id = $2
+                )
                 """,
                 source_user_id,
                 target_user_id,
             )
         
-        return (count or 0) > 0
+        return bool(found)
 
     async def update_relationship_class(
         self,
@@ -339,6 +492,7 @@ class DyadicOverrides:
             )
         
         updated = "UPDATE 1" in result
+        self._invalidate((source_user_id, target_user_id))
         
         if updated:
             logger.info(
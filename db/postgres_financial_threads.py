@@ -1,11 +1,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import List, Optional, TYPE_CHECKING
+from typing import TYPE_CHECKING
 
 import asyncpg
 
@@ -26,7 +29,12 @@ class WaitingFor(str, Enum):
     SENDER = "sender"
 
 
-@dataclass
+# Plain dict lookups skip Enum.__call__ when converting row values.
+_STATUS_MAP = {e.value: e for e in FinancialThreadStatus}
+_WAITING_MAP = {e.value: e for e in WaitingFor}
+
+
+@dataclass(slots=True)
 class FinancialThread:
     id: int
     sender_id: str
@@ -35,13 +43,13 @@ class FinancialThread:
     status: FinancialThreadStatus
     waiting_for: WaitingFor
     topic_summary: str
-    last_sender_message: Optional[str]
-    last_creator_response: Optional[str]
+    last_sender_message: str | None
+    last_creator_response: str | None
     created_at: datetime
     last_activity_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class FinancialThreadMessage:
     id: int
     thread_id: int
@@ -52,17 +60,30 @@ class FinancialThreadMessage:
 
 
 CREATE_TABLES_SQL = """
+-- status و waiting_for فقط چند مقدار ثابت دارند؛ enum چهار بایت است و مقایسه‌اش ارزان‌تر از متن
+DO $$
+BEGIN
+    CREATE TYPE fin_thread_status AS ENUM ('open', 'resolved', 'expired');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END;
+$$;
+
+DO $$
+BEGIN
+    CREATE TYPE fin_waiting_for AS ENUM ('creator', 'sender');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END;
+$$;
+
 -- جدول اصلی thread های مالی
 CREATE TABLE IF NOT EXISTS financial_threads (
     id SERIAL PRIMARY KEY,
     sender_id VARCHAR(255) NOT NULL,
     creator_id VARCHAR(255) NOT NULL,
     conversation_id VARCHAR(255) NOT NULL,
-    status VARCHAR(50) NOT NULL DEFAULT 'open',
-    waiting_for VARCHAR(50) NOT NULL DEFAULT 'creator',
+    status fin_thread_status NOT NULL DEFAULT 'open',
+    waiting_for fin_waiting_for NOT NULL DEFAULT 'creator',
     topic_summary TEXT NOT NULL,
-    last_sender_message TEXT,
-    last_creator_response TEXT,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     last_activity_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
@@ -78,12 +99,119 @@ CREATE TABLE IF NOT EXISTS financial_thread_messages (
 );
 
 -- Index ها
-CREATE INDEX IF NOT EXISTS idx_fin_threads_sender_creator_status 
-    ON financial_threads(sender_id, creator_id, status);
-CREATE INDEX IF NOT EXISTS idx_fin_threads_status_activity 
-    ON financial_threads(status, last_activity_at);
+-- فقط thread های باز خوانده می‌شوند؛ ایندکس‌های جزئی کوچک می‌مانند.
+-- کوئری‌ها 'open' را literal می‌نویسند تا planner بتواند از آن‌ها استفاده کند.
+CREATE INDEX IF NOT EXISTS idx_fin_threads_open_sender_creator 
+    ON financial_threads(sender_id, creator_id, created_at DESC) INCLUDE (id)
+    WHERE status = 'open';
+CREATE INDEX IF NOT EXISTS idx_fin_threads_open_creator 
+    ON financial_threads(creator_id, last_activity_at DESC) WHERE status = 'open';
+CREATE INDEX IF NOT EXISTS idx_fin_threads_open_activity 
+    ON financial_threads(last_activity_at) WHERE status = 'open';
 CREATE INDEX IF NOT EXISTS idx_fin_thread_msgs_thread_delivered 
     ON financial_thread_messages(thread_id, delivered);
+-- آخرین پیام هر طرف از همین ایندکس خوانده می‌شود (ستون‌های last_* حذف شده‌اند)
+CREATE INDEX IF NOT EXISTS idx_fin_thread_msgs_thread_author_created 
+    ON financial_thread_messages(thread_id, author_type, created_at DESC);
+
+-- visibility map تازه بماند تا index-only scan به heap برنگردد
+ALTER TABLE financial_threads SET (autovacuum_vacuum_scale_factor = 0.02);
+
+-- هر پیام جدید روی کانال fin_msg_<thread_id> با id پیام اعلام می‌شود
+CREATE OR REPLACE FUNCTION notify_new_fin_msg() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('fin_msg_' || NEW.thread_id, NEW.id::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_trigger WHERE tgname = 'trg_fin_thread_msgs_notify'
+    ) THEN
+        CREATE TRIGGER trg_fin_thread_msgs_notify
+            AFTER INSERT ON financial_thread_messages
+            FOR EACH ROW EXECUTE FUNCTION notify_new_fin_msg();
+    END IF;
+END;
+$$;
+"""
+
+
+# Rows fetched per cursor round trip when streaming a creator's open threads
+OPEN_THREADS_PREFETCH_ROWS = 100
+
+NOTIFY_CHANNEL_PREFIX = "fin_msg_"
+
+# Creator counters are polled by the UI; writes from this process drop the
+# creator's entry, the TTL covers writes made elsewhere.
+COUNTS_CACHE_TTL_SECONDS = 2.0
+COUNTS_CACHE_MAX_ENTRIES = 10_000
+
+# Bulk batches at or above this size are written with COPY
+COPY_MIN_ROWS = 50
+
+MESSAGE_COPY_COLUMNS = ("thread_id", "author_type", "message", "delivered", "created_at")
+
+_SQL_INSERT_MESSAGES = """
+    INSERT INTO financial_thread_messages 
+        (thread_id, author_type, message, delivered, created_at)
+    SELECT t, a, m, FALSE, c
+    FROM unnest($1::int[], $2::text[], $3::text[], $4::timestamptz[]) AS u(t, a, m, c)
+"""
+
+_SQL_TOUCH_THREADS = """
+    UPDATE financial_threads AS t
+    SET waiting_for = u.waiting_for::fin_waiting_for,
+        last_activity_at = NOW()
+    FROM unnest($1::int[], $2::text[]) AS u(id, waiting_for)
+    WHERE t.id = u.id
+"""
+
+# The thread row only tracks turn state; message text lives in
+# financial_thread_messages and the last message per side is read from there.
+_ADD_MESSAGE_SQL = """
+    WITH m AS (
+        INSERT INTO financial_thread_messages 
+            (thread_id, author_type, message, delivered)
+        VALUES ($1, $2, $3, FALSE)
+        RETURNING id
+    )
+    UPDATE financial_threads
+    SET waiting_for = $4,
+        last_activity_at = NOW()
+    WHERE id = $1
+    RETURNING (SELECT id FROM m), creator_id
+"""
+
+_LAST_MESSAGE_SQL = (
+    "(SELECT m.message FROM financial_thread_messages m"
+    " WHERE m.thread_id = t.id AND m.author_type = '{author}'"
+    " ORDER BY m.created_at DESC LIMIT 1)"
+)
+
+_THREAD_SELECT = f"""
+    SELECT t.id, t.sender_id, t.creator_id, t.conversation_id, t.status, t.waiting_for,
+           t.topic_summary,
+           {_LAST_MESSAGE_SQL.format(author="sender")} AS last_sender_message,
+           {_LAST_MESSAGE_SQL.format(author="creator")} AS last_creator_response,
+           t.created_at, t.last_activity_at
+    FROM financial_threads t"""
+
+_SQL_ACTIVE_THREAD = _THREAD_SELECT + """
+    WHERE t.sender_id = $1 AND t.creator_id = $2 AND t.status = 'open'
+    ORDER BY t.created_at DESC
+    LIMIT 1
+"""
+
+_SQL_THREAD_BY_ID = _THREAD_SELECT + """
+    WHERE t.id = $1
+"""
+
+_SQL_OPEN_THREADS_FOR_CREATOR = _THREAD_SELECT + """
+    WHERE t.creator_id = $1 AND t.status = 'open'
+    ORDER BY t.last_activity_at DESC
 """
 
 
@@ -91,11 +219,37 @@ class PostgresFinancialThreads:
 
     def __init__(self, dsn: str):
         self._dsn = dsn
+        self._pool: asyncpg.Pool | None = None
+        self._counts_cache: dict[str, tuple[float, tuple[int, int]]] = {}
+        # LISTEN needs a connection that is never returned to the pool.
+        self._listen_conn: asyncpg.Connection | None = None
+        self._listen_conn_guard = asyncio.Lock()
         logger.info("financial_threads:init:success")
+    
+    async def close(self) -> None:
+        if self._listen_conn is not None and not self._listen_conn.is_closed():
+            await self._listen_conn.close()
+        self._listen_conn = None
 
     async def _get_pool(self) -> asyncpg.Pool:
-        from db.shared_pool import SharedPostgresPool
-        return await SharedPostgresPool.get_pool(self._dsn)
+        if self._pool is None or self._pool.is_closing():
+            from db.shared_pool import SharedPostgresPool
+            self._pool = await SharedPostgresPool.get_pool(self._dsn)
+        return self._pool
+
+    def _cached_counts(self, creator_id: str) -> tuple[int, int] | None:
+        entry = self._counts_cache.get(creator_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._counts_cache.pop(creator_id, None)
+            return None
+        return entry[1]
+
+    def _store_counts(self, creator_id: str, counts: tuple[int, int]) -> None:
+        if len(self._counts_cache) >= COUNTS_CACHE_MAX_ENTRIES:
+            self._counts_cache.pop(next(iter(self._counts_cache)), None)
+        self._counts_cache[creator_id] = (time.monotonic() + COUNTS_CACHE_TTL_SECONDS, counts)
 
     async def ensure_table(self) -> None:
         try:
@@ -120,34 +274,36 @@ class PostgresFinancialThreads:
         topic_summary: str,
         initial_message: str,
     ) -> int:
-        sql_thread = """
-        INSERT INTO financial_threads 
-            (sender_id, creator_id, conversation_id, topic_summary, 
-             last_sender_message, status, waiting_for)
-        VALUES ($1, $2, $3, $4, $5, $6, $7)
-        RETURNING id
-        """
-        sql_message = """
+        # Both inserts run as one statement: the message row takes the new
+        # thread id from the CTE, and a single statement is already atomic.
+        sql = """
+        WITH t AS (
+            INSERT INTO financial_threads 
+                (sender_id, creator_id, conversation_id, topic_summary, 
+                 status, waiting_for)
+            VALUES ($1, $2, $3, $4, $6, $7)
+            RETURNING id
+        )
         INSERT INTO financial_thread_messages 
             (thread_id, author_type, message, delivered)
-        VALUES ($1, 'sender', $2, FALSE)
+        SELECT id, 'sender', $5, FALSE FROM t
+        RETURNING thread_id
         """
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                async with conn.transaction():
-                    thread_id = await conn.fetchval(
-                        sql_thread,
-                        sender_id,
-                        creator_id,
-                        conversation_id,
-                        topic_summary,
-                        initial_message,
-                        FinancialThreadStatus.OPEN.value,
-                        WaitingFor.CREATOR.value,
-                    )
-                    
-                    await conn.execute(sql_message, thread_id, initial_message)
+                thread_id = await conn.fetchval(
+                    sql,
+                    sender_id,
+                    creator_id,
+                    conversation_id,
+                    topic_summary,
+                    initial_message,
+                    FinancialThreadStatus.OPEN.value,
+                    WaitingFor.CREATOR.value,
+                )
+            
+            self._counts_cache.pop(creator_id, None)
             
             logger.info(
                 "financial_threads:create:success",
@@ -176,22 +332,11 @@ class PostgresFinancialThreads:
         self,
         sender_id: str,
         creator_id: str,
-    ) -> Optional[FinancialThread]:
-        sql = """
-        SELECT id, sender_id, creator_id, conversation_id, status, waiting_for,
-               topic_summary, last_sender_message, last_creator_response,
-               created_at, last_activity_at
-        FROM financial_threads
-        WHERE sender_id = $1 AND creator_id = $2 AND status = $3
-        ORDER BY created_at DESC
-        LIMIT 1
-        """
+    ) -> FinancialThread | None:
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                row = await conn.fetchrow(
-                    sql, sender_id, creator_id, FinancialThreadStatus.OPEN.value
-                )
+                row = await conn.fetchrow(_SQL_ACTIVE_THREAD, sender_id, creator_id)
             
             if row:
                 return self._row_to_thread(row)
@@ -205,18 +350,38 @@ class PostgresFinancialThreads:
             )
             raise
 
-    async def get_thread_by_id(self, thread_id: int) -> Optional[FinancialThread]:
+    async def get_active_thread_id(
+        self,
+        sender_id: str,
+        creator_id: str,
+    ) -> int | None:
+        # Answered from idx_fin_threads_open_sender_creator alone (index-only
+        # scan); callers that only need to know whether a thread is open skip
+        # the heap fetch of the wide text columns.
         sql = """
-        SELECT id, sender_id, creator_id, conversation_id, status, waiting_for,
-               topic_summary, last_sender_message, last_creator_response,
-               created_at, last_activity_at
-        FROM financial_threads
-        WHERE id = $1
+        SELECT id FROM financial_threads
+        WHERE sender_id = $1 AND creator_id = $2 AND status = 'open'
+        ORDER BY created_at DESC
+        LIMIT 1
         """
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                row = await conn.fetchrow(sql, thread_id)
+                return await conn.fetchval(sql, sender_id, creator_id)
+            
+        except Exception as e:
+            logger.error(
+                "financial_threads:get_active_id:error",
+                extra={"sender_id": sender_id, "creator_id": creator_id, "error": str(e)},
+                exc_info=True,
+            )
+            raise
+
+    async def get_thread_by_id(self, thread_id: int) -> FinancialThread | None:
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(_SQL_THREAD_BY_ID, thread_id)
             
             if row:
                 return self._row_to_thread(row)
@@ -230,19 +395,35 @@ class PostgresFinancialThreads:
             )
             raise
 
-    async def get_open_threads_for_creator(self, creator_id: str) -> List[FinancialThread]:
-        sql = """
-        SELECT id, sender_id, creator_id, conversation_id, status, waiting_for,
-               topic_summary, last_sender_message, last_creator_response,
-               created_at, last_activity_at
-        FROM financial_threads
-        WHERE creator_id = $1 AND status = $2
-        ORDER BY last_activity_at DESC
-        """
+    async def iter_open_threads_for_creator(
+        self,
+        creator_id: str,
+        prefetch: int = OPEN_THREADS_PREFETCH_ROWS,
+    ) -> AsyncIterator[FinancialThread]:
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                rows = await conn.fetch(sql, creator_id, FinancialThreadStatus.OPEN.value)
+                async with conn.transaction():
+                    async for row in conn.cursor(
+                        _SQL_OPEN_THREADS_FOR_CREATOR, creator_id, prefetch=prefetch
+                    ):
+                        yield self._row_to_thread(row)
+            
+        except Exception as e:
+            logger.error(
+                "financial_threads:get_for_creator:error",
+                extra={"creator_id": creator_id, "error": str(e)},
+                exc_info=True,
+            )
+            raise
+
+    async def get_open_threads_for_creator(self, creator_id: str) -> list[FinancialThread]:
+        # The list is materialised anyway, so one fetch beats cursor round
+        # trips; iter_open_threads_for_creator is for callers that stream.
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(_SQL_OPEN_THREADS_FOR_CREATOR, creator_id)
             
             return [self._row_to_thread(row) for row in rows]
             
@@ -261,35 +442,20 @@ class PostgresFinancialThreads:
         author_type: str,
         message: str,
     ) -> int:
-        sql_message = """
-        INSERT INTO financial_thread_messages 
-            (thread_id, author_type, message, delivered)
-        VALUES ($1, $2, $3, FALSE)
-        RETURNING id
-        """
-        
         if author_type == "sender":
-            update_field = "last_sender_message"
             new_waiting_for = WaitingFor.CREATOR.value
         else:
-            update_field = "last_creator_response"
             new_waiting_for = WaitingFor.SENDER.value
         
-        sql_update = f"""
-        UPDATE financial_threads
-        SET {update_field} = $2,
-            waiting_for = $3,
-            last_activity_at = NOW()
-        WHERE id = $1
-        """
-        
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                async with conn.transaction():
-                    message_id = await conn.fetchval(sql_message, thread_id, author_type, message)
-                    
-                    await conn.execute(sql_update, thread_id, message, new_waiting_for)
+                row = await conn.fetchrow(
+                    _ADD_MESSAGE_SQL, thread_id, author_type, message, new_waiting_for
+                )
+            
+            message_id, creator_id = row if row else (None, None)
+            self._counts_cache.pop(creator_id, None)
             
             logger.info(
                 "financial_threads:add_message:success",
@@ -309,11 +475,69 @@ class PostgresFinancialThreads:
             )
             raise
 
+    async def add_messages_bulk(self, rows: Sequence[tuple[int, str, str]]) -> int:
+        # rows are (thread_id, author_type, message), in arrival order.
+        if not rows:
+            return 0
+        
+        now = datetime.now(timezone.utc)
+        # created_at is set client-side and nudged per row so messages keep
+        # their batch order; NOW() would give every row the same timestamp.
+        records = [
+            (thread_id, author_type, message, False, now + timedelta(microseconds=i))
+            for i, (thread_id, author_type, message) in enumerate(rows)
+        ]
+        # The last message in the batch decides whose turn it is per thread.
+        waiting = {
+            thread_id: WaitingFor.CREATOR.value if author_type == "sender" else WaitingFor.SENDER.value
+            for thread_id, author_type, _ in rows
+        }
+        
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    if len(records) >= COPY_MIN_ROWS:
+                        await conn.copy_records_to_table(
+                            "financial_thread_messages",
+                            records=records,
+                            columns=MESSAGE_COPY_COLUMNS,
+                        )
+                    else:
+                        thread_ids, authors, messages, _, created = zip(*records)
+                        await conn.execute(
+                            _SQL_INSERT_MESSAGES,
+                            list(thread_ids),
+                            list(authors),
+                            list(messages),
+                            list(created),
+                        )
+                    await conn.execute(
+                        _SQL_TOUCH_THREADS, list(waiting), list(waiting.values())
+                    )
+            
+            # Touched threads may belong to any creator.
+            self._counts_cache.clear()
+            
+            logger.info(
+                "financial_threads:add_messages_bulk:success",
+                extra={"count": len(records), "threads": len(waiting)},
+            )
+            return len(records)
+            
+        except Exception as e:
+            logger.error(
+                "financial_threads:add_messages_bulk:error",
+                extra={"count": len(rows), "error": str(e)},
+                exc_info=True,
+            )
+            raise
+
     async def get_undelivered_messages(
         self,
         thread_id: int,
         for_author_type: str,
-    ) -> List[FinancialThreadMessage]:
+    ) -> list[FinancialThreadMessage]:
         opposite_author = "creator" if for_author_type == "sender" else "sender"
         
         sql = """
@@ -337,6 +561,58 @@ class PostgresFinancialThreads:
             )
             raise
 
+    async def mark_messages_delivered(self, message_ids: list[int]) -> set[int]:
+        # Only rows still undelivered are flipped; the returned ids are the
+        # ones this call delivered, so a concurrent caller cannot deliver the
+        # same message twice.
+        if not message_ids:
+            return set()
+        
+        sql = """
+        UPDATE financial_thread_messages
+        SET delivered = TRUE
+        WHERE id = ANY($1::int[]) AND delivered = FALSE
+        RETURNING id
+        """
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(sql, message_ids)
+            
+            marked = {row[0] for row in rows}
+            if marked:
+                logger.info(
+                    "financial_threads:mark_many_delivered:success",
+                    extra={"requested": len(message_ids), "marked": len(marked)},
+                )
+            return marked
+            
+        except Exception as e:
+            logger.error(
+                "financial_threads:mark_many_delivered:error",
+                extra={"count": len(message_ids), "error": str(e)},
+                exc_info=True,
+            )
+            raise
+
+    async def subscribe(self, thread_id: int, callback: Callable) -> None:
+        # callback uses asyncpg's listener signature
+        # (connection, pid, channel, payload); payload is the new message id.
+        async with self._listen_conn_guard:
+            if self._listen_conn is None or self._listen_conn.is_closed():
+                self._listen_conn = await asyncpg.connect(self._dsn)
+            await self._listen_conn.add_listener(f"{NOTIFY_CHANNEL_PREFIX}{thread_id}", callback)
+        logger.info(
+            "financial_threads:subscribe:success",
+            extra={"thread_id": thread_id},
+        )
+
+    async def unsubscribe(self, thread_id: int, callback: Callable) -> None:
+        async with self._listen_conn_guard:
+            if self._listen_conn is None or self._listen_conn.is_closed():
+                return
+            await self._listen_conn.remove_listener(f"{NOTIFY_CHANNEL_PREFIX}{thread_id}", callback)
+
     async def mark_message_delivered(self, message_id: int) -> bool:
         sql = """
         UPDATE financial_thread_messages
@@ -369,20 +645,27 @@ class PostgresFinancialThreads:
         self,
         thread_id: int,
         limit: int = 10,
-    ) -> List[FinancialThreadMessage]:
+        before: datetime | None = None,
+    ) -> list[FinancialThreadMessage]:
+        # Newest `limit` messages older than `before` (keyset), returned
+        # oldest-first by the outer ORDER BY so no Python-side reversal.
         sql = """
-        SELECT id, thread_id, author_type, message, delivered, created_at
-        FROM financial_thread_messages
-        WHERE thread_id = $1
-        ORDER BY created_at DESC
-        LIMIT $2
+        SELECT * FROM (
+            SELECT id, thread_id, author_type, message, delivered, created_at
+            FROM financial_thread_messages
+            WHERE thread_id = $1
+              AND ($2::timestamptz IS NULL OR created_at < $2)
+            ORDER BY created_at DESC
+            LIMIT $3
+        ) t
+        ORDER BY created_at ASC
         """
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                rows = await conn.fetch(sql, thread_id, limit)
+                rows = await conn.fetch(sql, thread_id, before, limit)
             
-            return [self._row_to_message(row) for row in reversed(rows)]
+            return [self._row_to_message(row) for row in rows]
             
         except Exception as e:
             logger.error(
@@ -393,6 +676,30 @@ class PostgresFinancialThreads:
             raise
 
 
+    async def get_last_messages(self, thread_id: int) -> tuple[str | None, str | None]:
+        # (last sender message, last creator response)
+        sql = """
+        SELECT DISTINCT ON (author_type) author_type, message
+        FROM financial_thread_messages
+        WHERE thread_id = $1
+        ORDER BY author_type, created_at DESC
+        """
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(sql, thread_id)
+            
+            last = {author_type: message for author_type, message in rows}
+            return last.get("sender"), last.get("creator")
+            
+        except Exception as e:
+            logger.error(
+                "financial_threads:get_last_messages:error",
+                extra={"thread_id": thread_id, "error": str(e)},
+                exc_info=True,
+            )
+            raise
+
     async def update_thread_status(
         self,
         thread_id: int,
@@ -402,15 +709,16 @@ class PostgresFinancialThreads:
         UPDATE financial_threads
         SET status = $2, last_activity_at = NOW()
         WHERE id = $1
-        RETURNING id
+        RETURNING creator_id
         """
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                result = await conn.fetchval(sql, thread_id, new_status.value)
+                creator_id = await conn.fetchval(sql, thread_id, new_status.value)
             
-            success = result is not None
+            success = creator_id is not None
             if success:
+                self._counts_cache.pop(creator_id, None)
                 logger.info(
                     "financial_threads:update_status:success",
                     extra={"thread_id": thread_id, "new_status": new_status.value},
@@ -426,12 +734,10 @@ class PostgresFinancialThreads:
             raise
 
     async def expire_old_threads(self, hours: int = 48) -> int:
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
-        
         sql = """
         UPDATE financial_threads
         SET status = $1
-        WHERE status = $2 AND last_activity_at < $3
+        WHERE status = 'open' AND last_activity_at < NOW() - make_interval(hours => $2)
         """
         try:
             pool = await self._get_pool()
@@ -439,13 +745,13 @@ class PostgresFinancialThreads:
                 result = await conn.execute(
                     sql,
                     FinancialThreadStatus.EXPIRED.value,
-                    FinancialThreadStatus.OPEN.value,
-                    cutoff,
+                    hours,
                 )
             
             count = int(result.split()[-1]) if result else 0
             
             if count > 0:
+                self._counts_cache.clear()
                 logger.info(
                     "financial_threads:expire:success",
                     extra={"count": count, "hours": hours},
@@ -462,71 +768,55 @@ class PostgresFinancialThreads:
             raise
 
 
-    async def get_open_count_for_creator(self, creator_id: str) -> int:
-        sql = """
-        SELECT COUNT(*) FROM financial_threads
-        WHERE creator_id = $1 AND status = $2
-        """
-        try:
-            pool = await self._get_pool()
-            async with pool.acquire() as conn:
-                count = await conn.fetchval(
-                    sql, creator_id, FinancialThreadStatus.OPEN.value
-                )
-            return count or 0
-        except Exception as e:
-            logger.error(
-                "financial_threads:get_open_count:error",
-                extra={"creator_id": creator_id, "error": str(e)},
-                exc_info=True,
-            )
-            return 0
-
-    async def get_waiting_for_creator_count(self, creator_id: str) -> int:
+    async def get_creator_counts(self, creator_id: str) -> tuple[int, int]:
+        # (open threads, open threads waiting on the creator) in one index scan.
+        cached = self._cached_counts(creator_id)
+        if cached is not None:
+            return cached
+        
         sql = """
-        SELECT COUNT(*) FROM financial_threads
-        WHERE creator_id = $1 AND status = $2 AND waiting_for = $3
+        SELECT COUNT(*),
+               COUNT(*) FILTER (WHERE waiting_for = $2)
+        FROM financial_threads
+        WHERE creator_id = $1 AND status = 'open'
         """
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                count = await conn.fetchval(
+                row = await conn.fetchrow(
                     sql,
                     creator_id,
-                    FinancialThreadStatus.OPEN.value,
                     WaitingFor.CREATOR.value,
                 )
-            return count or 0
+            counts = (row[0] or 0, row[1] or 0) if row else (0, 0)
+            self._store_counts(creator_id, counts)
+            return counts
         except Exception as e:
             logger.error(
-                "financial_threads:get_waiting_count:error",
+                "financial_threads:get_creator_counts:error",
                 extra={"creator_id": creator_id, "error": str(e)},
                 exc_info=True,
             )
-            return 0
+            return 0, 0
 
+    async def get_open_count_for_creator(self, creator_id: str) -> int:
+        open_count, _ = await self.get_creator_counts(creator_id)
+        return open_count
+
+    async def get_waiting_for_creator_count(self, creator_id: str) -> int:
+        _, waiting = await self.get_creator_counts(creator_id)
+        return waiting
 
+
+    # Every SELECT above lists columns in dataclass field order, so rows are
+    # unpacked positionally instead of by key.
     def _row_to_thread(self, row: asyncpg.Record) -> FinancialThread:
+        (id_, sender_id, creator_id, conv, status, waiting, topic, lsm, lcr, ca, la) = row
         return FinancialThread(
-            id=row["id"],
-            sender_id=row["sender_id"],
-            creator_id=row["creator_id"],
-            conversation_id=row["conversation_id"],
-            status=FinancialThreadStatus(row["status"]),
-            waiting_for=WaitingFor(row["waiting_for"]),
-            topic_summary=row["topic_summary"],
-            last_sender_message=row["last_sender_message"],
-            last_creator_response=row["last_creator_response"],
-            created_at=row["created_at"],
-            last_activity_at=row["last_activity_at"],
+            id_, sender_id, creator_id, conv, _STATUS_MAP[status], _WAITING_MAP[waiting],
+            topic, lsm, lcr, ca, la,
         )
 
     def _row_to_message(self, row: asyncpg.Record) -> FinancialThreadMessage:
-        return FinancialThreadMessage(
-            id=row["id"],
-            thread_id=row["thread_id"],
-            author_type=row["author_type"],
-            message=row["message"],
-            delivered=row["delivered"],
-            created_at=row["created_at"],
-        )
+        # No per-field conversion, so the record is splatted straight in.
+        return FinancialThreadMessage(*row)
@@ -5,7 +5,7 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, TYPE_CHECKING
+from typing import TYPE_CHECKING
 
 import asyncpg
 
@@ -23,7 +23,11 @@ class FutureRequestStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+# Plain dict lookup skips Enum.__call__ when converting row values.
+_STATUS_MAP = {e.value: e for e in FutureRequestStatus}
+
+
+@dataclass(slots=True)
 class FutureRequest:
     id: int
     sender_id: str
@@ -31,11 +35,23 @@ class FutureRequest:
     conversation_id: str
     original_message: str
     detected_plan: str
-    detected_datetime: Optional[str]
+    detected_datetime: str | None
     status: FutureRequestStatus
-    creator_response: Optional[str]
-    responded_at: Optional[datetime]
-    delivered_at: Optional[datetime]
+    creator_response: str | None
+    responded_at: datetime | None
+    delivered_at: datetime | None
+    created_at: datetime
+    updated_at: datetime
+
+
+# Pending list row without the TEXT payload; every column is served by
+# idx_fr_pending_recipient, so reads can be index-only.
+@dataclass(slots=True)
+class FutureRequestSummary:
+    id: int
+    sender_id: str
+    conversation_id: str
+    detected_datetime: str | None
     created_at: datetime
     updated_at: datetime
 
@@ -57,8 +73,16 @@ CREATE TABLE IF NOT EXISTS future_requests (
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_future_requests_recipient_status 
-    ON future_requests(recipient_id, status);
+-- The hot paths only ever read pending rows per recipient and answered rows
+-- per sender/recipient pair; partial indexes stay small as delivered and
+-- expired rows pile up, and their trailing column serves the ORDER BY.
+CREATE INDEX IF NOT EXISTS idx_fr_pending_recipient
+    ON future_requests(recipient_id, created_at DESC)
+    INCLUDE (id, sender_id, conversation_id, detected_datetime, updated_at)
+    WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_fr_answered_sr
+    ON future_requests(sender_id, recipient_id, responded_at ASC)
+    WHERE status = 'answered';
 CREATE INDEX IF NOT EXISTS idx_future_requests_sender_status 
     ON future_requests(sender_id, status);
 CREATE INDEX IF NOT EXISTS idx_future_requests_status 
@@ -68,15 +92,155 @@ CREATE INDEX IF NOT EXISTS idx_future_requests_conversation_id
 """
 
 
+_REQUEST_COLUMNS = """
+    id, sender_id, recipient_id, conversation_id, original_message, detected_plan,
+    detected_datetime, status, creator_response, responded_at,
+    delivered_at, created_at, updated_at
+"""
+
+# Fixed statement text keeps every query on a stable entry in asyncpg's
+# per-connection prepared statement cache. Statuses covered by a partial index
+# are written as literals: a generic plan for a bound $n cannot prove the
+# index predicate and would skip it.
+_SQL_CREATE = """
+INSERT INTO future_requests 
+    (sender_id, recipient_id, conversation_id, original_message, detected_plan, detected_datetime, status)
+VALUES ($1, $2, $3, $4, $5, $6, $7)
+RETURNING id
+"""
+
+_SQL_PENDING_FOR_CREATOR = f"""
+SELECT {_REQUEST_COLUMNS}
+FROM future_requests
+WHERE recipient_id = $1 AND status = 'pending'
+ORDER BY created_at DESC
+"""
+
+# total_count is computed before LIMIT, so one round trip returns a page and
+# the full pending count; LIMIT NULL means no limit.
+_SQL_PENDING_FOR_CREATOR_WITH_COUNT = f"""
+SELECT {_REQUEST_COLUMNS}, COUNT(*) OVER () AS total_count
+FROM future_requests
+WHERE recipient_id = $1 AND status = 'pending'
+ORDER BY created_at DESC
+LIMIT $2
+"""
+
+_SQL_PENDING_SUMMARY_FOR_CREATOR = """
+SELECT id, sender_id, conversation_id, detected_datetime, created_at, updated_at
+FROM future_requests
+WHERE recipient_id = $1 AND status = 'pending'
+ORDER BY created_at DESC
+"""
+
+_SQL_GET_BY_ID = f"""
+SELECT {_REQUEST_COLUMNS}
+FROM future_requests
+WHERE id = $1
+"""
+
+_SQL_SUBMIT_RESPONSE = """
+UPDATE future_requests
+SET creator_response = $2,
+    responded_at = NOW(),
+    status = $3,
+    updated_at = NOW()
+WHERE id = $1 AND status = $4
+RETURNING id
+"""
+
+_SQL_UNDELIVERED_FOR_SENDER = f"""
+SELECT {_REQUEST_COLUMNS}
+FROM future_requests
+WHERE sender_id = $1 
+  AND recipient_id = $2 
+  AND status = 'answered'
+ORDER BY responded_at ASC
+"""
+
+# Marks and returns in one statement; a concurrent claim for the same pair
+# sees the rows already delivered and gets nothing back.
+_SQL_CLAIM_UNDELIVERED_FOR_SENDER = f"""
+WITH claimed AS (
+    UPDATE future_requests
+    SET status = $3,
+        delivered_at = NOW(),
+        updated_at = NOW()
+    WHERE sender_id = $1 
+      AND recipient_id = $2 
+      AND status = 'answered'
+    RETURNING {_REQUEST_COLUMNS}
+)
+SELECT * FROM claimed
+ORDER BY responded_at ASC
+"""
+
+_SQL_MARK_DELIVERED = """
+UPDATE future_requests
+SET status = $2,
+    delivered_at = NOW(),
+    updated_at = NOW()
+WHERE id = $1 AND status = $3
+RETURNING id
+"""
+
+_SQL_MARK_EXPIRED = """
+UPDATE future_requests
+SET status = $2,
+    updated_at = NOW()
+WHERE id = $1 AND status = $3
+RETURNING id
+"""
+
+_SQL_MARK_MANY_DELIVERED = """
+UPDATE future_requests
+SET status = $2,
+    delivered_at = NOW(),
+    updated_at = NOW()
+WHERE id = ANY($1::int[]) AND status = $3
+RETURNING id
+"""
+
+_SQL_MARK_MANY_EXPIRED = """
+UPDATE future_requests
+SET status = $2,
+    updated_at = NOW()
+WHERE id = ANY($1::int[]) AND status = $3
+RETURNING id
+"""
+
+_SQL_PENDING_COUNT = """
+SELECT COUNT(*) FROM future_requests
+WHERE recipient_id = $1 AND status = 'pending'
+"""
+
+_SQL_BY_SENDER_WITH_STATUSES = f"""
+SELECT {_REQUEST_COLUMNS}
+FROM future_requests
+WHERE sender_id = $1 AND status = ANY($2)
+ORDER BY created_at DESC
+"""
+
+_SQL_BY_SENDER = f"""
+SELECT {_REQUEST_COLUMNS}
+FROM future_requests
+WHERE sender_id = $1
+ORDER BY created_at DESC
+"""
+
+
 class PostgresFutureRequests:
 
     def __init__(self, dsn: str):
         self._dsn = dsn
+        self._pool: asyncpg.Pool | None = None
         logger.info("future_requests:init:success")
 
     async def _get_pool(self) -> asyncpg.Pool:
-        from db.shared_pool import SharedPostgresPool
-        return await SharedPostgresPool.get_pool(self._dsn)
+        if self._pool is None or self._pool.is_closing():
+            from db.shared_pool import SharedPostgresPool
+            self._pool = await SharedPostgresPool.get_pool(self._dsn)
+        return self._pool
 
     async def ensure_table(self) -> None:
         try:
@@ -100,19 +264,13 @@ class PostgresFutureRequests:
         conversation_id: str,
         original_message: str,
         detected_plan: str,
-        detected_datetime: Optional[str] = None,
+        detected_datetime: str | None = None,
     ) -> int:
-        sql = """
-        INSERT INTO future_requests 
-            (sender_id, recipient_id, conversation_id, original_message, detected_plan, detected_datetime, status)
-        VALUES ($1, $2, $3, $4, $5, $6, $7)
-        RETURNING id
-        """
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
                 request_id = await conn.fetchval(
-                    sql,
+                    _SQL_CREATE,
                     sender_id,
                     recipient_id,
                     conversation_id,
@@ -146,19 +304,14 @@ class PostgresFutureRequests:
             )
             raise
 
-    async def get_pending_for_creator(self, recipient_id: str) -> List[FutureRequest]:
-        sql = """
-        SELECT id, sender_id, recipient_id, conversation_id, original_message, detected_plan,
-               detected_datetime, status, creator_response, responded_at,
-               delivered_at, created_at, updated_at
-        FROM future_requests
-        WHERE recipient_id = $1 AND status = $2
-        ORDER BY created_at DESC
-        """
+    async def get_pending_for_creator(self, recipient_id: str) -> list[FutureRequest]:
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                rows = await conn.fetch(sql, recipient_id, FutureRequestStatus.PENDING.value)
+                rows = await conn.fetch(
+                    _SQL_PENDING_FOR_CREATOR,
+                    recipient_id,
+                )
             
             requests = [self._row_to_request(row) for row in rows]
             
@@ -179,18 +332,67 @@ class PostgresFutureRequests:
             )
             raise
 
-    async def get_request_by_id(self, request_id: int) -> Optional[FutureRequest]:
-        sql = """
-        SELECT id, sender_id, recipient_id, conversation_id, original_message, detected_plan,
-               detected_datetime, status, creator_response, responded_at,
-               delivered_at, created_at, updated_at
-        FROM future_requests
-        WHERE id = $1
-        """
+    async def get_pending_for_creator_with_count(
+        self,
+        recipient_id: str,
+        limit: int | None = None,
+    ) -> tuple[list[FutureRequest], int]:
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    _SQL_PENDING_FOR_CREATOR_WITH_COUNT,
+                    recipient_id,
+                    limit,
+                )
+            
+            # total_count rides along as the last column of every row
+            requests = [self._row_to_request(row[:-1]) for row in rows]
+            total = rows[0][-1] if rows else 0
+            
+            logger.info(
+                "future_requests:get_pending_with_count:success",
+                extra={
+                    "recipient_id": recipient_id,
+                    "count": len(requests),
+                    "total": total,
+                },
+            )
+            return requests, total
+            
+        except Exception as e:
+            logger.error(
+                "future_requests:get_pending_with_count:error",
+                extra={"recipient_id": recipient_id, "error": str(e)},
+                exc_info=True,
+            )
+            raise
+
+    async def get_pending_for_creator_summary(
+        self,
+        recipient_id: str,
+    ) -> list[FutureRequestSummary]:
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(_SQL_PENDING_SUMMARY_FOR_CREATOR, recipient_id)
+            
+            # Columns are selected in field order and need no conversion.
+            return [FutureRequestSummary(*row) for row in rows]
+            
+        except Exception as e:
+            logger.error(
+                "future_requests:get_pending_summary:error",
+                extra={"recipient_id": recipient_id, "error": str(e)},
+                exc_info=True,
+            )
+            raise
+
+    async def get_request_by_id(self, request_id: int) -> FutureRequest | None:
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                row = await conn.fetchrow(sql, request_id)
+                row = await conn.fetchrow(_SQL_GET_BY_ID, request_id)
             
             if row:
                 return self._row_to_request(row)
@@ -210,20 +412,11 @@ class PostgresFutureRequests:
         request_id: int,
         creator_response: str,
     ) -> bool:
-        sql = """
-        UPDATE future_requests
-        SET creator_response = $2,
-            responded_at = NOW(),
-            status = $3,
-            updated_at = NOW()
-        WHERE id = $1 AND status = $4
-        RETURNING id
-        """
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
                 result = await conn.fetchval(
-                    sql,
+                    _SQL_SUBMIT_RESPONSE,
                     request_id,
                     creator_response,
                     FutureRequestStatus.ANSWERED.value,
@@ -261,25 +454,14 @@ class PostgresFutureRequests:
         self,
         sender_id: str,
         recipient_id: str,
-    ) -> List[FutureRequest]:
-        sql = """
-        SELECT id, sender_id, recipient_id, conversation_id, original_message, detected_plan,
-               detected_datetime, status, creator_response, responded_at,
-               delivered_at, created_at, updated_at
-        FROM future_requests
-        WHERE sender_id = $1 
-          AND recipient_id = $2 
-          AND status = $3
-        ORDER BY responded_at ASC
-        """
+    ) -> list[FutureRequest]:
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
                 rows = await conn.fetch(
-                    sql,
+                    _SQL_UNDELIVERED_FOR_SENDER,
                     sender_id,
                     recipient_id,
-                    FutureRequestStatus.ANSWERED.value,
                 )
             
             requests = [self._row_to_request(row) for row in rows]
@@ -308,20 +490,53 @@ class PostgresFutureRequests:
             )
             raise
 
+    async def claim_undelivered_for_sender(
+        self,
+        sender_id: str,
+        recipient_id: str,
+    ) -> list[FutureRequest]:
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    _SQL_CLAIM_UNDELIVERED_FOR_SENDER,
+                    sender_id,
+                    recipient_id,
+                    FutureRequestStatus.DELIVERED.value,
+                )
+            
+            requests = [self._row_to_request(row) for row in rows]
+            
+            if requests:
+                logger.info(
+                    "future_requests:claim_undelivered:success",
+                    extra={
+                        "sender_id": sender_id,
+                        "recipient_id": recipient_id,
+                        "count": len(requests),
+                    },
+                )
+            
+            return requests
+            
+        except Exception as e:
+            logger.error(
+                "future_requests:claim_undelivered:error",
+                extra={
+                    "sender_id": sender_id,
+                    "recipient_id": recipient_id,
+                    "error": str(e),
+                },
+                exc_info=True,
+            )
+            raise
+
     async def mark_as_delivered(self, request_id: int) -> bool:
-        sql = """
-        UPDATE future_requests
-        SET status = $2,
-            delivered_at = NOW(),
-            updated_at = NOW()
-        WHERE id = $1 AND status = $3
-        RETURNING id
-        """
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
                 result = await conn.fetchval(
-                    sql,
+                    _SQL_MARK_DELIVERED,
                     request_id,
                     FutureRequestStatus.DELIVERED.value,
                     FutureRequestStatus.ANSWERED.value,
@@ -351,18 +566,11 @@ class PostgresFutureRequests:
             raise
 
     async def mark_as_expired(self, request_id: int) -> bool:
-        sql = """
-        UPDATE future_requests
-        SET status = $2,
-            updated_at = NOW()
-        WHERE id = $1 AND status = $3
-        RETURNING id
-        """
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
                 result = await conn.fetchval(
-                    sql,
+                    _SQL_MARK_EXPIRED,
                     request_id,
                     FutureRequestStatus.EXPIRED.value,
                     FutureRequestStatus.PENDING.value,
@@ -387,18 +595,72 @@ class PostgresFutureRequests:
             raise
 
 
+    async def mark_many_as_delivered(self, request_ids: list[int]) -> list[int]:
+        if not request_ids:
+            return []
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    _SQL_MARK_MANY_DELIVERED,
+                    request_ids,
+                    FutureRequestStatus.DELIVERED.value,
+                    FutureRequestStatus.ANSWERED.value,
+                )
+            
+            delivered = [row[0] for row in rows]
+            
+            logger.info(
+                "future_requests:mark_many_delivered:success",
+                extra={"requested": len(request_ids), "delivered": len(delivered)},
+            )
+            return delivered
+            
+        except Exception as e:
+            logger.error(
+                "future_requests:mark_many_delivered:error",
+                extra={"count": len(request_ids), "error": str(e)},
+                exc_info=True,
+            )
+            raise
+
+    async def mark_many_as_expired(self, request_ids: list[int]) -> list[int]:
+        if not request_ids:
+            return []
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    _SQL_MARK_MANY_EXPIRED,
+                    request_ids,
+                    FutureRequestStatus.EXPIRED.value,
+                    FutureRequestStatus.PENDING.value,
+                )
+            
+            expired = [row[0] for row in rows]
+            
+            logger.info(
+                "future_requests:mark_many_expired:success",
+                extra={"requested": len(request_ids), "expired": len(expired)},
+            )
+            return expired
+            
+        except Exception as e:
+            logger.error(
+                "future_requests:mark_many_expired:error",
+                extra={"count": len(request_ids), "error": str(e)},
+                exc_info=True,
+            )
+            raise
+
+
     async def get_pending_count_for_creator(self, recipient_id: str) -> int:
-        sql = """
-        SELECT COUNT(*) FROM future_requests
-        WHERE recipient_id = $1 AND status = $2
-        """
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
                 count = await conn.fetchval(
-                    sql,
+                    _SQL_PENDING_COUNT,
                     recipient_id,
-                    FutureRequestStatus.PENDING.value,
                 )
             return count or 0
         except Exception as e:
@@ -412,28 +674,14 @@ class PostgresFutureRequests:
     async def get_requests_by_sender(
         self,
         sender_id: str,
-        include_statuses: Optional[List[FutureRequestStatus]] = None,
-    ) -> List[FutureRequest]:
+        include_statuses: list[FutureRequestStatus] | None = None,
+    ) -> list[FutureRequest]:
         if include_statuses:
             status_values = [s.value for s in include_statuses]
-            sql = """
-            SELECT id, sender_id, recipient_id, conversation_id, original_message, detected_plan,
-                   detected_datetime, status, creator_response, responded_at,
-                   delivered_at, created_at, updated_at
-            FROM future_requests
-            WHERE sender_id = $1 AND status = ANY($2)
-            ORDER BY created_at DESC
-            """
+            sql = _SQL_BY_SENDER_WITH_STATUSES
             params = [sender_id, status_values]
         else:
-            sql = """
-            SELECT id, sender_id, recipient_id, conversation_id, original_message, detected_plan,
-                   detected_datetime, status, creator_response, responded_at,
-                   delivered_at, created_at, updated_at
-            FROM future_requests
-            WHERE sender_id = $1
-            ORDER BY created_at DESC
-            """
+            sql = _SQL_BY_SENDER
             params = [sender_id]
         
         try:
@@ -461,19 +709,12 @@ class PostgresFutureRequests:
             raise
 
 
+    # Every SELECT and RETURNING above lists _REQUEST_COLUMNS in dataclass
+    # field order, so rows are unpacked positionally instead of by key.
     def _row_to_request(self, row: asyncpg.Record) -> FutureRequest:
+        (id_, sender_id, recipient_id, conv, original, plan, detected_dt,
+         status, response, responded_at, delivered_at, created_at, updated_at) = row
         return FutureRequest(
-            id=row["id"],
-            sender_id=row["sender_id"],
-            recipient_id=row["recipient_id"],
-            conversation_id=row["conversation_id"],
-            original_message=row["original_message"],
-            detected_plan=row["detected_plan"],
-            detected_datetime=row["detected_datetime"],
-            status=FutureRequestStatus(row["status"]),
-            creator_response=row["creator_response"],
-            responded_at=row["responded_at"],
-            delivered_at=row["delivered_at"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
+            id_, sender_id, recipient_id, conv, original, plan, detected_dt,
+            _STATUS_MAP[status], response, responded_at, delivered_at, created_at, updated_at,
         )
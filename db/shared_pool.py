@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional, TYPE_CHECKING
+from typing import TYPE_CHECKING
 
 import asyncpg
 
@@ -14,8 +14,17 @@ logger = logging.getLogger(__name__)
 
 class SharedPostgresPool:
     
-    _pool: Optional[asyncpg.Pool] = None
-    _dsn: Optional[str] = None
+    _pool: asyncpg.Pool | None = None
+    _dsn: str | None = None
+    _server_settings: dict[str, str] = {}
+    
+    @classmethod
+    def configure(cls, *, tenant_id: str | None = None) -> None:
+        # Sent in the startup packet, so every physical connection gets the
+        # setting once at connect time (no per-acquire SET), and it survives
+        # the RESET ALL asyncpg runs when a connection goes back to the pool.
+        if tenant_id is not None:
+            cls._server_settings = {**cls._server_settings, "app.tenant_id": tenant_id}
     
     @classmethod
     async def get_pool(cls, dsn: str) -> asyncpg.Pool:
@@ -25,6 +34,7 @@ class SharedPostgresPool:
                 dsn=dsn,
                 min_size=2,
                 max_size=20,
+                server_settings=cls._server_settings or None,
             )
             logger.info(
                 "shared_pool:created",
@@ -3,12 +3,11 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime
-from typing import Any, Optional, Iterable, Protocol, List, TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Protocol
 
+from db.postgres_chat_store import PostgresChatStore
 from listener.exceptions import ListenerError
 from memory.mem0_adapter import Mem0Adapter
-from db.postgres_chat_store import PostgresChatStore
 
 if TYPE_CHECKING:
     from summarizer.summarizer_agent import SummaryWithFacts
@@ -19,19 +18,19 @@ class Summarizer(Protocol):
     async def summarize_per_user(
         self,
         *,
-        previous_summary: Optional[str],
-        messages_with_authors: List[tuple[str, str]],
+        previous_summary: str | None,
+        messages_with_authors: list[tuple[str, str]],
         user_a_id: str,
         user_b_id: str,
     ) -> str: ...
     async def summarize_with_facts(
         self,
         *,
-        previous_summary: Optional[str],
-        messages_with_authors: List[tuple[str, str]],
+        previous_summary: str | None,
+        messages_with_authors: list[tuple[str, str]],
         user_a_id: str,
         user_b_id: str,
-    ) -> "SummaryWithFacts": ...
+    ) -> SummaryWithFacts: ...
 
 
 logger = logging.getLogger(__name__)
@@ -42,12 +41,12 @@ class ListenerAgent:
     def __init__(
         self,
         mem0_adapter: Mem0Adapter,
-        summarizer_agent: Optional[Summarizer] = None,
+        summarizer_agent: Summarizer | None = None,
         summarize_threshold: int = 20,
         min_chars_for_summary: int = 0,
-        settings: Optional[Any] = None,
-        chat_store: Optional[PostgresChatStore] = None,
-        summarize_every_n_messages: Optional[int] = None,
+        settings: Any | None = None,
+        chat_store: PostgresChatStore | None = None,
+        summarize_every_n_messages: int | None = None,
         **kwargs,
     ) -> None:
         self._mem0 = mem0_adapter
@@ -169,10 +168,7 @@ class ListenerAgent:
 
         try:
             if self._chat_store is not None:
-                count = await self._chat_store.count_active(
-                    user_a=memory_owner_id, user_b=partner_user_id, conversation_id=conversation_id
-                )
-                token_sum = await self._chat_store.sum_active_tokens(
+                count, token_sum = await self._chat_store.get_active_stats(
                     user_a=memory_owner_id, user_b=partner_user_id, conversation_id=conversation_id
                 )
                 MIN_TOKEN_THRESHOLD = 300
@@ -269,10 +265,10 @@ class ListenerAgent:
         memory_owner_id: str,
         partner_user_id: str,
         conversation_id: str,
-        memories: Optional[list[dict[str, Any]]] = None,
+        memories: list[dict[str, Any]] | None = None,
         *,
-        messages_with_authors: Optional[List[tuple[str, str]]] = None,
-        event_ids_to_delete: Optional[List[int]] = None,
+        messages_with_authors: list[tuple[str, str]] | None = None,
+        event_ids_to_delete: list[int] | None = None,
     ) -> None:
         if self._chat_store is None:
             await self._background_summarization(
@@ -330,10 +326,10 @@ class ListenerAgent:
         memory_owner_id: str,
         partner_user_id: str,
         conversation_id: str,
-        memories: Optional[list[dict[str, Any]]] = None,
+        memories: list[dict[str, Any]] | None = None,
         *,
-        messages_with_authors: Optional[List[tuple[str, str]]] = None,
-        event_ids_to_delete: Optional[List[int]] = None,
+        messages_with_authors: list[tuple[str, str]] | None = None,
+        event_ids_to_delete: list[int] | None = None,
     ) -> None:
         try:
             logger.info(
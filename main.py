@@ -1,29 +1,31 @@
 
-from contextlib import asynccontextmanager
 import logging
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.routers.chat import router as chat_router
 from api.routers.creator import router as creator_router
+from api.routers.feedback import router as feedback_router
 from api.routers.passive import router as passive_router
 from api.routers.passive_last_message_id import router as passive_last_id_router
-from api.routers.feedback import router as feedback_router
 from api.routers.scheduler import router as scheduler_router
-from api.routers.websocket_notifications import router as ws_router
 from api.routers.voice_static import router as voice_router
+from api.routers.websocket_notifications import router as ws_router
 from config.container import Container
-from config.settings import Settings
-
-from observability.phoenix_setup import init_phoenix_tracing, shutdown_tracing
+from config.settings import get_settings
+from db.postgres import dispose_async_engines
+from db.shared_pool import SharedPostgresPool
+from observability.log_queue import init_queue_logging, shutdown_queue_logging
 from observability.metrics import setup_prometheus_metrics
+from observability.phoenix_setup import init_phoenix_tracing, shutdown_tracing
 from observability.sqlite_metrics import create_sqlite_collector
 
 logger = logging.getLogger(__name__)
 
-_settings = Settings()
+_settings = get_settings()
 if _settings.OPENAI_BASE_URL:
     os.environ["OPENAI_BASE_URL"] = _settings.OPENAI_BASE_URL
 if _settings.OPENAI_API_KEY:
@@ -63,11 +65,13 @@ async def lifespan(app: FastAPI):
     )
 
     settings = container.settings()
+    SharedPostgresPool.configure(tenant_id=settings.TENANT_ID)
 
     logging.basicConfig(
         level=getattr(logging, settings.LOG_LEVEL.upper()),
         format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
     )
+    init_queue_logging()
 
     
     logger.info("=" * 70)
@@ -110,6 +114,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"application:startup:preload_failed: {e}", exc_info=True)
 
+    try:
+        logger.info("application:startup:warming_db_pool")
+        await container.passive_service().warm_up()
+        logger.info("application:startup:db_pool_warm ✓")
+    except Exception as e:
+        logger.error(f"application:startup:db_pool_warm_failed: {e}", exc_info=True)
+
     
     try:
         logger.info("application:startup:ensuring_financial_threads_tables")
@@ -191,8 +202,22 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"application:shutdown:scheduler_stop_failed: {e}", exc_info=True)
     
+    try:
+        await dispose_async_engines()
+        logger.info("application:shutdown:sqlalchemy_engines_disposed")
+    except Exception as e:
+        logger.error(f"application:shutdown:sqlalchemy_engines_dispose_failed: {e}")
+    
+    try:
+        await container.passive_archive_storage().close()
+        logger.info("application:shutdown:passive_archive_lock_conn_closed")
+    except Exception as e:
+        logger.error(f"application:shutdown:passive_archive_close_failed: {e}")
+    
     shutdown_tracing()
     logger.info("application:shutdown:tracing_stopped")
+    
+    shutdown_queue_logging()
 
 
 def create_app() -> FastAPI:
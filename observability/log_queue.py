@@ -0,0 +1,51 @@
+
+from __future__ import annotations
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+logger = logging.getLogger(__name__)
+
+_listener: QueueListener | None = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # QueueHandler.prepare() formats the record on the caller's thread; the
+    # queue never leaves the process, so hand the record over as-is and let
+    # the listener's handlers format it.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# Root handlers are moved behind a QueueListener thread; the event loop only
+# enqueues LogRecords and formatting/IO happens off the loop.
+def init_queue_logging() -> bool:
+    global _listener
+
+    if _listener is not None:
+        return True
+
+    root = logging.getLogger()
+    handlers = [h for h in root.handlers if not isinstance(h, QueueHandler)]
+    if not handlers:
+        return False
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root.handlers = [_DeferredQueueHandler(log_queue)]
+    _listener.start()
+    logger.info("log_queue:init:complete", extra={"handlers": len(handlers)})
+    return True
+
+
+def shutdown_queue_logging() -> None:
+    global _listener
+
+    if _listener is None:
+        return
+
+    listener, _listener = _listener, None
+    # Flushes whatever is still queued, then hands the real handlers back.
+    listener.stop()
+    logging.getLogger().handlers = list(listener.handlers)
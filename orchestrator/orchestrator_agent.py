@@ -1,22 +1,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import uuid
-import asyncio
 from datetime import datetime
-from typing import Any, cast, Optional
+from typing import Any, cast
 
 from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionMessageParam
-from pydantic import BaseModel
 
 from config.settings import Settings
-from orchestrator.messages import ChatRequest, CreatorRequest, OrchestratorOutput
-from memory.mem0_adapter import Mem0Adapter
-from listener.listener import ListenerAgent
 from guardrail.guardrails_agent import GuardrailsAgent
+from listener.listener import ListenerAgent
+from memory.mem0_adapter import Mem0Adapter
 from observability.phoenix_setup import record_llm_tokens
+from orchestrator.messages import ChatRequest, CreatorRequest, OrchestratorOutput
 
 try:
     from db.postgres_chat_store import PostgresChatStore
@@ -43,31 +42,31 @@ except ImportError:
     RelationshipClusterPersonas = None
 
 try:
+    from db.postgres_future_requests import (
+        FutureRequest,
+        PostgresFutureRequests,
+    )
     from orchestrator.future_planning_detector import (
         FuturePlanningDetector,
         FuturePlanningResult,
     )
-    from db.postgres_future_requests import (
-        PostgresFutureRequests,
-        FutureRequest,
-    )
 except ImportError:
     FuturePlanningDetector = None
     PostgresFutureRequests = None
 
 try:
-    from orchestrator.financial_topic_detector import (
-        FinancialTopicDetector,
-        FinancialDetectionResult,
-        ThreadContinuationResult,
-    )
     from db.postgres_financial_threads import (
-        PostgresFinancialThreads,
         FinancialThread,
         FinancialThreadMessage,
         FinancialThreadStatus,
+        PostgresFinancialThreads,
         WaitingFor,
     )
+    from orchestrator.financial_topic_detector import (
+        FinancialDetectionResult,
+        FinancialTopicDetector,
+        ThreadContinuationResult,
+    )
 except ImportError:
     FinancialTopicDetector = None
     PostgresFinancialThreads = None
@@ -89,13 +88,13 @@ class OrchestratorAgent:
         guardrails_agent: GuardrailsAgent,
         openai_client: AsyncOpenAI,
         mem0_adapter: Mem0Adapter,
-        chat_store: Optional["PostgresChatStore"] = None,
-        dyadic_overrides: Optional["DyadicOverrides"] = None,
-        relationship_cluster: Optional["RelationshipClusterPersonas"] = None,
-        creator_chat_store: Optional["CreatorChatStore"] = None,
-        future_requests_store: Optional["PostgresFutureRequests"] = None,
-        passive_archive: Optional["PassiveArchiveStorage"] = None,
-        financial_threads_store: Optional["PostgresFinancialThreads"] = None,
+        chat_store: PostgresChatStore | None = None,
+        dyadic_overrides: DyadicOverrides | None = None,
+        relationship_cluster: RelationshipClusterPersonas | None = None,
+        creator_chat_store: CreatorChatStore | None = None,
+        future_requests_store: PostgresFutureRequests | None = None,
+        passive_archive: PassiveArchiveStorage | None = None,
+        financial_threads_store: PostgresFinancialThreads | None = None,
     ):
         self._settings = settings
         self._listener = listener_agent
@@ -107,12 +106,12 @@ class OrchestratorAgent:
         self._rel_cluster = relationship_cluster
         self._creator_chat_store = creator_chat_store
         self._future_requests = future_requests_store
-        self._future_detector: Optional["FuturePlanningDetector"] = None
+        self._future_detector: FuturePlanningDetector | None = None
         if FuturePlanningDetector is not None:
             self._future_detector = FuturePlanningDetector(openai_client, settings)
         self._passive_archive = passive_archive
         self._financial_threads = financial_threads_store
-        self._financial_detector: Optional["FinancialTopicDetector"] = None
+        self._financial_detector: FinancialTopicDetector | None = None
         if FinancialTopicDetector is not None:
             self._financial_detector = FinancialTopicDetector(openai_client, settings)
 
@@ -264,7 +263,7 @@ class OrchestratorAgent:
 
         language = self._normalize_language(request.language)
 
-        last_ai_question: Optional[str] = None
+        last_ai_question: str | None = None
         if self._creator_chat_store is not None:
             try:
                 last_ai_question = await self._creator_chat_store.get_last_ai_message(
@@ -761,7 +760,7 @@ class OrchestratorAgent:
         self,
         recipient_id: str,
         sender_id: str,
-    ) -> Optional[str]:
+    ) -> str | None:
         try:
             if self._dyadic is not None:
                 dyadic_record = await self._dyadic.get(
@@ -829,8 +828,8 @@ class OrchestratorAgent:
         self,
         recipient_id: str,
         sender_id: str,
-    ) -> Optional[str]:
-        relationship_class: Optional[str] = None
+    ) -> str | None:
+        relationship_class: str | None = None
         source: str = "unknown"
         
         try:
@@ -893,7 +892,7 @@ class OrchestratorAgent:
     def _format_tone_instructions(
         self,
         metrics: Any,
-        relationship_class: Optional[str],
+        relationship_class: str | None,
         source: str,
     ) -> str:
         parts = []
@@ -946,7 +945,7 @@ class OrchestratorAgent:
         
         return "\n".join(parts)
 
-    def _extract_subtype_from_style_summary(self, style_summary: Optional[str]) -> Optional[str]:
+    def _extract_subtype_from_style_summary(self, style_summary: str | None) -> str | None:
         if not style_summary:
             return None
         
@@ -965,7 +964,6 @@ class OrchestratorAgent:
         return None
 
     def _get_current_time_context(self) -> str:
-        from datetime import datetime
         import jdatetime
         
         try:
@@ -1901,7 +1899,9 @@ You: "هنوز نه، چیکاره‌ای؟" [if empty]"""
             return None
         
         try:
-            undelivered = await self._future_requests.get_undelivered_responses_for_sender(
+            # Claimed rows are already marked delivered, so a concurrent turn
+            # for the same pair cannot deliver them a second time.
+            undelivered = await self._future_requests.claim_undelivered_for_sender(
                 sender_id=sender_id,
                 recipient_id=recipient_id,
             )
@@ -1917,17 +1917,15 @@ You: "هنوز نه، چیکاره‌ای؟" [if empty]"""
                     else:
                         response_text = f"📬 About your request ({req.detected_plan}):\n{twin_name} said: {req.creator_response}"
                     responses.append(response_text)
-                    
-                    await self._future_requests.mark_as_delivered(req.id)
-                    
-                    logger.info(
-                        "orchestrator:future_planning:response_delivered",
-                        extra={
-                            "request_id": req.id,
-                            "sender_id": sender_id,
-                            "recipient_id": recipient_id,
-                        },
-                    )
+            
+            logger.info(
+                "orchestrator:future_planning:response_delivered",
+                extra={
+                    "request_ids": [req.id for req in undelivered],
+                    "sender_id": sender_id,
+                    "recipient_id": recipient_id,
+                },
+            )
             
             if responses:
                 return "\n\n".join(responses)
@@ -2082,7 +2080,7 @@ You: "هنوز نه، چیکاره‌ای؟" [if empty]"""
 
     async def _handle_active_financial_thread(
         self,
-        thread: "FinancialThread",
+        thread: FinancialThread,
         sender_message: str,
         twin_name: str,
         language: str,
@@ -2099,16 +2097,12 @@ You: "هنوز نه، چیکاره‌ای؟" [if empty]"""
             )
             
             if undelivered:
-                responses = []
-                for msg in undelivered:
-                    delivery_msg = await self._financial_detector.generate_delivery_message(
-                        creator_response=msg.message,
-                        topic_summary=thread.topic_summary,
-                        creator_name=twin_name,
-                        language=language,
-                    )
-                    responses.append(delivery_msg)
-                    await self._financial_threads.mark_message_delivered(msg.id)
+                responses = await self._render_financial_deliveries(
+                    thread=thread,
+                    undelivered=undelivered,
+                    twin_name=twin_name,
+                    language=language,
+                )
                 
                 continuation = await self._financial_detector.check_continuation(
                     message=sender_message,
@@ -2124,7 +2118,9 @@ You: "هنوز نه، چیکاره‌ای؟" [if empty]"""
                     )
                     
                     try:
-                        from api.routers.websocket_notifications import notify_financial_message_to_creator
+                        from api.routers.websocket_notifications import (
+                            notify_financial_message_to_creator,
+                        )
                         await notify_financial_message_to_creator(
                             creator_id=thread.creator_id,
                             sender_id=thread.sender_id,
@@ -2136,7 +2132,7 @@ You: "هنوز نه، چیکاره‌ای؟" [if empty]"""
                     
                     responses.append(f"پیامتو هم به {twin_name} رسوندم. ⏳")
                 
-                return "\n\n".join(responses)
+                return "\n\n".join(responses) or None
             
             continuation = await self._financial_detector.check_continuation(
                 message=sender_message,
@@ -2152,7 +2148,9 @@ You: "هنوز نه، چیکاره‌ای؟" [if empty]"""
                 )
                 
                 try:
-                    from api.routers.websocket_notifications import notify_financial_message_to_creator
+                    from api.routers.websocket_notifications import (
+                        notify_financial_message_to_creator,
+                    )
                     await notify_financial_message_to_creator(
                         creator_id=thread.creator_id,
                         sender_id=thread.sender_id,
@@ -2210,7 +2208,9 @@ You: "هنوز نه، چیکاره‌ای؟" [if empty]"""
                 )
                 
                 try:
-                    from api.routers.websocket_notifications import notify_financial_message_to_creator
+                    from api.routers.websocket_notifications import (
+                        notify_financial_message_to_creator,
+                    )
                     await notify_financial_message_to_creator(
                         creator_id=thread.creator_id,
                         sender_id=thread.sender_id,
@@ -2229,6 +2229,46 @@ You: "هنوز نه، چیکاره‌ای؟" [if empty]"""
         
         return None
 
+    async def _render_financial_deliveries(
+        self,
+        thread: FinancialThread,
+        undelivered: list[FinancialThreadMessage],
+        twin_name: str,
+        language: str,
+    ) -> list[str]:
+        # Texts are built before anything is marked, so a failure here leaves
+        # the messages undelivered for the next turn. The single mark below
+        # only flips rows still undelivered; a concurrent turn that got there
+        # first keeps its messages and they are dropped from this reply.
+        rendered = []
+        for msg in undelivered:
+            delivery_msg = await self._financial_detector.generate_delivery_message(
+                creator_response=msg.message,
+                topic_summary=thread.topic_summary,
+                creator_name=twin_name,
+                language=language,
+            )
+            rendered.append((msg.id, delivery_msg))
+        
+        marked = await self._financial_threads.mark_messages_delivered(
+            [message_id for message_id, _ in rendered]
+        )
+        
+        responses = []
+        for message_id, delivery_msg in rendered:
+            if message_id not in marked:
+                continue
+            responses.append(delivery_msg)
+            logger.info(
+                "orchestrator:financial_thread:response_delivered",
+                extra={
+                    "thread_id": thread.id,
+                    "message_id": message_id,
+                    "sender_id": thread.sender_id,
+                },
+            )
+        return responses
+
     async def _deliver_financial_thread_responses(
         self,
         sender_id: str,
@@ -2278,25 +2318,12 @@ You: "هنوز نه، چیکاره‌ای؟" [if empty]"""
             if not undelivered:
                 return None
             
-            responses = []
-            for msg in undelivered:
-                delivery_msg = await self._financial_detector.generate_delivery_message(
-                    creator_response=msg.message,
-                    topic_summary=active_thread.topic_summary,
-                    creator_name=twin_name,
-                    language=language,
-                )
-                responses.append(delivery_msg)
-                await self._financial_threads.mark_message_delivered(msg.id)
-                
-                logger.info(
-                    "orchestrator:financial_thread:response_delivered",
-                    extra={
-                        "thread_id": active_thread.id,
-                        "message_id": msg.id,
-                        "sender_id": sender_id,
-                    },
-                )
+            responses = await self._render_financial_deliveries(
+                thread=active_thread,
+                undelivered=undelivered,
+                twin_name=twin_name,
+                language=language,
+            )
             
             if responses:
                 return "\n\n".join(responses)
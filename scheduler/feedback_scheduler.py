@@ -3,19 +3,16 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
 
-from config.settings import Settings
-from service.relationship_feedback_service import (
-    RelationshipFeedbackService,
-    MAX_QUESTIONS_PER_DAY,
+from config.settings import Settings, get_settings
+from db.passive_archive_storage import (
+    PassiveArchiveStorage,
 )
 from db.postgres_relationship_cluster_personas import (
     RelationshipClusterPersonas,
 )
-from db.passive_archive_storage import (
-    PassiveArchiveStorage,
+from service.relationship_feedback_service import (
+    RelationshipFeedbackService,
 )
 
 logger = logging.getLogger(__name__)
@@ -32,14 +29,14 @@ class FeedbackScheduler:
         feedback_service: RelationshipFeedbackService,
         relationship_cluster: RelationshipClusterPersonas,
         archive_storage: PassiveArchiveStorage,
-        settings: Optional[Settings] = None,
+        settings: Settings | None = None,
     ) -> None:
         self._feedback = feedback_service
         self._rel_cluster = relationship_cluster
         self._archive = archive_storage
-        self._settings = settings or Settings()
+        self._settings = settings or get_settings()
         self._running = False
-        self._task: Optional[asyncio.Task] = None
+        self._task: asyncio.Task | None = None
         
         self._interval = getattr(
             self._settings, 
@@ -90,7 +87,7 @@ class FeedbackScheduler:
             except Exception as e:
                 logger.error(f"feedback_scheduler:scheduled_run:error:{e}", exc_info=True)
 
-    async def run_once(self) -> Dict[str, int]:
+    async def run_once(self) -> dict[str, int]:
         stats = {
             "questions_created": 0,
             "questions_retried": 0,
@@ -131,7 +128,7 @@ class FeedbackScheduler:
         logger.info(f"feedback_scheduler:run_once:done:{stats}")
         return stats
 
-    async def _get_users_with_low_confidence(self) -> List[str]:
+    async def _get_users_with_low_confidence(self) -> list[str]:
         return await self._rel_cluster.get_users_with_low_confidence_members(
             threshold=self._min_confidence_threshold
         )
@@ -139,7 +136,7 @@ class FeedbackScheduler:
     async def _process_user(
         self,
         user_id: str,
-        stats: Dict[str, int],
+        stats: dict[str, int],
     ) -> None:
         
         if not await self._feedback.can_ask_today(user_id):
@@ -189,7 +186,7 @@ class FeedbackScheduler:
         self,
         user_a: str,
         user_b: str,
-    ) -> tuple[str, List[str]]:
+    ) -> tuple[str, list[str]]:
         messages = await self._archive.get_messages_for_pair(user_a, user_b, limit=50)
         
         if not messages:
@@ -208,7 +205,7 @@ class FeedbackScheduler:
         
         return summary, sample_messages
 
-    async def _retry_pending_questions(self, stats: Dict[str, int]) -> None:
+    async def _retry_pending_questions(self, stats: dict[str, int]) -> None:
         questions = await self._feedback.get_questions_needing_retry(limit=20)
         
         for question in questions:
@@ -230,9 +227,7 @@ class FeedbackScheduler:
 
 
 async def run_feedback_scheduler_standalone() -> None:
-    from config.settings import Settings
-    
-    settings = Settings()
+    settings = get_settings()
     
     feedback = RelationshipFeedbackService(dsn=settings.postgres_url)
     rel_cluster = RelationshipClusterPersonas(dsn=settings.postgres_url)
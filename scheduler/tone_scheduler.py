@@ -3,16 +3,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import traceback
-from collections import defaultdict
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any
 
 from config.settings import Settings
+from db.passive_archive_storage import PassiveArchiveStorage, PassivePairCounter
 from db.passive_storage import PassiveStorage
 from db.postgres_dyadic_overrides import DyadicOverrides, ToneMetrics
 from db.postgres_relationship_cluster_personas import RelationshipClusterPersonas
-from db.passive_archive_storage import PassiveArchiveStorage, PassivePairCounter
 from db.tone_retry_storage import ToneRetryStorage
 from tone_and_personality_traits_detection.tone_detection_agent import ToneDetectionAgent
 
@@ -35,7 +32,7 @@ class ToneScheduler:
         pair_counter: PassivePairCounter,
         tone_agent: ToneDetectionAgent,
         retry_storage: ToneRetryStorage,
-        interval_seconds: Optional[int] = None,
+        interval_seconds: int | None = None,
     ) -> None:
         self._settings = settings
         self._passive = passive_storage
@@ -57,7 +54,9 @@ class ToneScheduler:
             settings, "TONE_SCHEDULER_BATCH_SIZE", self.DEFAULT_BATCH_SIZE
         )
         
-        self._task: Optional[asyncio.Task] = None
+        self._pending_pair_counts: list[tuple[str, str, int]] = []
+        
+        self._task: asyncio.Task | None = None
         self._running = False
 
     async def start(self) -> None:
@@ -104,7 +103,7 @@ class ToneScheduler:
             except Exception as e:
                 logger.error(f"tone_scheduler:scheduled_run:error:{e}", exc_info=True)
 
-    async def process_passive_batch(self) -> Dict[str, Any]:
+    async def process_passive_batch(self) -> dict[str, Any]:
         logger.info("tone_scheduler:process_batch:start")
         stats = {
             "conversations_processed": 0,
@@ -164,9 +163,9 @@ class ToneScheduler:
 
     async def _process_batch(
         self,
-        conv_ids: List[str],
-        all_conversations: Dict[str, Dict[str, Any]],
-        stats: Dict[str, int],
+        conv_ids: list[str],
+        all_conversations: dict[str, dict[str, Any]],
+        stats: dict[str, int],
     ) -> None:
         for conv_id in conv_ids:
             conv_data = all_conversations[conv_id]
@@ -191,11 +190,26 @@ class ToneScheduler:
                     logger.error(f"tone_scheduler:retry_enqueue_failed:{conv_id}:{retry_err}")
                 stats["conversations_failed"] += 1
                 stats["errors"] += 1
+        
+        await self._flush_pair_counts()
+
+    async def _flush_pair_counts(self) -> None:
+        if not self._pending_pair_counts:
+            return
+        
+        pending, self._pending_pair_counts = self._pending_pair_counts, []
+        try:
+            await self._pair_counter.increment_many(pending)
+        except Exception as e:
+            # Put the counts back in front so the next flush retries them;
+            # the conversations were already deleted from passive storage.
+            self._pending_pair_counts = pending + self._pending_pair_counts
+            logger.error(f"tone_scheduler:pair_counter_flush_failed:{len(pending)} pairs:{e}")
 
     def _group_by_conversation(
-        self, messages: List[Dict[str, Any]]
-    ) -> Dict[str, Dict[str, Any]]:
-        grouped: Dict[str, Dict[str, Any]] = {}
+        self, messages: list[dict[str, Any]]
+    ) -> dict[str, dict[str, Any]]:
+        grouped: dict[str, dict[str, Any]] = {}
         
         for msg in messages:
             conv_id = msg.get("conversation_id", "")
@@ -228,8 +242,8 @@ class ToneScheduler:
 
     async def _process_conversation(
         self,
-        conv_data: Dict[str, Any],
-        stats: Dict[str, int],
+        conv_data: dict[str, Any],
+        stats: dict[str, int],
     ) -> bool:
         conv_id = conv_data["conversation_id"]
         users = conv_data["users"]
@@ -301,14 +315,14 @@ class ToneScheduler:
         archived_count = await self._archive.archive_messages(enriched_messages)
         stats["messages_archived"] += archived_count
         
-        await self._pair_counter.increment(user_a, user_b, len(messages))
+        self._pending_pair_counts.append((user_a, user_b, archived_count))
         
         return True
 
     async def _archive_without_analysis(
         self,
-        conv_data: Dict[str, Any],
-        stats: Dict[str, int],
+        conv_data: dict[str, Any],
+        stats: dict[str, int],
     ) -> bool:
         messages = conv_data["messages"]
         
@@ -325,7 +339,7 @@ class ToneScheduler:
 
     async def _send_to_retry(
         self,
-        conv_data: Dict[str, Any],
+        conv_data: dict[str, Any],
         error: str | None = None,
     ) -> None:
         users = list(conv_data["users"])
@@ -345,8 +359,8 @@ class ToneScheduler:
             f"messages={len(conv_data['messages'])}"
         )
 
-    async def _delete_from_passive(self, messages: List[Dict[str, Any]]) -> None:
-        ids: List[int] = []
+    async def _delete_from_passive(self, messages: list[dict[str, Any]]) -> None:
+        ids: list[int] = []
         for msg in messages:
             msg_id = msg.get("id")
             if msg_id is not None and isinstance(msg_id, int):
@@ -409,7 +423,7 @@ class ToneScheduler:
             message_count=total_weight,
         )
 
-    async def _process_dyadic_calculations(self, stats: Dict[str, int]) -> None:
+    async def _process_dyadic_calculations(self, stats: dict[str, int]) -> None:
         pairs = await self._pair_counter.get_pairs_needing_dyadic()
         
         for pair in pairs:
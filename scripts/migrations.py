@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-import sys
-import logging
 import argparse
+import logging
+import sys
 from pathlib import Path
-from datetime import datetime
-from typing import List, Tuple, Callable
+
 import psycopg2
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -14,7 +13,7 @@ from config.settings import Settings
 logger = logging.getLogger(__name__)
 
 
-MIGRATIONS: List[Tuple[int, str, str]] = [
+MIGRATIONS: list[tuple[int, str, str]] = [
     (1, "Create schema_migrations table", """
         CREATE TABLE IF NOT EXISTS schema_migrations (
             version INTEGER PRIMARY KEY,
@@ -689,10 +688,262 @@ MIGRATIONS: List[Tuple[int, str, str]] = [
         CREATE INDEX IF NOT EXISTS idx_chat_events_input_type 
             ON chat_events(input_type);
             
-        CREATE INDEX IF NOT EXISTS idx_creator_chat_input_type 
+        CREATE INDEX IF NOT EXISTS idx_creator_chat_input_type
             ON creator_chat_events(input_type);
     """),
-    
+
+    (34, "Make creator_chat_events UNLOGGED", """
+        -- تاریخچه هر کاربر به ۴۰ پیام محدود است و مدام حذف می‌شود؛
+        -- نوشتن WAL برای این داده‌ی موقت لازم نیست (در صورت crash جدول خالی می‌شود)
+        ALTER TABLE creator_chat_events SET UNLOGGED;
+    """),
+
+    (35, "Add live pair/time indexes to passive_archive", """
+        -- در v37 ادغام شد: ایندکس جزئی idx_passive_archive_pair_id_time_live روی pair_id
+        -- جای هر دو ایندکس جهت‌دار را می‌گیرد، پس ساختن و بلافاصله حذف آن‌ها لازم نیست.
+        -- نسخه برای پایگاه‌هایی که v35 را قبلاً اجرا کرده‌اند حفظ شده است.
+        SELECT 1;
+    """),
+
+    (36, "Add dyadic backlog index to passive_pair_counter", """
+        -- ایندکس عبارتی برای get_pairs_needing_dyadic (آستانه به صورت پارامتر ارسال می‌شود،
+        -- پس ایندکس جزئی با عدد ثابت قابل استفاده نیست)
+        CREATE INDEX IF NOT EXISTS idx_pair_counter_dyadic_backlog 
+            ON passive_pair_counter ((total_archived_count - last_dyadic_calc_at_count) DESC);
+        
+        -- کوئری‌های جفت از v37 روی ایندکس pair_id اجرا می‌شوند
+        DROP INDEX IF EXISTS idx_passive_archive_deleted;
+    """),
+
+    (37, "Add generated pair_id column to passive_archive", """
+        -- pair_id دقیقاً مثل compute_pair_id در پایتون محاسبه می‌شود:
+        -- فقط همان شش کاراکتر فاصله‌ی ASCII (PAIR_ID_STRIP_CHARS) حذف می‌شود،
+        -- sha256 روی "lo::hi" (مرتب‌سازی بایتی با collation "C")، ۱۶ کاراکتر اول hex.
+        -- sha256() داخلی PG11+ است و به pgcrypto نیازی ندارد. convert_to فقط
+        -- STABLE است، پس داخل تابع IMMUTABLE قرار می‌گیرد (encoding پایگاه ثابت است).
+        CREATE OR REPLACE FUNCTION passive_pair_id(a TEXT, b TEXT) RETURNS TEXT
+        LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+            SELECT substr(encode(sha256(convert_to(
+                least(x COLLATE "C", y COLLATE "C") || '::' || greatest(x COLLATE "C", y COLLATE "C"),
+                'UTF8')), 'hex'), 1, 16)
+            FROM (SELECT btrim(a, E' \\t\\n\\r\\x0B\\f') AS x,
+                         btrim(b, E' \\t\\n\\r\\x0B\\f') AS y) AS t
+        $$;
+        
+        ALTER TABLE passive_archive 
+        ADD COLUMN IF NOT EXISTS pair_id TEXT GENERATED ALWAYS AS (
+            passive_pair_id(user_id, to_user_id)
+        ) STORED;
+        
+        CREATE INDEX IF NOT EXISTS idx_passive_archive_pair_id_time_live 
+            ON passive_archive (pair_id, timestamp_iso)
+            WHERE deleted = FALSE;
+        
+        -- کوئری‌ها اکنون روی pair_id هستند؛ ایندکس‌های جهت‌دار v35 (فقط در پایگاه‌هایی
+        -- که نسخه‌ی قدیمی v35 را اجرا کرده‌اند) دیگر استفاده نمی‌شوند
+        DROP INDEX IF EXISTS idx_passive_archive_pair_time_live;
+        DROP INDEX IF EXISTS idx_passive_archive_pair_time_live_rev;
+        DROP INDEX IF EXISTS idx_passive_archive_pair_deleted;
+    """),
+
+    (38, "Track soft-deleted archive rows in passive_pair_counter", """
+        -- شمارش پیام‌های حذف‌شده تا count_messages_for_pair بدون COUNT(*) روی آرشیو کار کند
+        ALTER TABLE passive_pair_counter 
+        ADD COLUMN IF NOT EXISTS deleted_count INTEGER NOT NULL DEFAULT 0;
+        
+        UPDATE passive_pair_counter p
+        SET deleted_count = d.n
+        FROM (
+            SELECT pair_id, COUNT(*) AS n
+            FROM passive_archive
+            WHERE deleted = TRUE
+            GROUP BY pair_id
+        ) d
+        WHERE p.pair_id = d.pair_id;
+    """),
+
+    (39, "Add live (user_id, conversation_id) index to passive_observation", """
+        -- ایندکس جزئی برای PassiveStorage.counts تا شمارش با index-only scan انجام شود
+        CREATE INDEX IF NOT EXISTS idx_passive_obs_user_conv_live 
+            ON passive_observation (user_id, conversation_id)
+            WHERE deleted = 'false';
+    """),
+
+    (40, "Tune passive summarization queue indexes", """
+        -- صفحه‌بندی get_failed بر اساس (tenant_id, failed_at DESC, id DESC)؛
+        -- ایندکس قبلی tenant پیشوند همین ایندکس است
+        CREATE INDEX IF NOT EXISTS idx_passive_summ_failed_tenant_failed_at 
+            ON passive_summarization_failed(tenant_id, failed_at DESC, id DESC);
+        DROP INDEX IF EXISTS idx_passive_summ_failed_tenant;
+        
+        -- هیچ کوئری‌ای صف retry را بر اساس pair_id نمی‌خواند
+        DROP INDEX IF EXISTS idx_passive_summ_retry_pair;
+    """),
+
+    (41, "Make passive_summarization_retry_queue unlogged", """
+        -- صف retry موقتی است و WAL نمی‌خواهد؛ بعد از crash جدول خالی می‌شود
+        -- و در بدترین حالت خلاصه‌سازی دوباره اجرا می‌شود.
+        -- passive_summarization_failed به‌عنوان سابقه logged می‌ماند.
+        ALTER TABLE passive_summarization_retry_queue SET UNLOGGED;
+    """),
+
+    (42, "Store passive summarization message_ids as packed bytea", """
+        -- message_ids به‌صورت int64های big-endian پشت‌سرهم (همان خروجی int8send)
+        -- ذخیره می‌شود؛ کوچک‌تر از BIGINT[] و decode آن در Python ارزان‌تر است.
+        -- USING اجازه‌ی subquery نمی‌دهد، پس تبدیل در یک تابع موقت انجام می‌شود.
+        CREATE FUNCTION pg_temp.passive_ids_to_bytea(ids BIGINT[]) RETURNS BYTEA
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT COALESCE(string_agg(int8send(m), ''::bytea ORDER BY ord), ''::bytea)
+            FROM unnest(ids) WITH ORDINALITY AS u(m, ord)
+        $$;
+        
+        ALTER TABLE passive_summarization_retry_queue ALTER COLUMN message_ids DROP DEFAULT;
+        ALTER TABLE passive_summarization_retry_queue
+            ALTER COLUMN message_ids TYPE BYTEA USING pg_temp.passive_ids_to_bytea(message_ids);
+        ALTER TABLE passive_summarization_retry_queue
+            ALTER COLUMN message_ids SET DEFAULT ''::bytea;
+        
+        ALTER TABLE passive_summarization_failed ALTER COLUMN message_ids DROP DEFAULT;
+        ALTER TABLE passive_summarization_failed
+            ALTER COLUMN message_ids TYPE BYTEA USING pg_temp.passive_ids_to_bytea(message_ids);
+        ALTER TABLE passive_summarization_failed
+            ALTER COLUMN message_ids SET DEFAULT ''::bytea;
+    """),
+
+    (43, "Partial open-status indexes for financial_threads", """
+        -- همه‌ی کوئری‌های داغ فقط status = 'open' را می‌خوانند؛ ایندکس‌های جزئی
+        -- با رشد thread های resolved/expired بزرگ نمی‌شوند.
+        CREATE INDEX IF NOT EXISTS idx_fin_threads_open_sender_creator 
+            ON financial_threads(sender_id, creator_id, created_at DESC)
+            WHERE status = 'open';
+        CREATE INDEX IF NOT EXISTS idx_fin_threads_open_creator 
+            ON financial_threads(creator_id, last_activity_at DESC)
+            WHERE status = 'open';
+        CREATE INDEX IF NOT EXISTS idx_fin_threads_open_activity 
+            ON financial_threads(last_activity_at)
+            WHERE status = 'open';
+        
+        -- جایگزین شده با ایندکس‌های جزئی بالا
+        DROP INDEX IF EXISTS idx_fin_threads_sender_creator_status;
+        DROP INDEX IF EXISTS idx_fin_threads_status_activity;
+    """),
+
+    (44, "Cover active financial thread lookups with id", """
+        -- get_active_thread_id فقط id را می‌خواند؛ با INCLUDE (id) کوئری
+        -- index-only می‌شود. ستون‌های متنی عمداً بیرون می‌مانند چون طولشان
+        -- محدود نیست و از سقف اندازه‌ی سطر btree رد می‌شوند.
+        DROP INDEX IF EXISTS idx_fin_threads_open_sender_creator;
+        CREATE INDEX idx_fin_threads_open_sender_creator 
+            ON financial_threads(sender_id, creator_id, created_at DESC)
+            INCLUDE (id)
+            WHERE status = 'open';
+        
+        -- visibility map تازه بماند تا index-only scan به heap برنگردد
+        ALTER TABLE financial_threads SET (autovacuum_vacuum_scale_factor = 0.02);
+    """),
+
+    (45, "Read last financial thread messages from financial_thread_messages", """
+        -- هر پیام در financial_thread_messages هم ذخیره می‌شود، پس نسخه‌ی تکراری
+        -- متن در سطر thread لازم نیست و add_message فقط وضعیت نوبت را به‌روز می‌کند.
+        CREATE INDEX IF NOT EXISTS idx_fin_thread_msgs_thread_author_created 
+            ON financial_thread_messages(thread_id, author_type, created_at DESC);
+        
+        ALTER TABLE financial_threads DROP COLUMN IF EXISTS last_sender_message;
+        ALTER TABLE financial_threads DROP COLUMN IF EXISTS last_creator_response;
+    """),
+
+    (46, "Notify on new financial thread messages", """
+        -- به‌جای polling، شنونده‌ها روی کانال fin_msg_<thread_id> منتظر id پیام می‌مانند
+        CREATE OR REPLACE FUNCTION notify_new_fin_msg() RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM pg_notify('fin_msg_' || NEW.thread_id, NEW.id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        
+        DROP TRIGGER IF EXISTS trg_fin_thread_msgs_notify ON financial_thread_messages;
+        CREATE TRIGGER trg_fin_thread_msgs_notify
+            AFTER INSERT ON financial_thread_messages
+            FOR EACH ROW EXECUTE FUNCTION notify_new_fin_msg();
+    """),
+
+    (47, "Store financial thread status and waiting_for as enums", """
+        -- enum چهار بایت است و مقایسه‌ی آن مقایسه‌ی OID است، نه متن
+        DO $$
+        BEGIN
+            CREATE TYPE fin_thread_status AS ENUM ('open', 'resolved', 'expired');
+        EXCEPTION WHEN duplicate_object THEN NULL;
+        END;
+        $$;
+        
+        DO $$
+        BEGIN
+            CREATE TYPE fin_waiting_for AS ENUM ('creator', 'sender');
+        EXCEPTION WHEN duplicate_object THEN NULL;
+        END;
+        $$;
+        
+        -- شرط ایندکس‌های جزئی روی varchar نوشته شده و بعد از تغییر نوع دیگر با
+        -- status = 'open' کوئری‌ها match نمی‌شود؛ پس حذف و دوباره ساخته می‌شوند.
+        DROP INDEX IF EXISTS idx_fin_threads_open_sender_creator;
+        DROP INDEX IF EXISTS idx_fin_threads_open_creator;
+        DROP INDEX IF EXISTS idx_fin_threads_open_activity;
+        
+        ALTER TABLE financial_threads
+            ALTER COLUMN status DROP DEFAULT,
+            ALTER COLUMN waiting_for DROP DEFAULT;
+        ALTER TABLE financial_threads
+            ALTER COLUMN status TYPE fin_thread_status USING status::fin_thread_status,
+            ALTER COLUMN waiting_for TYPE fin_waiting_for USING waiting_for::fin_waiting_for;
+        ALTER TABLE financial_threads
+            ALTER COLUMN status SET DEFAULT 'open',
+            ALTER COLUMN waiting_for SET DEFAULT 'creator';
+        
+        CREATE INDEX idx_fin_threads_open_sender_creator 
+            ON financial_threads(sender_id, creator_id, created_at DESC)
+            INCLUDE (id)
+            WHERE status = 'open';
+        CREATE INDEX idx_fin_threads_open_creator 
+            ON financial_threads(creator_id, last_activity_at DESC)
+            WHERE status = 'open';
+        CREATE INDEX idx_fin_threads_open_activity 
+            ON financial_threads(last_activity_at)
+            WHERE status = 'open';
+    """),
+
+    (48, "Partial status indexes for future_requests", """
+        -- کوئری‌های داغ فقط pending را برای گیرنده و answered را برای جفت
+        -- فرستنده/گیرنده می‌خوانند؛ ستون آخر ایندکس ORDER BY را بدون sort می‌دهد.
+        CREATE INDEX IF NOT EXISTS idx_fr_pending_recipient
+            ON future_requests(recipient_id, created_at DESC)
+            WHERE status = 'pending';
+        CREATE INDEX IF NOT EXISTS idx_fr_answered_sr
+            ON future_requests(sender_id, recipient_id, responded_at ASC)
+            WHERE status = 'answered';
+        
+        -- جایگزین شده با idx_fr_pending_recipient؛ idx_future_requests_sender_status
+        -- برای get_requests_by_sender که روی همه‌ی status ها فیلتر می‌کند می‌ماند.
+        DROP INDEX IF EXISTS idx_future_requests_recipient_status;
+    """),
+
+    (49, "Cover pending future request list columns", """
+        -- لیست pending بدون ستون‌های TEXT کاملاً از ایندکس خوانده می‌شود
+        -- (index-only scan). original_message و detected_plan عمداً بیرون می‌مانند
+        -- چون طولشان محدود نیست و از سقف اندازه‌ی سطر btree رد می‌شوند.
+        DROP INDEX IF EXISTS idx_fr_pending_recipient;
+        CREATE INDEX idx_fr_pending_recipient
+            ON future_requests(recipient_id, created_at DESC)
+            INCLUDE (id, sender_id, conversation_id, detected_datetime, updated_at)
+            WHERE status = 'pending';
+    """),
+
+    (50, "Drop passive_pair_counter.deleted_count", """
+        -- count_messages_for_pair دوباره سطرهای زنده را مستقیماً از ایندکس جزئی
+        -- idx_passive_archive_pair_id_time_live می‌شمارد؛ total_archived_count برای
+        -- جفت‌های قدیمی و پس از ری‌استارت ToneScheduler دقیق نیست.
+        ALTER TABLE passive_pair_counter DROP COLUMN IF EXISTS deleted_count;
+    """),
+
 ]
 
 
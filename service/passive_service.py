@@ -1,16 +1,16 @@
 
 from __future__ import annotations
 
-import logging
 import json
+import logging
 from datetime import datetime
-from typing import Any, Optional, TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
 from sqlalchemy import text
 
-from config.settings import Settings
-from db.postgres import create_async_engine, create_async_session_factory, get_async_session
+from config.settings import Settings, get_settings
+from db.postgres import create_async_session_factory, get_async_engine, get_async_session, warm_pool
 
 if TYPE_CHECKING:
     from service.voice import VoiceProcessor
@@ -24,11 +24,12 @@ class PassiveService:
         self,
         passive_memory: Any,
         settings: Settings | None = None,
-        voice_processor: Optional["VoiceProcessor"] = None,
+        voice_processor: VoiceProcessor | None = None,
     ):
         self._passive = passive_memory
-        self._settings = settings or Settings()
+        self._settings = settings or get_settings()
         self._session_factory = None
+        self._engine = None
         self._voice = voice_processor
 
     def _get_session_factory(self):
@@ -36,10 +37,25 @@ class PassiveService:
             dsn = (self._settings.POSTGRES_DSN or self._settings.postgres_url).strip()
             if dsn.startswith("postgresql://") and "+asyncpg" not in dsn:
                 dsn = dsn.replace("postgresql://", "postgresql+asyncpg://", 1)
-            engine = create_async_engine(dsn)
-            self._session_factory = create_async_session_factory(engine)
+            self._engine = get_async_engine(
+                dsn,
+                pool_size=self._settings.PG_POOL_SIZE,
+                max_overflow=self._settings.PG_MAX_OVERFLOW,
+                statement_cache_size=self._settings.PG_STATEMENT_CACHE_SIZE,
+            )
+            self._session_factory = create_async_session_factory(self._engine)
         return self._session_factory
 
+    async def warm_up(self) -> None:
+        # Called once at startup so the first passive batches find pool_size
+        # connections already open.
+        self._get_session_factory()
+        await warm_pool(self._engine, self._settings.PG_POOL_SIZE)
+        logger.info(
+            "passive_service:warm_up:complete",
+            extra={"connections": self._settings.PG_POOL_SIZE},
+        )
+
     async def record_observations(
         self,
         items: list[dict],
@@ -5,7 +5,7 @@ import hashlib
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Tuple, TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import asyncpg
 
@@ -30,7 +30,7 @@ MAX_RETRIES = DEFAULT_MAX_RETRIES
 
 def compute_pair_id(user_a: str, user_b: str) -> str:
     lo, hi = sorted([(user_a or "").strip(), (user_b or "").strip()])
-    digest = hashlib.sha256(f"{lo}::{hi}".encode("utf-8")).hexdigest()
+    digest = hashlib.sha256(f"{lo}::{hi}".encode()).hexdigest()
     return digest[:16]
 
 
@@ -41,15 +41,15 @@ class FeedbackQuestion:
     about_user_id: str
     pair_id: str
     conversation_summary: str
-    sample_messages: List[str]
+    sample_messages: list[str]
     status: str
     question_text: str
-    answer_relationship_class: Optional[str]
-    answer_text: Optional[str]
-    answered_at: Optional[datetime]
+    answer_relationship_class: str | None
+    answer_text: str | None
+    answered_at: datetime | None
     sent_count: int
     last_sent_at: datetime
-    next_retry_at: Optional[datetime]
+    next_retry_at: datetime | None
     never_ask_again: bool
     created_at: datetime
     updated_at: datetime
@@ -86,9 +86,9 @@ class RelationshipFeedbackService:
 
 با تشکر از همکاری شما! 🙏"""
 
-    def __init__(self, dsn: str, settings: Optional["Settings"] = None) -> None:
+    def __init__(self, dsn: str, settings: Settings | None = None) -> None:
         self._dsn = dsn
-        self._pool: Optional[asyncpg.Pool] = None
+        self._pool: asyncpg.Pool | None = None
         
         if settings:
             self._max_questions_per_window = getattr(
@@ -212,8 +212,8 @@ class RelationshipFeedbackService:
         asking_user_id: str,
         about_user_id: str,
         conversation_summary: str,
-        sample_messages: Optional[List[str]] = None,
-    ) -> Optional[FeedbackQuestion]:
+        sample_messages: list[str] | None = None,
+    ) -> FeedbackQuestion | None:
         if not await self.can_ask_today(asking_user_id):
             logger.info(f"feedback:create:daily_limit_reached:{asking_user_id}")
             return None
@@ -285,7 +285,7 @@ class RelationshipFeedbackService:
         self,
         user_id: str,
         include_unread_only: bool = False,
-    ) -> List[FeedbackQuestion]:
+    ) -> list[FeedbackQuestion]:
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
@@ -301,7 +301,7 @@ class RelationshipFeedbackService:
         
         return [self._row_to_question(row) for row in rows]
 
-    async def get_question_by_id(self, question_id: int) -> Optional[FeedbackQuestion]:
+    async def get_question_by_id(self, question_id: int) -> FeedbackQuestion | None:
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
@@ -338,8 +338,8 @@ class RelationshipFeedbackService:
         self,
         question_id: int,
         relationship_class: str,
-        answer_text: Optional[str] = None,
-    ) -> Tuple[bool, str]:
+        answer_text: str | None = None,
+    ) -> tuple[bool, str]:
         relationship_class = relationship_class.lower().strip()
         if relationship_class not in VALID_RELATIONSHIP_CLASSES:
             return False, f"کلاس رابطه نامعتبر: {relationship_class}"
@@ -453,7 +453,7 @@ class RelationshipFeedbackService:
         
         return True, "رابطه با موفقیت ثبت شد! 🎉"
 
-    async def skip_question(self, question_id: int) -> Tuple[bool, str]:
+    async def skip_question(self, question_id: int) -> tuple[bool, str]:
         question = await self.get_question_by_id(question_id)
         if not question:
             return False, "سوال یافت نشد"
@@ -477,7 +477,7 @@ class RelationshipFeedbackService:
         return True, "سوال رد شد و دیگر پرسیده نمی‌شود"
 
 
-    async def get_questions_needing_retry(self, limit: int = 50) -> List[FeedbackQuestion]:
+    async def get_questions_needing_retry(self, limit: int = 50) -> list[FeedbackQuestion]:
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
@@ -589,7 +589,7 @@ class RelationshipFeedbackService:
         self,
         user_id: str,
         related_user_id: str,
-    ) -> Optional[ConfirmedRelationship]:
+    ) -> ConfirmedRelationship | None:
         pool = await self._require_pool()
         
         async with pool.acquire() as conn:
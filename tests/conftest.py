@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
 
 
 @pytest.fixture
@@ -77,3 +78,36 @@ def mock_orchestrator():
     orch.handle_chat = AsyncMock(return_value=result)
     orch.handle_creator = AsyncMock(return_value=result)
     return orch
+
+
+@pytest.fixture
+def mock_conn():
+    """Return an asyncpg connection mock whose transaction() is an async context manager."""
+    conn = AsyncMock()
+    conn.transaction = MagicMock()
+    conn.transaction.return_value.__aenter__ = AsyncMock(return_value=None)
+    conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+    return conn
+
+
+@pytest.fixture
+def mock_pool(mock_conn):
+    """Return an asyncpg pool mock whose acquire() yields mock_conn."""
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return pool
+
+
+@pytest.fixture
+def make_store(mock_pool):
+    """Return a factory that builds a store whose pool accessor yields mock_pool."""
+
+    def _make(store_cls, **kwargs):
+        store = store_cls(dsn="postgresql://test", **kwargs)
+        # Stores expose either _require_pool or _get_pool; stub whichever exists.
+        attr = "_require_pool" if hasattr(store, "_require_pool") else "_get_pool"
+        setattr(store, attr, AsyncMock(return_value=mock_pool))
+        return store
+
+    return _make
@@ -0,0 +1,82 @@
+"""Unit tests for db/creator_chat_store.py."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from db import creator_chat_store
+from db.creator_chat_store import CreatorChatStore
+
+
+class TestLastAiMessageCache:
+
+    @pytest.mark.asyncio
+    async def test_log_ai_message_serves_next_read_from_cache(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=7)
+        store = make_store(CreatorChatStore)
+
+        await store.log_message(user_id="u1", text="What is your job?", role="ai")
+        result = await store.get_last_ai_message(user_id="u1")
+
+        assert result == "What is your job?"
+        mock_conn.fetchrow.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_human_message_does_not_touch_cache(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=1)
+        mock_conn.fetchrow = AsyncMock(return_value={"text": "from db"})
+        store = make_store(CreatorChatStore)
+
+        await store.log_message(user_id="u1", text="hello", role="human")
+        result = await store.get_last_ai_message(user_id="u1")
+
+        assert result == "from db"
+        mock_conn.fetchrow.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_miss_populates_cache(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value={"text": "from db"})
+        store = make_store(CreatorChatStore)
+
+        assert await store.get_last_ai_message(user_id="u1") == "from db"
+        assert await store.get_last_ai_message(user_id="u1") == "from db"
+        mock_conn.fetchrow.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_clear_history_invalidates(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=1)
+        mock_conn.execute = AsyncMock(return_value="DELETE 2")
+        mock_conn.fetchrow = AsyncMock(return_value=None)
+        store = make_store(CreatorChatStore)
+
+        await store.log_message(user_id="u1", text="q", role="ai")
+        await store.clear_history(user_id="u1")
+
+        assert await store.get_last_ai_message(user_id="u1") is None
+
+    @pytest.mark.asyncio
+    async def test_clear_history_drops_entry_cached_during_delete(self, mock_conn, make_store):
+        store = make_store(CreatorChatStore)
+
+        async def delete(sql, user_id):
+            store._remember_last_ai(user_id, "stale")
+            return "DELETE 1"
+
+        mock_conn.execute = AsyncMock(side_effect=delete)
+
+        await store.clear_history(user_id="u1")
+
+        assert "u1" not in store._last_ai_cache
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, monkeypatch, mock_conn, make_store):
+        monkeypatch.setattr(creator_chat_store, "LAST_AI_CACHE_MAX_USERS", 2)
+        mock_conn.fetchval = AsyncMock(return_value=1)
+        store = make_store(CreatorChatStore)
+
+        for user_id in ("u1", "u2", "u3"):
+            await store.log_message(user_id=user_id, text="q", role="ai")
+
+        assert list(store._last_ai_cache) == ["u2", "u3"]
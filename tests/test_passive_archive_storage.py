@@ -0,0 +1,250 @@
+"""Unit tests for db/passive_archive_storage.py."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from db import passive_archive_storage
+from db.passive_archive_storage import (
+    COPY_MIN_ROWS,
+    PassiveArchiveStorage,
+    PassivePairCounter,
+    archive_pair_id,
+    clear_pair_caches,
+    compute_pair_id,
+    sort_user_pair,
+)
+
+
+class TestPairHelpers:
+
+    def setup_method(self):
+        clear_pair_caches()
+
+    def test_pair_id_is_order_independent(self):
+        assert compute_pair_id("alice", "bob") == compute_pair_id("bob", "alice")
+        assert compute_pair_id(" alice", "bob ") == compute_pair_id("alice", "bob")
+
+    def test_pair_id_matches_other_stores(self):
+        from db.postgres_chat_store import compute_pair_id as chat_pair_id
+        from service.relationship_feedback_service import compute_pair_id as feedback_pair_id
+
+        for a, b in [("alice\u00a0", "bob"), (" alice", "bob\u2028")]:
+            assert chat_pair_id(a, b) == feedback_pair_id(a, b) == compute_pair_id(a, b)
+        assert compute_pair_id("alice\u00a0", "bob") == compute_pair_id("alice", "bob")
+
+    def test_archive_pair_id_strips_only_ascii_whitespace(self):
+        assert archive_pair_id("\talice\x0b", "bob\f") == compute_pair_id("alice", "bob")
+        # Matches btrim() in the generated column, which keeps NBSP.
+        assert archive_pair_id("alice\u00a0", "bob") != compute_pair_id("alice", "bob")
+
+    def test_sort_user_pair_is_memoized(self):
+        assert sort_user_pair("b", "a") == ("a", "b")
+        assert sort_user_pair("b", "a") == ("a", "b")
+        assert sort_user_pair.cache_info().hits == 1
+
+        clear_pair_caches()
+        assert sort_user_pair.cache_info().currsize == 0
+
+
+def _messages(n):
+    return [
+        {
+            "user_id": "a",
+            "to_user_id": "b",
+            "conversation_id": "c1",
+            "message_id": f"m{i}",
+            "message": "hi",
+            "timestamp_iso": "2025-01-01T00:00:00",
+        }
+        for i in range(n)
+    ]
+
+
+class TestArchiveMessages:
+
+    @pytest.mark.asyncio
+    async def test_small_batch_uses_single_insert(self, mock_conn, make_store):
+        mock_conn.execute = AsyncMock(return_value="INSERT 0 2")
+        storage = make_store(PassiveArchiveStorage)
+
+        inserted = await storage.archive_messages(_messages(3))
+
+        assert inserted == 2
+        mock_conn.execute.assert_called_once()
+        mock_conn.copy_records_to_table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_large_batch_is_copied_through_staging(self, mock_conn, make_store):
+        mock_conn.execute = AsyncMock(side_effect=["SELECT 0", f"INSERT 0 {COPY_MIN_ROWS}"])
+        storage = make_store(PassiveArchiveStorage)
+
+        inserted = await storage.archive_messages(_messages(COPY_MIN_ROWS))
+
+        assert inserted == COPY_MIN_ROWS
+        mock_conn.copy_records_to_table.assert_called_once()
+        assert len(mock_conn.copy_records_to_table.call_args.kwargs["records"]) == COPY_MIN_ROWS
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_database(self, make_store):
+        storage = make_store(PassiveArchiveStorage)
+
+        assert await storage.archive_messages([]) == 0
+        storage._require_pool.assert_not_called()
+
+
+class TestIncrementMany:
+
+    @pytest.mark.asyncio
+    async def test_duplicate_pairs_are_merged_into_one_round_trip(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[])
+        counter = make_store(PassivePairCounter)
+
+        await counter.increment_many([("b", "a", 3), ("a", "b", 2), ("a", "c", 1)])
+
+        mock_conn.fetch.assert_called_once()
+        _, user_as, user_bs, pair_ids, counts = mock_conn.fetch.call_args.args
+        assert user_as == ["a", "a"]
+        assert user_bs == ["b", "c"]
+        assert pair_ids == [compute_pair_id("a", "b"), compute_pair_id("a", "c")]
+        assert counts == [5, 1]
+
+
+class TestIterMessagesForPair:
+
+    @pytest.mark.asyncio
+    async def test_streams_rows_through_cursor(self, mock_conn, make_store):
+        row = (1, "a", "b", "c1", "m1", "hi", "fa", "2025-01-01T00:00:00", None, False)
+
+        async def _cursor(*args, **kwargs):
+            yield row
+
+        mock_conn.cursor = MagicMock(side_effect=_cursor)
+        storage = make_store(PassiveArchiveStorage)
+
+        messages = [m async for m in storage.iter_messages_for_pair("a", "b")]
+
+        assert [m.message_id for m in messages] == ["m1"]
+        _, pair_id, limit = mock_conn.cursor.call_args.args
+        assert pair_id == compute_pair_id("a", "b")
+        assert limit is None
+
+
+class TestLockKey:
+
+    def test_lock_key_is_stable_signed_64bit(self):
+        storage = PassiveArchiveStorage(dsn="postgresql://test")
+        pair_id = compute_pair_id("a", "b")
+
+        key = storage._lock_key(pair_id, "c1")
+
+        assert key == storage._lock_key(pair_id, "c1")
+        assert key != storage._lock_key(pair_id, "c2")
+        assert -(2 ** 63) <= key < 2 ** 63
+
+
+class TestSummarizationLock:
+
+    def _storage_with_lock_conn(self, monkeypatch, results):
+        monkeypatch.setattr(passive_archive_storage, "LOCK_BACKOFF_BASE_SECONDS", 0)
+        lock_conn = AsyncMock()
+        lock_conn.is_closed = MagicMock(return_value=False)
+        lock_conn.fetchval = AsyncMock(side_effect=results)
+        storage = PassiveArchiveStorage(dsn="postgresql://test")
+        storage._lock_conn = lock_conn
+        return storage, lock_conn
+
+    @pytest.mark.asyncio
+    async def test_retries_until_lock_is_free(self, monkeypatch):
+        storage, lock_conn = self._storage_with_lock_conn(monkeypatch, [False, False, True, True])
+
+        async with storage.acquire_summarization_lock("a", "b", "c1"):
+            assert storage._held_lock_keys
+
+        assert lock_conn.fetchval.await_count == 4
+        assert "pg_advisory_unlock" in lock_conn.fetchval.call_args.args[0]
+        assert not storage._held_lock_keys
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, monkeypatch):
+        monkeypatch.setattr(passive_archive_storage, "LOCK_MAX_ATTEMPTS", 3)
+        storage, lock_conn = self._storage_with_lock_conn(monkeypatch, [False] * 3)
+
+        with pytest.raises(RuntimeError):
+            async with storage.acquire_summarization_lock("a", "b", "c1"):
+                pass
+
+        assert lock_conn.fetchval.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_same_key_is_exclusive_within_process(self, monkeypatch):
+        monkeypatch.setattr(passive_archive_storage, "LOCK_MAX_ATTEMPTS", 2)
+        storage, lock_conn = self._storage_with_lock_conn(monkeypatch, [True, True])
+
+        async with storage.acquire_summarization_lock("a", "b", "c1"):
+            with pytest.raises(RuntimeError):
+                async with storage.acquire_summarization_lock("b", "a", "c1"):
+                    pass
+
+        assert lock_conn.fetchval.await_count == 2
+
+
+class TestCountMessagesForPair:
+
+    @pytest.mark.asyncio
+    async def test_counts_live_archive_rows(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=4)
+        storage = make_store(PassiveArchiveStorage)
+
+        assert await storage.count_messages_for_pair("b", "a") == 4
+        sql, pair_id = mock_conn.fetchval.call_args.args
+        assert "FROM passive_archive" in sql and "deleted = FALSE" in sql
+        assert pair_id == compute_pair_id("a", "b")
+
+
+class TestMarkAsDeletedMany:
+
+    @pytest.mark.asyncio
+    async def test_pairs_and_ids_share_one_statement(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=7)
+        storage = make_store(PassiveArchiveStorage)
+
+        count = await storage.mark_as_deleted_many([
+            ("a", "b", None),
+            ("c", "d", [10, 11]),
+            ("b", "e", []),
+        ])
+
+        assert count == 7
+        mock_conn.fetchval.assert_called_once()
+        _, pair_ids, message_ids = mock_conn.fetchval.call_args.args
+        assert pair_ids == [compute_pair_id("a", "b"), compute_pair_id("b", "e")]
+        assert message_ids == [10, 11]
+
+
+class TestClaimForDyadic:
+
+    @pytest.mark.asyncio
+    async def test_returns_none_when_no_backlog(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value=None)
+        counter = make_store(PassivePairCounter)
+
+        assert await counter.claim_for_dyadic("a", "b") is None
+        _, pair_id, threshold = mock_conn.fetchrow.call_args.args
+        assert pair_id == compute_pair_id("a", "b")
+        assert threshold == PassivePairCounter.DYADIC_THRESHOLD
+
+
+class TestArchiveRowDefaults:
+
+    @pytest.mark.asyncio
+    async def test_partial_messages_are_filled_with_defaults(self, mock_conn, make_store):
+        mock_conn.execute = AsyncMock(return_value="INSERT 0 1")
+        storage = make_store(PassiveArchiveStorage)
+
+        await storage.archive_messages([{"user_id": "a", "message": "hi"}])
+
+        columns = mock_conn.execute.call_args.args[1:]
+        assert [c[0] for c in columns] == ["a", "", "", "", "hi", "fa", ""]
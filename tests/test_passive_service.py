@@ -0,0 +1,35 @@
+"""Unit tests for service/passive_service.py."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from service import passive_service
+from service.passive_service import PassiveService
+
+
+class TestWarmUp:
+
+    @pytest.mark.asyncio
+    async def test_warms_shared_engine_to_pool_size(self, monkeypatch):
+        engine = MagicMock()
+        get_engine = MagicMock(return_value=engine)
+        warm = AsyncMock()
+        monkeypatch.setattr(passive_service, "get_async_engine", get_engine)
+        monkeypatch.setattr(passive_service, "warm_pool", warm)
+        settings = MagicMock(
+            POSTGRES_DSN="postgresql://test",
+            PG_POOL_SIZE=7,
+            PG_MAX_OVERFLOW=3,
+            PG_STATEMENT_CACHE_SIZE=0,
+        )
+        service = PassiveService(MagicMock(), settings=settings)
+
+        await service.warm_up()
+
+        warm.assert_awaited_once_with(engine, 7)
+        dsn = get_engine.call_args.args[0]
+        assert dsn == "postgresql+asyncpg://test"
+        assert get_engine.call_args.kwargs["statement_cache_size"] == 0
@@ -0,0 +1,227 @@
+"""Unit tests for db/passive_summarization_storage.py."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from db import passive_summarization_storage
+from db.passive_summarization_storage import (
+    PassiveSummarizationStorage,
+    SummarizationRetrySpec,
+)
+
+
+class TestEnqueueRetryMany:
+
+    @pytest.mark.asyncio
+    async def test_single_round_trip_with_packed_ids(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[{"id": 4}, {"id": 5}])
+        storage = make_store(PassiveSummarizationStorage)
+
+        ids = await storage.enqueue_retry_many([
+            SummarizationRetrySpec("c1", "p1", "a", "b", [1, 2], "boom"),
+            SummarizationRetrySpec("c2", "p2", "a", "c", []),
+        ])
+
+        assert ids == [4, 5]
+        mock_conn.fetch.assert_called_once()
+        args = mock_conn.fetch.call_args.args
+        assert args[6] == [(1).to_bytes(8, "big") + (2).to_bytes(8, "big"), b""]
+        assert args[-1] == ["boom", ""]
+
+    @pytest.mark.asyncio
+    async def test_empty_input_skips_database(self, make_store):
+        storage = make_store(PassiveSummarizationStorage)
+
+        assert await storage.enqueue_retry_many([]) == []
+        storage._require_pool.assert_not_called()
+
+
+class TestUpdateRetryAttempt:
+
+    @pytest.mark.asyncio
+    async def test_missing_row_returns_false(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value={
+            "attempt": None,
+            "next_retry_at": None,
+            "moved_conversation_id": None,
+            "moved_pair_id": None,
+        })
+        storage = make_store(PassiveSummarizationStorage)
+
+        assert await storage.update_retry_attempt(retry_id=1) is False
+
+    @pytest.mark.asyncio
+    async def test_exhausted_row_reports_moved(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value={
+            "attempt": 3,
+            "next_retry_at": None,
+            "moved_conversation_id": "c1",
+            "moved_pair_id": "p1",
+        })
+        storage = make_store(PassiveSummarizationStorage, max_attempts=3, retry_delays=[1, 2])
+
+        assert await storage.update_retry_attempt(retry_id=1, last_error="x") is False
+        _, retry_id, last_error, max_attempts, delays = mock_conn.fetchrow.call_args.args
+        assert (retry_id, last_error, max_attempts, delays) == (1, "x", 3, [1, 2])
+
+    @pytest.mark.asyncio
+    async def test_bumped_row_returns_true(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value={
+            "attempt": 1,
+            "next_retry_at": datetime.now(timezone.utc),
+            "moved_conversation_id": None,
+            "moved_pair_id": None,
+        })
+        storage = make_store(PassiveSummarizationStorage)
+
+        assert await storage.update_retry_attempt(retry_id=1) is True
+
+
+class TestGetStats:
+
+    @pytest.mark.asyncio
+    async def test_single_round_trip(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value={
+            "retry_total": 5,
+            "retry_pending": 2,
+            "failed_total": None,
+        })
+        storage = make_store(PassiveSummarizationStorage)
+
+        stats = await storage.get_stats()
+
+        assert stats == {"retry_total": 5, "retry_pending": 2, "failed_total": 0}
+        mock_conn.fetchrow.assert_called_once()
+        mock_conn.fetchval.assert_not_called()
+
+
+class TestIterFailed:
+
+    @pytest.mark.asyncio
+    async def test_get_failed_materializes_cursor(self, mock_conn, make_store):
+        packed = (1).to_bytes(8, "big") + (-2).to_bytes(8, "big", signed=True)
+        row = (1, "t", "c1", "p1", "a", "b", packed, 5, "boom", None, None)
+
+        async def _cursor(*args, **kwargs):
+            yield row
+
+        mock_conn.cursor = MagicMock(side_effect=_cursor)
+        storage = make_store(PassiveSummarizationStorage)
+
+        failed = await storage.get_failed(limit=10, offset=20)
+
+        assert [f.conversation_id for f in failed] == ["c1"]
+        assert failed[0].message_ids == [1, -2]
+        _, tenant_id, limit, offset = mock_conn.cursor.call_args.args
+        assert (limit, offset) == (10, 20)
+        mock_conn.transaction.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_keyset_page_returns_next_cursor(self, mock_conn, make_store):
+        failed_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        rows = [
+            (9, "t", "c1", "p1", "a", "b", b"", 5, "", failed_at, failed_at),
+            (7, "t", "c2", "p2", "a", "c", b"", 5, "", failed_at, failed_at),
+        ]
+
+        async def _cursor(*args, **kwargs):
+            for row in rows:
+                yield row
+
+        mock_conn.cursor = MagicMock(side_effect=_cursor)
+        storage = make_store(PassiveSummarizationStorage)
+
+        items, next_cursor = await storage.get_failed_page(limit=2, cursor=(failed_at, 12))
+
+        assert [f.id for f in items] == [9, 7]
+        assert next_cursor == (failed_at, 7)
+        sql, _, cursor_at, cursor_id, limit = mock_conn.cursor.call_args.args
+        assert "(failed_at, id) <" in sql
+        assert (cursor_at, cursor_id, limit) == (failed_at, 12, 2)
+
+
+class TestBulkRetryOperations:
+
+    @pytest.mark.asyncio
+    async def test_remove_retries_sends_one_array(self, mock_conn, make_store):
+        mock_conn.execute = AsyncMock(return_value="DELETE 2")
+        storage = make_store(PassiveSummarizationStorage)
+
+        assert await storage.remove_retries((3, 4)) == 2
+        _, ids = mock_conn.execute.call_args.args
+        assert ids == [3, 4]
+
+    @pytest.mark.asyncio
+    async def test_retry_failed_many_moves_in_one_statement(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[{"id": 21}, {"id": 22}])
+        storage = make_store(PassiveSummarizationStorage, tenant_id="t1")
+
+        assert await storage.retry_failed_many([1, 2, 3]) == [21, 22]
+        mock_conn.fetch.assert_called_once()
+        _, ids, tenant_id, _ = mock_conn.fetch.call_args.args
+        assert (ids, tenant_id) == ([1, 2, 3], "t1")
+
+    @pytest.mark.asyncio
+    async def test_empty_inputs_skip_database(self, make_store):
+        storage = make_store(PassiveSummarizationStorage)
+
+        assert await storage.remove_retries([]) == 0
+        assert await storage.retry_failed_many([]) == []
+        storage._require_pool.assert_not_called()
+
+
+class TestEnsureTables:
+
+    @pytest.mark.asyncio
+    async def test_runs_once_per_dsn(self, monkeypatch, mock_conn, make_store):
+        monkeypatch.setattr(passive_summarization_storage, "_DSN_READY", set())
+        storage = make_store(PassiveSummarizationStorage)
+
+        await storage.ensure_tables()
+        await storage.ensure_tables()
+
+        mock_conn.execute.assert_called_once()
+        assert "pg_advisory_xact_lock" in mock_conn.execute.call_args.args[0]
+
+
+class TestRetryFailed:
+
+    @pytest.mark.asyncio
+    async def test_moves_row_in_one_statement(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=31)
+        storage = make_store(PassiveSummarizationStorage, tenant_id="t1")
+
+        assert await storage.retry_failed(5) == 31
+        mock_conn.fetchval.assert_called_once()
+        sql, failed_id, tenant_id, delay = mock_conn.fetchval.call_args.args
+        assert "DELETE FROM passive_summarization_failed" in sql
+        assert (failed_id, tenant_id, delay) == (5, "t1", storage._retry_delays[0])
+
+    @pytest.mark.asyncio
+    async def test_missing_row_returns_none(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=None)
+        storage = make_store(PassiveSummarizationStorage)
+
+        assert await storage.retry_failed(5) is None
+
+
+class TestGetPendingRetries:
+
+    @pytest.mark.asyncio
+    async def test_timestamps_decode_lazily_from_epoch_micros(self, mock_conn, make_store):
+        due = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+        due_us = int(due.timestamp()) * 1_000_000 + due.microsecond
+        mock_conn.fetch = AsyncMock(return_value=[
+            (1, "t", "c1", "p1", "a", "b", b"", 0, due_us, "", due_us, due_us),
+        ])
+        storage = make_store(PassiveSummarizationStorage)
+
+        [job] = await storage.get_pending_retries(limit=5)
+
+        assert job.next_retry_at_us == due_us
+        assert job.next_retry_at == due
+        assert job.created_at == due
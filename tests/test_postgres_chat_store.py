@@ -0,0 +1,277 @@
+"""Unit tests for db/postgres_chat_store.py."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from db.postgres_chat_store import (
+    COPY_MIN_ROWS,
+    DELETE_CHUNK_SIZE,
+    PostgresChatStore,
+    compute_pair_id,
+)
+
+
+class TestPairId:
+
+    def test_order_and_whitespace_independent(self):
+        assert compute_pair_id("bob", "alice") == compute_pair_id(" alice", "bob ")
+
+    def test_matches_persisted_sha256_scheme(self):
+        expected = hashlib.sha256(b"alice::bob").hexdigest()[:16]
+        assert compute_pair_id("bob", "alice") == expected
+
+
+class TestLockKey:
+
+    def test_lock_key_is_stable_signed_64bit(self):
+        store = PostgresChatStore(dsn="postgresql://test", tenant_id="t1")
+
+        key = store._lock_key("p1", "c1")
+
+        assert key == store._lock_key("p1", "c1")
+        assert key != PostgresChatStore(dsn="postgresql://test", tenant_id="t2")._lock_key("p1", "c1")
+        assert -(2 ** 63) <= key < 2 ** 63
+
+
+def _events(n):
+    return [
+        {
+            "author_id": "a",
+            "user_a": "a",
+            "user_b": "b",
+            "conversation_id": "c1",
+            "text": "hello world!",
+            "message_id": f"m{i}",
+        }
+        for i in range(n)
+    ]
+
+
+class TestLogEventsBulk:
+
+    @pytest.mark.asyncio
+    async def test_small_batch_uses_single_insert(self, mock_conn, make_store):
+        mock_conn.execute = AsyncMock(return_value="INSERT 0 3")
+        store = make_store(PostgresChatStore, tenant_id="t1")
+
+        assert await store.log_events_bulk(_events(3)) == 3
+
+        mock_conn.execute.assert_called_once()
+        mock_conn.copy_records_to_table.assert_not_called()
+        columns = mock_conn.execute.call_args.args[1:]
+        assert columns[0] == ("t1",) * 3
+        assert columns[1] == (compute_pair_id("a", "b"),) * 3
+        assert columns[4] == ("human",) * 3
+        assert columns[6] == (3,) * 3
+
+    @pytest.mark.asyncio
+    async def test_large_batch_is_copied_through_staging(self, mock_conn, make_store):
+        mock_conn.execute = AsyncMock(side_effect=["SELECT 0", f"INSERT 0 {COPY_MIN_ROWS}"])
+        store = make_store(PostgresChatStore)
+
+        assert await store.log_events_bulk(_events(COPY_MIN_ROWS)) == COPY_MIN_ROWS
+
+        mock_conn.copy_records_to_table.assert_called_once()
+        assert len(mock_conn.copy_records_to_table.call_args.kwargs["records"]) == COPY_MIN_ROWS
+
+    @pytest.mark.asyncio
+    async def test_rows_keep_batch_order(self, mock_conn, make_store):
+        mock_conn.execute = AsyncMock(return_value="INSERT 0 4")
+        store = make_store(PostgresChatStore)
+        explicit = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        events = _events(4)
+        events[3]["ts"] = explicit
+
+        await store.log_events_bulk(events)
+
+        sql, *columns = mock_conn.execute.call_args.args
+        stamps = columns[8]
+        assert "$9::timestamptz[]" in sql
+        assert stamps[0] < stamps[1] < stamps[2]
+        assert stamps[3] == explicit
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_database(self, make_store):
+        store = make_store(PostgresChatStore)
+
+        assert await store.log_events_bulk([]) == 0
+        store._require_pool.assert_not_called()
+
+
+class TestLogEvent:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("text,expected", [("", 1), ("abc", 1), ("abcdefghi", 2)])
+    async def test_token_estimate_fallback(self, text, expected, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=1)
+        store = make_store(PostgresChatStore)
+
+        await store.log_event(author_id="a", user_a="a", user_b="b", conversation_id="c1", text=text)
+
+        assert mock_conn.fetchval.call_args.args[7] == expected
+
+    @pytest.mark.asyncio
+    async def test_explicit_token_count_is_kept(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=1)
+        store = make_store(PostgresChatStore)
+
+        await store.log_event(
+            author_id="a", user_a="a", user_b="b", conversation_id="c1", text="abcdefgh", token_count=0,
+        )
+
+        assert mock_conn.fetchval.call_args.args[7] == 0
+
+
+class TestGetRecentEvents:
+
+    @pytest.mark.asyncio
+    async def test_rows_are_returned_in_sql_order(self, mock_conn, make_store):
+        ts = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        rows = [
+            {"id": 1, "author": "a", "role": "human", "text": "hi",
+             "token_count": 1, "ts": ts, "message_id": "m1"},
+            {"id": 2, "author": "b", "role": "ai", "text": "yo",
+             "token_count": 1, "ts": None, "message_id": None},
+        ]
+        mock_conn.fetch = AsyncMock(return_value=rows)
+        store = make_store(PostgresChatStore)
+
+        events = await store.get_recent_events(user_a="a", user_b="b", conversation_id="c1")
+
+        assert [e["id"] for e in events] == [1, 2]
+        assert events[0]["author"] == "a"
+        assert events[0]["ts"] == ts.isoformat()
+        assert events[1]["ts"] is None
+        assert "ORDER BY ts ASC, id ASC" in mock_conn.fetch.call_args.args[0]
+
+
+class TestActiveStats:
+
+    @pytest.mark.asyncio
+    async def test_count_and_sum_share_one_query(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value={"n": 3, "toks": 120})
+        store = make_store(PostgresChatStore)
+
+        stats = await store.get_active_stats(user_a="a", user_b="b", conversation_id="c1")
+
+        assert stats == (3, 120)
+        mock_conn.fetchrow.assert_called_once()
+        assert mock_conn.fetchrow.call_args.args[-1] == ["human", "ai"]
+
+    @pytest.mark.asyncio
+    async def test_wrappers_delegate(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value={"n": 2, "toks": None})
+        store = make_store(PostgresChatStore)
+
+        assert await store.count_active(user_a="a", user_b="b", conversation_id="c1") == 2
+        assert await store.sum_active_tokens(user_a="a", user_b="b", conversation_id="c1") == 0
+
+
+class TestRetryQueueStats:
+
+    @pytest.mark.asyncio
+    async def test_single_round_trip(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value={
+            "retry_total": 4,
+            "retry_pending": 1,
+            "failed_total": None,
+        })
+        store = make_store(PostgresChatStore)
+
+        stats = await store.get_retry_queue_stats()
+
+        assert stats == {"retry_total": 4, "retry_pending": 1, "failed_total": 0}
+        mock_conn.fetchrow.assert_called_once()
+
+
+class TestDeleteByIds:
+
+    @pytest.mark.asyncio
+    async def test_small_list_is_passed_through(self, mock_conn, make_store):
+        mock_conn.execute = AsyncMock(return_value="DELETE 3")
+        store = make_store(PostgresChatStore)
+        ids = [1, 2, 3]
+
+        assert await store.delete_by_ids(ids) == 3
+        assert mock_conn.execute.call_args.args[1] is ids
+        mock_conn.transaction.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_large_list_is_chunked_in_one_transaction(self, mock_conn, make_store):
+        mock_conn.execute = AsyncMock(side_effect=lambda sql, chunk: f"DELETE {len(chunk)}")
+        store = make_store(PostgresChatStore)
+
+        deleted = await store.delete_by_ids(tuple(range(DELETE_CHUNK_SIZE * 2 + 5)))
+
+        assert deleted == DELETE_CHUNK_SIZE * 2 + 5
+        assert mock_conn.execute.call_count == 3
+        mock_conn.transaction.assert_called_once()
+
+
+class TestDeleteOldestN:
+
+    @pytest.mark.asyncio
+    async def test_selects_and_deletes_in_one_statement(self, mock_conn, make_store):
+        mock_conn.execute = AsyncMock(return_value="DELETE 2")
+        store = make_store(PostgresChatStore)
+
+        deleted = await store.delete_oldest_n(user_a="a", user_b="b", conversation_id="c1", n=5)
+
+        assert deleted == 2
+        mock_conn.execute.assert_called_once()
+        sql = mock_conn.execute.call_args.args[0]
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "ORDER BY ts ASC, id ASC" in sql
+        mock_conn.fetch.assert_not_called()
+
+
+class TestMoveRetryToFailed:
+
+    @pytest.mark.asyncio
+    async def test_moves_row_in_one_statement(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value={"id": 8, "pair_id": "p1", "attempt_count": 3})
+        store = make_store(PostgresChatStore)
+
+        assert await store.move_retry_to_failed(retry_id=2, last_error=None) == 8
+        mock_conn.fetchrow.assert_called_once()
+        _, retry_id, last_error = mock_conn.fetchrow.call_args.args
+        assert (retry_id, last_error) == (2, "")
+
+    @pytest.mark.asyncio
+    async def test_missing_row_returns_none(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value=None)
+        store = make_store(PostgresChatStore)
+
+        assert await store.move_retry_to_failed(retry_id=2) is None
+
+
+class TestSummarizationLock:
+
+    @pytest.mark.asyncio
+    async def test_lock_is_transaction_scoped(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=True)
+        store = make_store(PostgresChatStore)
+
+        async with store.acquire_summarization_lock(user_a="a", user_b="b", conversation_id="c1"):
+            mock_conn.transaction.return_value.__aexit__.assert_not_called()
+
+        mock_conn.fetchval.assert_called_once()
+        assert "pg_try_advisory_xact_lock" in mock_conn.fetchval.call_args.args[0]
+        assert "SET LOCAL idle_in_transaction_session_timeout = 0" in mock_conn.execute.call_args.args[0]
+        mock_conn.transaction.return_value.__aexit__.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_busy_lock_raises(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=False)
+        store = make_store(PostgresChatStore)
+
+        with pytest.raises(RuntimeError):
+            async with store.acquire_summarization_lock(user_a="a", user_b="b", conversation_id="c1"):
+                pass
+
+        mock_conn.fetchval.assert_called_once()
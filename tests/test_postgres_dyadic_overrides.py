@@ -0,0 +1,249 @@
+"""Unit tests for db/postgres_dyadic_overrides.py."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from db import postgres_dyadic_overrides
+from db.postgres_dyadic_overrides import (
+    _SQL_ALL_FOR_USER_COLUMNAR,
+    TONE_METRIC_COLUMNS,
+    DyadicOverrides,
+    RelationshipClass,
+    ToneMetrics,
+    _record_to_dyadic,
+)
+
+
+class TestExists:
+
+    @pytest.mark.asyncio
+    async def test_uses_exists_probe(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=True)
+        overrides = make_store(DyadicOverrides)
+
+        assert await overrides.exists("a", "b") is True
+        assert "EXISTS" in mock_conn.fetchval.call_args.args[0]
+
+
+class TestUpsertPair:
+
+    @pytest.mark.asyncio
+    async def test_both_directions_are_written_with_inverse_class(self):
+        overrides = DyadicOverrides(dsn="postgresql://test")
+        overrides.upsert = AsyncMock(side_effect=[11, 12])
+
+        ids = await overrides.upsert_pair("a", "b", ToneMetrics(), ToneMetrics(), "boss")
+
+        assert ids == (11, 12)
+        calls = [c.kwargs for c in overrides.upsert.call_args_list]
+        assert [(c["source_user_id"], c["relationship_class"]) for c in calls] == [
+            ("a", "boss"),
+            ("b", "subordinate"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_enum_and_unknown_classes(self):
+        overrides = DyadicOverrides(dsn="postgresql://test")
+        overrides.upsert = AsyncMock(side_effect=[1, 2, 3, 4])
+
+        await overrides.upsert_pair("a", "b", ToneMetrics(), ToneMetrics(), RelationshipClass.SUBORDINATE)
+        await overrides.upsert_pair("a", "b", ToneMetrics(), ToneMetrics(), "rival")
+
+        classes = [c.kwargs["relationship_class"] for c in overrides.upsert.call_args_list]
+        assert classes == [RelationshipClass.SUBORDINATE, RelationshipClass.BOSS, "rival", "rival"]
+
+
+class TestUpsertValidation:
+
+    @pytest.mark.asyncio
+    async def test_enum_is_stored_as_plain_value(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=5)
+        overrides = make_store(DyadicOverrides)
+
+        await overrides.upsert("a", "b", ToneMetrics(), relationship_class=RelationshipClass.FRIEND)
+
+        assert type(mock_conn.fetchval.call_args.args[3]) is str
+        assert mock_conn.fetchval.call_args.args[3] == "friend"
+
+    @pytest.mark.asyncio
+    async def test_unknown_string_is_dropped(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=5)
+        overrides = make_store(DyadicOverrides)
+
+        await overrides.upsert("a", "b", ToneMetrics(), relationship_class="rival")
+
+        assert mock_conn.fetchval.call_args.args[3] is None
+
+
+class TestColumnarLoad:
+
+    @pytest.mark.asyncio
+    async def test_metrics_arrive_as_one_matrix(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[
+            ("b", "friend", 7, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9),
+            ("c", None, 2, 0.5, 0.3, 0.0, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5),
+        ])
+        overrides = make_store(DyadicOverrides)
+
+        cols = await overrides.get_all_for_user_columnar("a")
+
+        assert len(cols) == 2
+        assert cols.target_user_ids == ["b", "c"]
+        assert cols.metrics.shape == (2, len(TONE_METRIC_COLUMNS))
+        assert cols.column("avg_humor").tolist() == [0.2, 0.3]
+        assert cols.total_message_counts.tolist() == [7, 2]
+        assert cols.tone_metrics(0).dominance == 0.8
+
+    def test_zero_metrics_use_same_defaults_as_row_readers(self):
+        zero_row = (1, "a", "b", None, 0) + (0.0,) * len(TONE_METRIC_COLUMNS) + (None, None, None)
+        record = _record_to_dyadic(zero_row)
+
+        assert record.metrics.avg_humor == 0.3
+        for name in TONE_METRIC_COLUMNS:
+            default = getattr(record.metrics, name)
+            assert f"COALESCE(NULLIF({name}, 0), {default})" in _SQL_ALL_FOR_USER_COLUMNAR
+
+    @pytest.mark.asyncio
+    async def test_empty_result_keeps_matrix_shape(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[])
+        overrides = make_store(DyadicOverrides)
+
+        cols = await overrides.get_all_for_user_columnar("a")
+
+        assert cols.metrics.shape == (0, len(TONE_METRIC_COLUMNS))
+
+
+def _row(target="b"):
+    return (
+        1, "a", target, "friend", 3,
+        0.4, 0.3, 0.0, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5,
+        None, None, None,
+    )
+
+
+class TestGetCache:
+
+    @pytest.mark.asyncio
+    async def test_repeat_get_is_served_from_cache(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value=_row())
+        overrides = make_store(DyadicOverrides)
+
+        first = await overrides.get("a", "b")
+        second = await overrides.get("a", "b")
+
+        assert first == second
+        assert await overrides.exists("a", "b") is True
+        mock_conn.fetchrow.assert_called_once()
+        mock_conn.fetchval.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_callers_get_independent_copies(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value=_row())
+        overrides = make_store(DyadicOverrides)
+
+        first = await overrides.get("a", "b")
+        first.relationship_class = "boss"
+        first.metrics.avg_formality = 1.0
+        second = await overrides.get("a", "b")
+
+        assert second.relationship_class == "friend"
+        assert second.metrics.avg_formality == 0.4
+        assert second.metrics is not first.metrics
+
+    @pytest.mark.asyncio
+    async def test_missing_rows_are_cached_too(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value=None)
+        overrides = make_store(DyadicOverrides)
+
+        assert await overrides.get("a", "b") is None
+        assert await overrides.get("a", "b") is None
+        mock_conn.fetchrow.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_the_pair(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value=_row())
+        mock_conn.execute = AsyncMock(return_value="UPDATE 1")
+        overrides = make_store(DyadicOverrides)
+
+        await overrides.get("a", "b")
+        await overrides.update_relationship_class("a", "b", "colleague")
+        await overrides.get("a", "b")
+
+        assert mock_conn.fetchrow.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_read_racing_a_write_is_not_cached(self, mock_conn, make_store):
+        overrides = make_store(DyadicOverrides)
+        mock_conn.execute = AsyncMock(return_value="UPDATE 1")
+
+        async def fetch_then_write(*args):
+            await overrides.update_relationship_class("a", "b", "colleague")
+            return _row()
+
+        mock_conn.fetchrow = AsyncMock(side_effect=fetch_then_write)
+        await overrides.get("a", "b")
+
+        mock_conn.fetchrow = AsyncMock(return_value=_row())
+        await overrides.get("a", "b")
+
+        mock_conn.fetchrow.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_refetched(self, monkeypatch, mock_conn, make_store):
+        monkeypatch.setattr(postgres_dyadic_overrides, "CACHE_TTL_SECONDS", 0.0)
+        mock_conn.fetchrow = AsyncMock(return_value=_row())
+        overrides = make_store(DyadicOverrides)
+
+        await overrides.get("a", "b")
+        await overrides.get("a", "b")
+
+        assert mock_conn.fetchrow.call_count == 2
+
+
+class TestRecordToDyadic:
+
+    def test_positional_unpack_applies_defaults(self):
+        row = (7, "a", "b", None, 0, None, None, None, 0.9, None, None, None, None, None, "s", None, None)
+
+        record = _record_to_dyadic(row)
+
+        assert (record.id, record.source_user_id, record.target_user_id) == (7, "a", "b")
+        assert record.metrics.avg_formality == 0.5
+        assert record.metrics.avg_humor == 0.3
+        assert record.metrics.directness == 0.9
+        assert record.metrics.style_summary == "s"
+
+
+class TestIterAllForUser:
+
+    @pytest.mark.asyncio
+    async def test_rows_stream_through_cursor(self, mock_conn, make_store):
+        rows = [_row("b"), _row("c")]
+
+        async def _cursor(*args, **kwargs):
+            for r in rows:
+                yield r
+
+        mock_conn.cursor = MagicMock(side_effect=_cursor)
+        overrides = make_store(DyadicOverrides)
+
+        records = [r async for r in overrides.iter_all_for_user("a")]
+
+        assert [r.target_user_id for r in records] == ["b", "c"]
+        assert mock_conn.cursor.call_args.args[1] == "a"
+        mock_conn.transaction.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_list_wrapper_uses_single_fetch(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[_row("b"), _row("c")])
+        overrides = make_store(DyadicOverrides)
+
+        records = await overrides.get_all_for_user("a")
+
+        assert [r.target_user_id for r in records] == ["b", "c"]
+        assert mock_conn.fetch.call_args.args[1] == "a"
+        mock_conn.cursor.assert_not_called()
+        mock_conn.transaction.assert_not_called()
@@ -0,0 +1,70 @@
+"""Unit tests for the engine registry in db/postgres.py."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from db import postgres
+from db.postgres import dispose_async_engines, get_async_engine, warm_pool
+
+
+@pytest.fixture
+def fake_engines(monkeypatch):
+    created = []
+
+    def _create(dsn, **kwargs):
+        engine = MagicMock()
+        engine.dispose = AsyncMock()
+        created.append((dsn, kwargs, engine))
+        return engine
+
+    monkeypatch.setattr(postgres, "create_async_engine", _create)
+    monkeypatch.setattr(postgres, "_ENGINES", {})
+    monkeypatch.setattr(postgres, "_ENGINE_KWARGS", {})
+    return created
+
+
+class TestGetAsyncEngine:
+
+    def test_one_engine_per_dsn(self, fake_engines):
+        first = get_async_engine("postgresql+asyncpg://a", pool_size=5)
+
+        assert get_async_engine("postgresql+asyncpg://a", pool_size=5) is first
+        assert get_async_engine("postgresql+asyncpg://a") is first
+        assert get_async_engine("postgresql+asyncpg://b") is not first
+        assert len(fake_engines) == 2
+
+    def test_different_options_for_same_dsn_raise(self, fake_engines):
+        get_async_engine("postgresql+asyncpg://a", pool_size=5)
+
+        with pytest.raises(ValueError):
+            get_async_engine("postgresql+asyncpg://a", pool_size=10)
+
+
+class TestDisposeAsyncEngines:
+
+    @pytest.mark.asyncio
+    async def test_disposes_and_forgets_every_engine(self, fake_engines):
+        engine = get_async_engine("postgresql+asyncpg://a", pool_size=5)
+
+        await dispose_async_engines()
+
+        engine.dispose.assert_awaited_once()
+        assert get_async_engine("postgresql+asyncpg://a", pool_size=10) is not engine
+
+
+class TestWarmPool:
+
+    @pytest.mark.asyncio
+    async def test_opens_n_connections(self):
+        conn = AsyncMock()
+        engine = MagicMock()
+        engine.connect.return_value.__aenter__ = AsyncMock(return_value=conn)
+        engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        await warm_pool(engine, 3)
+
+        assert engine.connect.call_count == 3
+        assert conn.execute.await_count == 3
@@ -0,0 +1,314 @@
+"""Unit tests for db/postgres_financial_threads.py."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from db.postgres_financial_threads import (
+    COPY_MIN_ROWS,
+    FinancialThreadStatus,
+    PostgresFinancialThreads,
+    WaitingFor,
+)
+
+
+class TestCreateThread:
+
+    @pytest.mark.asyncio
+    async def test_thread_and_first_message_in_one_statement(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=42)
+        threads = make_store(PostgresFinancialThreads)
+
+        thread_id = await threads.create_thread("s", "c", "conv", "loan", "pay me back")
+
+        assert thread_id == 42
+        mock_conn.fetchval.assert_called_once()
+        mock_conn.execute.assert_not_called()
+        mock_conn.transaction.assert_not_called()
+        assert mock_conn.fetchval.call_args.args[5] == "pay me back"
+
+
+class TestAddMessage:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("author_type,waiting_for", [
+        ("sender", "creator"),
+        ("creator", "sender"),
+    ])
+    async def test_insert_and_turn_update_share_one_statement(self, author_type, waiting_for, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value=(7, "c"))
+        threads = make_store(PostgresFinancialThreads)
+
+        message_id = await threads.add_message(3, author_type, "hello")
+
+        assert message_id == 7
+        mock_conn.fetchrow.assert_called_once()
+        mock_conn.transaction.assert_not_called()
+        sql, *args = mock_conn.fetchrow.call_args.args
+        assert "last_sender_message" not in sql
+        assert args == [3, author_type, "hello", waiting_for]
+
+
+class TestLastMessages:
+
+    @pytest.mark.asyncio
+    async def test_latest_message_per_side(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[("creator", "ok"), ("sender", "pay me")])
+        threads = make_store(PostgresFinancialThreads)
+
+        assert await threads.get_last_messages(3) == ("pay me", "ok")
+        assert "DISTINCT ON (author_type)" in mock_conn.fetch.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_missing_side_is_none(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[("sender", "pay me")])
+        threads = make_store(PostgresFinancialThreads)
+
+        assert await threads.get_last_messages(3) == ("pay me", None)
+
+
+class TestGetPool:
+
+    @pytest.mark.asyncio
+    async def test_shared_pool_is_resolved_once(self, monkeypatch):
+        from db.shared_pool import SharedPostgresPool
+
+        pool = MagicMock()
+        pool.is_closing = MagicMock(return_value=False)
+        get_pool = AsyncMock(return_value=pool)
+        monkeypatch.setattr(SharedPostgresPool, "get_pool", get_pool)
+        threads = PostgresFinancialThreads(dsn="postgresql://test")
+
+        assert await threads._get_pool() is pool
+        assert await threads._get_pool() is pool
+        get_pool.assert_awaited_once()
+
+
+class TestCreatorCounts:
+
+    @pytest.mark.asyncio
+    async def test_both_counters_come_from_one_query(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value=(5, 2))
+        threads = make_store(PostgresFinancialThreads)
+
+        assert await threads.get_creator_counts("c") == (5, 2)
+        assert "FILTER" in mock_conn.fetchrow.call_args.args[0]
+        assert await threads.get_open_count_for_creator("c") == 5
+        assert await threads.get_waiting_for_creator_count("c") == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_fall_back_to_zero(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(side_effect=RuntimeError("down"))
+        threads = make_store(PostgresFinancialThreads)
+
+        assert await threads.get_creator_counts("c") == (0, 0)
+
+
+class TestActiveThreadId:
+
+    @pytest.mark.asyncio
+    async def test_reads_only_the_id(self, mock_conn, make_store):
+        mock_conn.fetchval = AsyncMock(return_value=9)
+        threads = make_store(PostgresFinancialThreads)
+
+        assert await threads.get_active_thread_id("s", "c") == 9
+        sql = mock_conn.fetchval.call_args.args[0]
+        assert "SELECT id FROM financial_threads" in sql
+        assert "status = 'open'" in sql
+
+
+class TestMarkMessagesDelivered:
+
+    @pytest.mark.asyncio
+    async def test_returns_only_ids_this_call_flipped(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[(1,), (3,)])
+        threads = make_store(PostgresFinancialThreads)
+
+        assert await threads.mark_messages_delivered([1, 2, 3]) == {1, 3}
+        mock_conn.fetch.assert_called_once()
+        sql, ids = mock_conn.fetch.call_args.args
+        assert "delivered = FALSE" in sql and "ANY($1::int[])" in sql
+        assert ids == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_empty_list_skips_database(self, make_store):
+        threads = make_store(PostgresFinancialThreads)
+
+        assert await threads.mark_messages_delivered([]) == set()
+        threads._get_pool.assert_not_called()
+
+
+class TestRecentMessages:
+
+    @pytest.mark.asyncio
+    async def test_keyset_cursor_is_bound_and_order_kept(self, mock_conn, make_store):
+        rows = [
+            (i, 3, "sender", f"m{i}", False, None)
+            for i in (1, 2)
+        ]
+        mock_conn.fetch = AsyncMock(return_value=rows)
+        threads = make_store(PostgresFinancialThreads)
+        before = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        messages = await threads.get_recent_messages(3, limit=2, before=before)
+
+        assert [m.id for m in messages] == [1, 2]
+        _, thread_id, cursor, limit = mock_conn.fetch.call_args.args
+        assert (thread_id, cursor, limit) == (3, before, 2)
+
+
+class TestRowConversion:
+
+    def test_thread_row_is_unpacked_positionally(self):
+        threads = PostgresFinancialThreads(dsn="postgresql://test")
+        row = (1, "s", "c", "conv", "open", "creator", "loan", "hi", None, None, None)
+
+        thread = threads._row_to_thread(row)
+
+        assert thread.id == 1
+        assert thread.status is FinancialThreadStatus.OPEN
+        assert thread.waiting_for is WaitingFor.CREATOR
+        assert thread.last_sender_message == "hi"
+
+
+class TestAddMessagesBulk:
+
+    @pytest.mark.asyncio
+    async def test_small_batch_uses_unnest_insert(self, mock_conn, make_store):
+        threads = make_store(PostgresFinancialThreads)
+
+        count = await threads.add_messages_bulk([(1, "sender", "a"), (2, "creator", "b"), (1, "creator", "c")])
+
+        assert count == 3
+        mock_conn.copy_records_to_table.assert_not_called()
+        insert, touch = mock_conn.execute.call_args_list
+        assert insert.args[1] == [1, 2, 1]
+        created = insert.args[4]
+        assert created == sorted(created) and len(set(created)) == 3
+        assert touch.args[1:] == ([1, 2], ["sender", "sender"])
+
+    @pytest.mark.asyncio
+    async def test_large_batch_is_copied(self, mock_conn, make_store):
+        threads = make_store(PostgresFinancialThreads)
+
+        await threads.add_messages_bulk([(1, "sender", "m")] * COPY_MIN_ROWS)
+
+        mock_conn.copy_records_to_table.assert_called_once()
+        assert len(mock_conn.copy_records_to_table.call_args.kwargs["records"]) == COPY_MIN_ROWS
+        assert mock_conn.execute.call_args.args[1:] == ([1], ["creator"])
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_database(self, make_store):
+        threads = make_store(PostgresFinancialThreads)
+
+        assert await threads.add_messages_bulk([]) == 0
+        threads._get_pool.assert_not_called()
+
+
+class TestExpireOldThreads:
+
+    @pytest.mark.asyncio
+    async def test_cutoff_is_computed_in_sql(self, mock_conn, make_store):
+        mock_conn.execute = AsyncMock(return_value="UPDATE 4")
+        threads = make_store(PostgresFinancialThreads)
+
+        assert await threads.expire_old_threads(hours=12) == 4
+        sql, status, hours = mock_conn.execute.call_args.args
+        assert "make_interval(hours => $2)" in sql
+        assert (status, hours) == ("expired", 12)
+
+
+class TestOpenThreadsForCreator:
+
+    @pytest.mark.asyncio
+    async def test_rows_stream_through_cursor(self, mock_conn, make_store):
+        rows = [
+            (i, "s", "c", "conv", "open", "creator", "loan", None, None, None, None)
+            for i in (1, 2)
+        ]
+
+        async def _cursor(*args, **kwargs):
+            for r in rows:
+                yield r
+
+        mock_conn.cursor = MagicMock(side_effect=_cursor)
+        threads = make_store(PostgresFinancialThreads)
+
+        result = [t async for t in threads.iter_open_threads_for_creator("c")]
+
+        assert [t.id for t in result] == [1, 2]
+        assert mock_conn.cursor.call_args.args[1] == "c"
+        mock_conn.transaction.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_list_wrapper_uses_single_fetch(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[
+            (i, "s", "c", "conv", "open", "creator", "loan", None, None, None, None)
+            for i in (1, 2)
+        ])
+        threads = make_store(PostgresFinancialThreads)
+
+        result = await threads.get_open_threads_for_creator("c")
+
+        assert [t.id for t in result] == [1, 2]
+        assert mock_conn.fetch.call_args.args[1] == "c"
+        mock_conn.cursor.assert_not_called()
+        mock_conn.transaction.assert_not_called()
+
+
+class TestCreatorCountsCache:
+
+    @pytest.mark.asyncio
+    async def test_repeat_polls_are_served_from_cache(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(return_value=(5, 2))
+        threads = make_store(PostgresFinancialThreads)
+
+        await threads.get_open_count_for_creator("c")
+        await threads.get_waiting_for_creator_count("c")
+
+        mock_conn.fetchrow.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_add_message_drops_the_creator_entry(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(side_effect=[(5, 2), (11, "c"), (5, 1)])
+        threads = make_store(PostgresFinancialThreads)
+
+        assert await threads.get_creator_counts("c") == (5, 2)
+        await threads.add_message(3, "creator", "done")
+        assert await threads.get_creator_counts("c") == (5, 1)
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, mock_conn, make_store):
+        mock_conn.fetchrow = AsyncMock(side_effect=[RuntimeError("down"), (1, 1)])
+        threads = make_store(PostgresFinancialThreads)
+
+        assert await threads.get_creator_counts("c") == (0, 0)
+        assert await threads.get_creator_counts("c") == (1, 1)
+
+
+class TestSubscribe:
+
+    @pytest.mark.asyncio
+    async def test_listeners_share_one_dedicated_connection(self, monkeypatch):
+        from db import postgres_financial_threads
+
+        listen_conn = AsyncMock()
+        listen_conn.is_closed = MagicMock(return_value=False)
+        connect = AsyncMock(return_value=listen_conn)
+        monkeypatch.setattr(postgres_financial_threads.asyncpg, "connect", connect)
+        threads = PostgresFinancialThreads(dsn="postgresql://test")
+        callback = MagicMock()
+
+        await threads.subscribe(3, callback)
+        await threads.subscribe(4, callback)
+        await threads.unsubscribe(3, callback)
+        await threads.close()
+
+        connect.assert_awaited_once()
+        channels = [c.args[0] for c in listen_conn.add_listener.call_args_list]
+        assert channels == ["fin_msg_3", "fin_msg_4"]
+        listen_conn.remove_listener.assert_awaited_once_with("fin_msg_3", callback)
+        listen_conn.close.assert_awaited_once()
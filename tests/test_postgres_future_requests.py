@@ -0,0 +1,151 @@
+"""Unit tests for db/postgres_future_requests.py."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from db.postgres_future_requests import (
+    FutureRequestStatus,
+    FutureRequestSummary,
+    PostgresFutureRequests,
+)
+
+
+class TestGetPool:
+
+    @pytest.mark.asyncio
+    async def test_shared_pool_is_resolved_once(self, monkeypatch):
+        from db.shared_pool import SharedPostgresPool
+
+        pool = MagicMock()
+        pool.is_closing = MagicMock(return_value=False)
+        get_pool = AsyncMock(return_value=pool)
+        monkeypatch.setattr(SharedPostgresPool, "get_pool", get_pool)
+        store = PostgresFutureRequests(dsn="postgresql://test")
+
+        assert await store._get_pool() is pool
+        assert await store._get_pool() is pool
+        get_pool.assert_awaited_once()
+
+
+class TestMarkMany:
+
+    @pytest.mark.asyncio
+    async def test_delivers_batch_in_one_statement(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[(1,), (3,)])
+        store = make_store(PostgresFutureRequests)
+
+        delivered = await store.mark_many_as_delivered([1, 2, 3])
+
+        assert delivered == [1, 3]
+        mock_conn.fetch.assert_called_once()
+        sql, ids, new_status, old_status = mock_conn.fetch.call_args.args
+        assert "ANY($1::int[])" in sql
+        assert ids == [1, 2, 3]
+        assert new_status == FutureRequestStatus.DELIVERED.value
+        assert old_status == FutureRequestStatus.ANSWERED.value
+
+    @pytest.mark.asyncio
+    async def test_expires_only_pending(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[(5,)])
+        store = make_store(PostgresFutureRequests)
+
+        assert await store.mark_many_as_expired([5]) == [5]
+        _, _, new_status, old_status = mock_conn.fetch.call_args.args
+        assert new_status == FutureRequestStatus.EXPIRED.value
+        assert old_status == FutureRequestStatus.PENDING.value
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_database(self, make_store):
+        store = make_store(PostgresFutureRequests)
+
+        assert await store.mark_many_as_delivered([]) == []
+        assert await store.mark_many_as_expired([]) == []
+        store._get_pool.assert_not_called()
+
+
+def _request_row(request_id, status="delivered"):
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return (
+        request_id, "s", "r", "c1", "let's meet", "meeting", None,
+        status, "sure", now, now, now, now,
+    )
+
+
+class TestRowToRequest:
+
+    def test_row_is_unpacked_positionally(self):
+        store = PostgresFutureRequests(dsn="postgresql://test")
+
+        req = store._row_to_request(_request_row(9, status="pending"))
+
+        assert req.id == 9
+        assert req.detected_plan == "meeting"
+        assert req.status is FutureRequestStatus.PENDING
+        assert req.creator_response == "sure"
+        assert not hasattr(req, "__dict__")
+
+
+class TestClaimUndelivered:
+
+    @pytest.mark.asyncio
+    async def test_claims_answered_rows_in_one_statement(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[_request_row(1), _request_row(2)])
+        store = make_store(PostgresFutureRequests)
+
+        claimed = await store.claim_undelivered_for_sender("s", "r")
+
+        assert [r.id for r in claimed] == [1, 2]
+        assert claimed[0].status is FutureRequestStatus.DELIVERED
+        mock_conn.fetch.assert_called_once()
+        sql, sender, recipient, new_status = mock_conn.fetch.call_args.args
+        assert "UPDATE future_requests" in sql and "RETURNING" in sql
+        assert "status = 'answered'" in sql
+        assert (sender, recipient) == ("s", "r")
+        assert new_status == FutureRequestStatus.DELIVERED.value
+
+
+class TestPendingWithCount:
+
+    @pytest.mark.asyncio
+    async def test_page_and_total_come_from_one_query(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[
+            _request_row(1, status="pending") + (5,),
+            _request_row(2, status="pending") + (5,),
+        ])
+        store = make_store(PostgresFutureRequests)
+
+        requests, total = await store.get_pending_for_creator_with_count("r", limit=2)
+
+        assert [r.id for r in requests] == [1, 2]
+        assert total == 5
+        mock_conn.fetch.assert_called_once()
+        sql, recipient, limit = mock_conn.fetch.call_args.args
+        assert "COUNT(*) OVER ()" in sql
+        assert "status = 'pending'" in sql
+        assert (recipient, limit) == ("r", 2)
+
+    @pytest.mark.asyncio
+    async def test_no_rows_means_zero_total(self, mock_conn, make_store):
+        mock_conn.fetch = AsyncMock(return_value=[])
+        store = make_store(PostgresFutureRequests)
+
+        assert await store.get_pending_for_creator_with_count("r") == ([], 0)
+
+
+class TestPendingSummary:
+
+    @pytest.mark.asyncio
+    async def test_reads_only_indexed_columns(self, mock_conn, make_store):
+        now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        mock_conn.fetch = AsyncMock(return_value=[(4, "s", "c1", None, now, now)])
+        store = make_store(PostgresFutureRequests)
+
+        summaries = await store.get_pending_for_creator_summary("r")
+
+        assert summaries == [FutureRequestSummary(4, "s", "c1", None, now, now)]
+        sql = mock_conn.fetch.call_args.args[0]
+        assert "original_message" not in sql and "detected_plan" not in sql
@@ -0,0 +1,40 @@
+"""Unit tests for db/shared_pool.py."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from db import shared_pool
+from db.shared_pool import SharedPostgresPool
+
+
+@pytest.fixture(autouse=True)
+def _reset_pool(monkeypatch):
+    monkeypatch.setattr(SharedPostgresPool, "_pool", None)
+    monkeypatch.setattr(SharedPostgresPool, "_server_settings", {})
+
+
+class TestSharedPostgresPool:
+
+    @pytest.mark.asyncio
+    async def test_tenant_is_sent_as_startup_setting(self, monkeypatch):
+        create_pool = AsyncMock(return_value=MagicMock())
+        monkeypatch.setattr(shared_pool.asyncpg, "create_pool", create_pool)
+
+        SharedPostgresPool.configure(tenant_id="t1")
+        await SharedPostgresPool.get_pool("postgresql://test")
+        await SharedPostgresPool.get_pool("postgresql://test")
+
+        create_pool.assert_awaited_once()
+        assert create_pool.call_args.kwargs["server_settings"] == {"app.tenant_id": "t1"}
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_pool_sends_no_settings(self, monkeypatch):
+        create_pool = AsyncMock(return_value=MagicMock())
+        monkeypatch.setattr(shared_pool.asyncpg, "create_pool", create_pool)
+
+        await SharedPostgresPool.get_pool("postgresql://test")
+
+        assert create_pool.call_args.kwargs["server_settings"] is None
@@ -0,0 +1,42 @@
+"""Unit tests for scheduler/tone_scheduler.py."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from scheduler.tone_scheduler import ToneScheduler
+
+
+def _make_scheduler(pair_counter):
+    return ToneScheduler(
+        settings=MagicMock(),
+        passive_storage=MagicMock(),
+        relationship_cluster=MagicMock(),
+        dyadic_overrides=MagicMock(),
+        archive_storage=MagicMock(),
+        pair_counter=pair_counter,
+        tone_agent=MagicMock(),
+        retry_storage=MagicMock(),
+    )
+
+
+class TestFlushPairCounts:
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_counts_for_next_flush(self):
+        pair_counter = MagicMock()
+        pair_counter.increment_many = AsyncMock(side_effect=[RuntimeError("db down"), None])
+        scheduler = _make_scheduler(pair_counter)
+        scheduler._pending_pair_counts = [("a", "b", 3)]
+
+        await scheduler._flush_pair_counts()
+
+        assert scheduler._pending_pair_counts == [("a", "b", 3)]
+
+        scheduler._pending_pair_counts.append(("c", "d", 1))
+        await scheduler._flush_pair_counts()
+
+        pair_counter.increment_many.assert_awaited_with([("a", "b", 3), ("c", "d", 1)])
+        assert scheduler._pending_pair_counts == []